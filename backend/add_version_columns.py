@@ -0,0 +1,33 @@
+"""Add version columns used for optimistic concurrency control."""
+from app import create_app, db
+from sqlalchemy import text
+
+TABLES = ["employee_absences", "absence_types"]
+
+
+def add_version_columns():
+    """Add the version column to each table that does not have it yet."""
+    app = create_app()
+
+    with app.app_context():
+        from sqlalchemy import inspect
+        inspector = inspect(db.engine)
+
+        for table in TABLES:
+            columns = [col['name'] for col in inspector.get_columns(table)]
+
+            if 'version' not in columns:
+                print(f"Adding version column to {table}...")
+                with db.engine.connect() as conn:
+                    conn.execute(text(
+                        f"ALTER TABLE {table} "
+                        "ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
+                    ))
+                    conn.commit()
+                print(f"✅ Column version added to {table}")
+            else:
+                print(f"✅ Column version already exists in {table}")
+
+
+if __name__ == "__main__":
+    add_version_columns()
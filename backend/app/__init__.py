@@ -1,19 +1,17 @@
 """Application factory for creating Flask app instances."""
-# IMPORTANT: Import db_utils first to configure environment for database
-from app import db_utils  # noqa: F401
-
 import os
 from pathlib import Path
+
+import click
 from flask import Flask, jsonify, send_from_directory
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_cors import CORS
 
+from app.utils.read_only import RoutingSession
 from config import get_config
 
 # Initialize extensions
-db = SQLAlchemy()
-migrate = Migrate()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 
 def create_app(config_name=None):
@@ -35,9 +33,52 @@ def create_app(config_name=None):
     config = get_config(config_name)
     app.config.from_object(config)
 
+    # WSL2 locale/encoding workarounds and prepared statements; only
+    # PostgreSQL needs them, so SQLite-backed tests and tools skip the import
+    if (app.config.get("SQLALCHEMY_DATABASE_URI") or "").startswith("postgres"):
+        from app.db_utils import configure_prepared_statements, setup_db_environment
+
+        setup_db_environment()
+        configure_prepared_statements(app.config)
+
     # Initialize extensions
     db.init_app(app)
-    migrate.init_app(app, db)
+    # Flask-Migrate pulls in Alembic (and Mako); only the ``flask db``
+    # commands use it, so servers started outside the Flask CLI skip it
+    if click.get_current_context(silent=True) is not None:
+        from flask_migrate import Migrate
+
+        Migrate(app, db)
+
+    # Track per-table change generations (conditional GETs, cache invalidation)
+    from app.utils import (
+        change_tracking,
+        events,
+        memory_tracing,
+        metrics,
+        profiling,
+        read_only,
+        readiness,
+        result_cache,
+        singleflight,
+        sql_instrumentation,
+        warmup,
+    )
+
+    change_tracking.init_app(app)
+    result_cache.init_app(app)
+    singleflight.init_app(app)
+    events.init_app(app)
+    # Per-request statement counts and timings (Server-Timing, slow-query log)
+    sql_instrumentation.init_app(app)
+    # Request counts and latency histograms for /api/metrics
+    metrics.init_app(app)
+    readiness.init_app(app)
+    # GET/HEAD sessions: read-only transactions, no autoflush/expire-on-commit
+    read_only.init_app(app)
+    # Admin-only ?__profile=1 and PROFILE_SAMPLE_RATE request profiling
+    profiling.init_app(app)
+    memory_tracing.init_app(app)
 
     # Configure CORS
     cors_origins = app.config.get("CORS_ORIGINS", "").split(",")
@@ -46,12 +87,20 @@ def create_app(config_name=None):
     # Register blueprints
     from app.routes import absence_bp, health_bp
     from app.routes.absence_type_routes import absence_type_bp
+    from app.routes.admin_routes import admin_bp
     from app.routes.audit_routes import audit_bp
+    from app.routes.batch_routes import batch_bp
+    from app.routes.bootstrap_routes import bootstrap_bp, render_index_with_bootstrap
+    from app.routes.event_routes import event_bp
 
     app.register_blueprint(absence_bp, url_prefix="/api")
     app.register_blueprint(absence_type_bp, url_prefix="/api")
     app.register_blueprint(audit_bp, url_prefix="/api")
     app.register_blueprint(health_bp, url_prefix="/api")
+    app.register_blueprint(event_bp, url_prefix="/api")
+    app.register_blueprint(bootstrap_bp, url_prefix="/api")
+    app.register_blueprint(batch_bp, url_prefix="/api")
+    app.register_blueprint(admin_bp, url_prefix="/api")
 
     # Serve frontend static files (SPA support)
     @app.route('/', defaults={'path': ''})
@@ -71,6 +120,8 @@ def create_app(config_name=None):
         # Otherwise, serve index.html (for client-side routing)
         index_path = static_folder / 'index.html'
         if index_path.exists():
+            if app.config.get("SPA_INLINE_BOOTSTRAP"):
+                return render_index_with_bootstrap(index_path)
             return send_from_directory(str(static_folder), 'index.html')
 
         # If no static files exist, return helpful message
@@ -82,6 +133,10 @@ def create_app(config_name=None):
     # Error handlers
     register_error_handlers(app)
 
+    # Pool connections, compiled statements and static files before the
+    # first request (WARMUP); /api/ready stays not ready until it finished
+    warmup.init_app(app)
+
     # Shell context for flask shell
     @app.shell_context_processor
     def make_shell_context():
@@ -159,6 +214,59 @@ def register_cli_commands(app):
         seed_database()
         print("Database seeded with sample data.")
 
+    @app.cli.command()
+    @click.option("--rows", type=int, default=1000000, show_default=True)
+    @click.option("--employees", type=int, help="Default: one per 40 absences")
+    @click.option("--seed", type=int, default=42, show_default=True)
+    @click.option("--workers", type=int, help="Default: number of CPUs")
+    @click.option("--no-audit", is_flag=True, help="Skip the audit history")
+    @click.option("--replace", is_flag=True, help="Delete existing absences first")
+    def generate_data(rows, employees, seed, workers, no_audit, replace):
+        """Generate a large deterministic dataset for benchmarks."""
+        from app.utils.data_generator import generate_dataset
+
+        result = generate_dataset(
+            db.engine,
+            rows,
+            employees=employees,
+            seed=seed,
+            audit=not no_audit,
+            workers=workers,
+            replace=replace,
+        )
+        print(
+            f"Generated {result['absences']} absences for {result['employees']} "
+            f"employees and {result['audit_logs']} audit entries "
+            f"in {result['seconds']:.1f}s."
+        )
+
+    @app.cli.command()
+    @click.option("--top", type=int, default=15, show_default=True)
+    @click.option("--config", "config_name", help="Default: FLASK_ENV")
+    def import_time(top, config_name):
+        """Report what creating the app imports, slowest packages first."""
+        from app.utils.import_time import measure_import_time, summarize
+
+        report = summarize(measure_import_time(config_name), top)
+        print(f"{report['total_ms']:.1f} ms importing {report['modules']} modules")
+        print(f"\n{'package':<28} {'ms':>8} {'share':>7} {'modules':>8}")
+        for row in report["packages"]:
+            print(
+                f"{row['package']:<28} {row['ms']:>8.1f} {row['share']:>7.1%} "
+                f"{row['modules']:>8}"
+            )
+        print(f"\n{'module':<48} {'ms':>8}")
+        for row in report["slowest_modules"]:
+            print(f"{row['module']:<48} {row['ms']:>8.1f}")
+
+    @app.cli.command()
+    def purge_idempotency_keys():
+        """Delete expired idempotency keys."""
+        from app.utils.idempotency import purge_expired
+
+        deleted = purge_expired()
+        print(f"Deleted {deleted} expired idempotency keys.")
+
     @app.cli.command()
     def drop_db():
         """Drop all database tables."""
@@ -1,4 +1,4 @@
-"""Database utilities for handling encoding issues in WSL2."""
+"""Database utilities: WSL2 encoding workarounds and PostgreSQL driver options."""
 import os
 import sys
 
@@ -34,5 +34,29 @@ def setup_db_environment():
         pass  # psycopg2 not installed yet
 
 
-# Call this immediately when module is imported
-setup_db_environment()
+def configure_prepared_statements(config):
+    """
+    Enable server-side prepared statements for the psycopg (3) driver.
+
+    psycopg prepares a statement on the server once a connection has run it
+    DB_PREPARE_THRESHOLD times ("off" disables it), so the hot queries skip
+    parsing and planning afterwards. psycopg2 cannot prepare statements; with
+    it (``postgresql://`` URLs) nothing changes.
+
+    Args:
+        config: The Flask app config, updated in place
+
+    Returns:
+        bool: Whether prepared statements were configured
+    """
+    uri = config.get("SQLALCHEMY_DATABASE_URI") or ""
+    if not uri.startswith("postgresql+psycopg:"):
+        return False
+
+    threshold = str(config.get("DB_PREPARE_THRESHOLD", "5")).strip().lower()
+    options = dict(config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    connect_args = dict(options.get("connect_args") or {})
+    connect_args["prepare_threshold"] = None if threshold == "off" else int(threshold)
+    options["connect_args"] = connect_args
+    config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+    return True
@@ -1,5 +1,5 @@
 """Employee Absence model."""
-from datetime import datetime
+from datetime import date, datetime
 from app import db
 
 
@@ -19,6 +19,11 @@ class EmployeeAbsence(db.Model):
     updated_at = db.Column(
         db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    # Row version for optimistic concurrency: UPDATE/DELETE statements match on
+    # it and increment it, so concurrent edits are detected without locks
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     def __repr__(self):
         return (
@@ -26,8 +31,33 @@ class EmployeeAbsence(db.Model):
             f"{self.absence_type} ({self.start_date} to {self.end_date})>"
         )
 
-    def to_dict(self):
-        """Convert model to dictionary."""
+    # Columns exposed by to_dict(), in serialization order
+    SERIALIZABLE_FIELDS = (
+        "id",
+        "service_account",
+        "employee_fullname",
+        "absence_type",
+        "start_date",
+        "end_date",
+        "is_half_day",
+        "created_at",
+        "updated_at",
+        "version",
+    )
+
+    def to_dict(self, fields=None):
+        """
+        Convert model to dictionary.
+
+        Args:
+            fields (tuple): Optional subset of SERIALIZABLE_FIELDS to include
+
+        Returns:
+            dict: Serialized absence
+        """
+        if fields:
+            return EmployeeAbsence.row_to_dict(self, fields)
+
         return {
             "id": self.id,
             "service_account": self.service_account,
@@ -38,8 +68,29 @@ class EmployeeAbsence(db.Model):
             "is_half_day": self.is_half_day,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "version": self.version,
         }
 
+    @staticmethod
+    def row_to_dict(row, fields):
+        """
+        Serialize a partial row (model instance or column tuple) to a dictionary.
+
+        Args:
+            row: Object exposing the requested fields as attributes
+            fields (tuple): Field names to include, in output order
+
+        Returns:
+            dict: Serialized values keyed by field name
+        """
+        result = {}
+        for field in fields:
+            value = getattr(row, field)
+            if isinstance(value, (date, datetime)):
+                value = value.isoformat()
+            result[field] = value
+        return result
+
     def calculate_days(self):
         """
         Calculate the number of business days (excluding weekends) for this absence.
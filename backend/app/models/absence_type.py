@@ -18,6 +18,11 @@ class AbsenceType(db.Model):
     updated_at = db.Column(
         db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    # Row version for optimistic concurrency: UPDATE/DELETE statements match on
+    # it and increment it, so concurrent edits are detected without locks
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     def __repr__(self):
         return f"<AbsenceType {self.id}: {self.name} ({self.color})>"
@@ -33,6 +38,7 @@ class AbsenceType(db.Model):
             "is_active": self.is_active,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "version": self.version,
         }
 
     @classmethod
@@ -1,6 +1,7 @@
 """Audit log model for tracking changes to absences."""
 from datetime import datetime
 from app import db
+from app.utils.change_tracking import mark_changed, AUDIT_LOGS
 
 
 class AuditLog(db.Model):
@@ -8,10 +9,13 @@ class AuditLog(db.Model):
 
     __tablename__ = 'audit_logs'
 
+    # Action of the entry recording that audit entries were deleted
+    PURGE = 'PURGE'
+
     id = db.Column(db.Integer, primary_key=True)
 
     # What changed
-    action = db.Column(db.String(20), nullable=False)  # CREATE, UPDATE, DELETE
+    action = db.Column(db.String(20), nullable=False)  # CREATE, UPDATE, DELETE, PURGE
     entity_type = db.Column(db.String(50), nullable=False, default='EmployeeAbsence')
     entity_id = db.Column(db.Integer, nullable=True)  # ID of the absence (null if deleted)
 
@@ -58,6 +62,7 @@ class AuditLog(db.Model):
             description=description or f'Created {entity_type} with ID {entity_id}'
         )
         db.session.add(log)
+        mark_changed(AUDIT_LOGS)
         return log
 
     @staticmethod
@@ -73,6 +78,7 @@ class AuditLog(db.Model):
             description=description or f'Updated {entity_type} with ID {entity_id}'
         )
         db.session.add(log)
+        mark_changed(AUDIT_LOGS)
         return log
 
     @staticmethod
@@ -87,4 +93,29 @@ class AuditLog(db.Model):
             description=description or f'Deleted {entity_type} with ID {entity_id}'
         )
         db.session.add(log)
+        mark_changed(AUDIT_LOGS)
+        return log
+
+    @staticmethod
+    def log_purge(deleted_count, last_id=None, user='system', description=None):
+        """
+        Log that audit entries were deleted.
+
+        The change feed needs it: clients whose token is older than this entry
+        may have missed changes whose entries are gone, so they must resync.
+        ``last_id`` is the highest id before the deletion; SQLite hands emptied
+        ids out again, so the entry is moved past it if needed.
+        """
+        log = AuditLog(
+            action=AuditLog.PURGE,
+            entity_type='AuditLog',
+            user=user,
+            description=description or f'Deleted {deleted_count} audit log(s)'
+        )
+        db.session.add(log)
+        mark_changed(AUDIT_LOGS)
+        if last_id is not None:
+            db.session.flush()
+            if log.id <= last_id:
+                log.id = last_id + 1
         return log
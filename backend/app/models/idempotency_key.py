@@ -0,0 +1,26 @@
+"""Stored responses of requests sent with an Idempotency-Key header."""
+from datetime import datetime
+from app import db
+
+
+class IdempotencyKey(db.Model):
+    """Response recorded for an idempotency key until it expires."""
+
+    __tablename__ = "idempotency_keys"
+
+    key = db.Column(db.String(255), primary_key=True)
+    # Hash of method, path and body: a key may only be replayed for the same request
+    request_hash = db.Column(db.String(64), nullable=False)
+    # Both null while the first request with this key is still running
+    status_code = db.Column(db.Integer, nullable=True)
+    response_body = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey {self.key} ({self.status_code})>"
+
+    @property
+    def is_complete(self):
+        """Whether the response of the original request has been stored."""
+        return self.status_code is not None
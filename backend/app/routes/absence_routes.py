@@ -1,16 +1,53 @@
 """Absence management routes."""
 from datetime import datetime
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
+from app.models.absence import EmployeeAbsence
 from app.services.absence_service import AbsenceService
-from app.validators.absence_validators import ValidationError, ALLOWED_ABSENCE_TYPES
+from app.utils.change_tracking import ABSENCES
+from app.utils.http_cache import (
+    conditional_get,
+    if_match_version,
+    versioned_response,
+)
+from app.utils.idempotency import idempotent
+from app.utils.serialization import to_columnar
+from app.utils.write_locks import LockTimeoutError
+from app.validators.absence_validators import (
+    ValidationError,
+    VersionConflictError,
+    ALLOWED_ABSENCE_TYPES,
+    validate_fields,
+)
 
 absence_bp = Blueprint("absences", __name__)
 
 
 @absence_bp.route("/absences", methods=["GET"])
+@conditional_get(ABSENCES)
 def get_absences():
-    """Get all absences with optional filters."""
+    """
+    Get all absences with optional filters.
+
+    Query Parameters:
+        - fields: Comma-separated sparse fieldset (e.g. "id,start_date,end_date")
+        - layout: "rows" (default) or "columnar" for one array per field
+    """
     try:
+        layout = request.args.get("layout", "rows")
+        if layout not in ("rows", "columnar"):
+            return (
+                jsonify(
+                    {
+                        "success": False,
+                        "error": "Invalid layout. Allowed layouts: rows, columnar",
+                    }
+                ),
+                400,
+            )
+        fields = validate_fields(
+            request.args.get("fields"), EmployeeAbsence.SERIALIZABLE_FIELDS
+        )
+
         # Build filters from query parameters
         filters = {}
         service_account = request.args.get("service_account")
@@ -37,12 +74,20 @@ def get_absences():
             if end_date:
                 filters["end_date"] = datetime.strptime(end_date, "%Y-%m-%d").date()
 
-        absences = AbsenceService.get_all(filters if filters else None)
+        absences = AbsenceService.get_all_serialized(
+            filters if filters else None, fields=fields
+        )
+        if layout == "columnar":
+            absences = to_columnar(
+                absences,
+                fields or EmployeeAbsence.SERIALIZABLE_FIELDS,
+                dictionary_fields=("absence_type",),
+            )
         return (
             jsonify(
                 {
                     "success": True,
-                    "data": [absence.to_dict() for absence in absences],
+                    "data": absences,
                 }
             ),
             200,
@@ -67,9 +112,45 @@ def get_absences():
         )
 
 
+@absence_bp.route("/absences/changes", methods=["GET"])
+def get_absence_changes():
+    """
+    Get absences created, updated or deleted since a change-feed token.
+
+    Query Parameters:
+        - since: Token returned by a previous call (omit for a full sync)
+
+    Returns:
+        JSON with "upserts" (current rows), "deleted" (ids), "token" (pass as
+        ``since`` next time) and "reset" (true when the client should replace
+        its data instead of merging)
+    """
+    try:
+        since = request.args.get("since")
+        if since and not since.isdigit():
+            return (
+                jsonify({"success": False, "error": "Invalid change token"}),
+                400,
+            )
+
+        changes = AbsenceService.get_changes(
+            int(since) if since else None,
+            safety_seconds=current_app.config["CHANGE_FEED_SAFETY_SECONDS"],
+        )
+        return (
+            jsonify({"success": True, "data": changes}),
+            200,
+        )
+    except Exception as e:
+        return (
+            jsonify({"success": False, "error": str(e)}),
+            400,
+        )
+
+
 @absence_bp.route("/absences/<int:absence_id>", methods=["GET"])
 def get_absence(absence_id):
-    """Get absence by ID."""
+    """Get absence by ID (with an ETag usable in If-Match)."""
     try:
         absence = AbsenceService.get_by_id(absence_id)
         if not absence:
@@ -77,9 +158,10 @@ def get_absence(absence_id):
                 jsonify({"success": False, "error": "Absence not found"}),
                 404,
             )
-        return (
-            jsonify({"success": True, "data": absence.to_dict()}),
-            200,
+        return versioned_response(
+            {"success": True, "data": absence.to_dict()},
+            absence.id,
+            absence.version,
         )
     except Exception as e:
         return (
@@ -89,8 +171,9 @@ def get_absence(absence_id):
 
 
 @absence_bp.route("/absences", methods=["POST"])
+@idempotent
 def create_absence():
-    """Create new absence."""
+    """Create new absence (replayed for a repeated Idempotency-Key)."""
     try:
         data = request.get_json()
 
@@ -107,6 +190,11 @@ def create_absence():
             jsonify({"success": True, "data": absence.to_dict()}),
             201,
         )
+    except LockTimeoutError as e:
+        return (
+            jsonify({"success": False, "error": str(e)}),
+            409,
+        )
     except ValidationError as e:
         return (
             jsonify({"success": False, "error": str(e)}),
@@ -121,8 +209,9 @@ def create_absence():
 
 @absence_bp.route("/absences/<int:absence_id>", methods=["PUT"])
 def update_absence(absence_id):
-    """Update existing absence."""
+    """Update existing absence (conditional on If-Match when given)."""
     try:
+        expected_version = if_match_version(absence_id)
         data = request.get_json()
 
         # Convert date strings to date objects
@@ -133,10 +222,21 @@ def update_absence(absence_id):
         if data.get("end_date"):
             data["end_date"] = datetime.strptime(data["end_date"], "%Y-%m-%d").date()
 
-        absence = AbsenceService.update(absence_id, data)
+        absence = AbsenceService.update(absence_id, data, expected_version)
+        return versioned_response(
+            {"success": True, "data": absence.to_dict()},
+            absence.id,
+            absence.version,
+        )
+    except VersionConflictError as e:
         return (
-            jsonify({"success": True, "data": absence.to_dict()}),
-            200,
+            jsonify({"success": False, "error": str(e)}),
+            412,
+        )
+    except LockTimeoutError as e:
+        return (
+            jsonify({"success": False, "error": str(e)}),
+            409,
         )
     except ValidationError as e:
         return (
@@ -157,13 +257,18 @@ def update_absence(absence_id):
 
 @absence_bp.route("/absences/<int:absence_id>", methods=["DELETE"])
 def delete_absence(absence_id):
-    """Delete absence."""
+    """Delete absence (conditional on If-Match when given)."""
     try:
-        absence = AbsenceService.delete(absence_id)
+        absence = AbsenceService.delete(absence_id, if_match_version(absence_id))
         return (
             jsonify({"success": True, "data": absence.to_dict()}),
             200,
         )
+    except VersionConflictError as e:
+        return (
+            jsonify({"success": False, "error": str(e)}),
+            412,
+        )
     except Exception as e:
         if "404" in str(type(e)):
             return (
@@ -177,6 +282,7 @@ def delete_absence(absence_id):
 
 
 @absence_bp.route("/statistics", methods=["GET"])
+@conditional_get(ABSENCES)
 def get_statistics():
     """Get absence statistics with optional filters."""
     try:
@@ -1,11 +1,20 @@
 """Routes for absence type management."""
 from flask import Blueprint, request, jsonify
 from app.services.absence_type_service import AbsenceTypeService
+from app.utils.change_tracking import ABSENCE_TYPES
+from app.utils.http_cache import (
+    conditional_get,
+    if_match_version,
+    versioned_response,
+)
+from app.utils.idempotency import idempotent
+from app.validators.absence_validators import VersionConflictError
 
 absence_type_bp = Blueprint("absence_types", __name__)
 
 
 @absence_type_bp.route("/absence-types", methods=["GET"])
+@conditional_get(ABSENCE_TYPES)
 def get_absence_types():
     """Get all absence types."""
     try:
@@ -32,7 +41,7 @@ def get_absence_types():
 
 @absence_type_bp.route("/absence-types/<int:type_id>", methods=["GET"])
 def get_absence_type(type_id):
-    """Get single absence type by ID."""
+    """Get single absence type by ID (with an ETag usable in If-Match)."""
     try:
         absence_type = AbsenceTypeService.get_by_id(type_id)
 
@@ -47,14 +56,10 @@ def get_absence_type(type_id):
                 404,
             )
 
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "data": absence_type.to_dict(),
-                }
-            ),
-            200,
+        return versioned_response(
+            {"success": True, "data": absence_type.to_dict()},
+            absence_type.id,
+            absence_type.version,
         )
     except Exception as e:
         return (
@@ -64,8 +69,9 @@ def get_absence_type(type_id):
 
 
 @absence_type_bp.route("/absence-types", methods=["POST"])
+@idempotent
 def create_absence_type():
-    """Create new absence type."""
+    """Create new absence type (replayed for a repeated Idempotency-Key)."""
     try:
         data = request.get_json()
 
@@ -101,8 +107,9 @@ def create_absence_type():
 
 @absence_type_bp.route("/absence-types/<int:type_id>", methods=["PUT"])
 def update_absence_type(type_id):
-    """Update existing absence type."""
+    """Update existing absence type (conditional on If-Match when given)."""
     try:
+        expected_version = if_match_version(type_id)
         data = request.get_json()
 
         if not data:
@@ -111,17 +118,21 @@ def update_absence_type(type_id):
                 400,
             )
 
-        absence_type = AbsenceTypeService.update(type_id, data)
+        absence_type = AbsenceTypeService.update(type_id, data, expected_version)
 
+        return versioned_response(
+            {
+                "success": True,
+                "data": absence_type.to_dict(),
+                "message": "Absence type updated successfully",
+            },
+            absence_type.id,
+            absence_type.version,
+        )
+    except VersionConflictError as e:
         return (
-            jsonify(
-                {
-                    "success": True,
-                    "data": absence_type.to_dict(),
-                    "message": "Absence type updated successfully",
-                }
-            ),
-            200,
+            jsonify({"success": False, "error": str(e)}),
+            412,
         )
     except ValueError as e:
         return (
@@ -137,16 +148,17 @@ def update_absence_type(type_id):
 
 @absence_type_bp.route("/absence-types/<int:type_id>", methods=["DELETE"])
 def delete_absence_type(type_id):
-    """Soft delete absence type."""
+    """Soft delete absence type (conditional on If-Match when given)."""
     try:
+        expected_version = if_match_version(type_id)
         # Check if hard delete is requested
         hard_delete = request.args.get("hard", "false").lower() == "true"
 
         if hard_delete:
-            absence_type = AbsenceTypeService.hard_delete(type_id)
+            absence_type = AbsenceTypeService.hard_delete(type_id, expected_version)
             message = "Absence type permanently deleted"
         else:
-            absence_type = AbsenceTypeService.delete(type_id)
+            absence_type = AbsenceTypeService.delete(type_id, expected_version)
             message = "Absence type deactivated"
 
         return (
@@ -159,6 +171,11 @@ def delete_absence_type(type_id):
             ),
             200,
         )
+    except VersionConflictError as e:
+        return (
+            jsonify({"success": False, "error": str(e)}),
+            412,
+        )
     except ValueError as e:
         return (
             jsonify({"success": False, "error": str(e)}),
@@ -0,0 +1,154 @@
+"""Operator diagnostics (require the X-Admin-Token header)."""
+from flask import Blueprint, Response, jsonify, request
+
+from app.utils.admin import admin_required
+from app.utils.memory_tracing import get_tracer
+from app.utils.profiling import get_profiling
+
+admin_bp = Blueprint("admin", __name__)
+
+
+@admin_bp.route("/admin/profiles", methods=["GET"])
+@admin_required
+def get_profiles():
+    """
+    Return the profiles of requests sampled through PROFILE_SAMPLE_RATE.
+
+    Query Parameters:
+        - route: Only this route, e.g. "GET /api/absences"
+        - format: "json" (default, top-N tables per route) or "collapsed"
+          (stacks for flamegraph tools)
+
+    Returns:
+        JSON with one summary per route, or collapsed stacks as plain text
+    """
+    profiling = get_profiling()
+    if profiling is None:
+        return jsonify({"success": False, "error": "Profiling is disabled"}), 404
+
+    route = request.args.get("route")
+    if request.args.get("format") == "collapsed":
+        return Response(profiling.store.collapsed(route), mimetype="text/plain")
+
+    report = profiling.store.report(profiling.interval, profiling.top)
+    if route:
+        report = {name: data for name, data in report.items() if name == route}
+    return (
+        jsonify(
+            {
+                "success": True,
+                "data": report,
+                "meta": {"sample_rate": profiling.sample_rate},
+            }
+        ),
+        200,
+    )
+
+
+@admin_bp.route("/admin/profiles", methods=["DELETE"])
+@admin_required
+def clear_profiles():
+    """Drop the aggregated request profiles."""
+    profiling = get_profiling()
+    if profiling is not None:
+        profiling.store.clear()
+    return jsonify({"success": True}), 200
+
+
+@admin_bp.route("/admin/memory", methods=["GET"])
+@admin_required
+def get_memory_status():
+    """Return whether tracemalloc runs, traced memory and stored snapshots."""
+    return jsonify({"success": True, "data": get_tracer().status()}), 200
+
+
+@admin_bp.route("/admin/memory/start", methods=["POST"])
+@admin_required
+def start_memory_tracing():
+    """
+    Start tracemalloc.
+
+    Request Body:
+        - frames: Traceback depth per allocation (default: 10)
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        frames = int(data.get("frames", 10))
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "error": "frames must be an integer"}), 400
+    tracer = get_tracer()
+    tracer.start(max(frames, 1))
+    return jsonify({"success": True, "data": tracer.status()}), 200
+
+
+@admin_bp.route("/admin/memory/stop", methods=["POST"])
+@admin_required
+def stop_memory_tracing():
+    """Stop tracemalloc and drop all snapshots."""
+    tracer = get_tracer()
+    tracer.stop()
+    return jsonify({"success": True, "data": tracer.status()}), 200
+
+
+@admin_bp.route("/admin/memory/snapshots", methods=["POST"])
+@admin_required
+def take_memory_snapshot():
+    """Take a snapshot; returns its id and summary."""
+    tracer = get_tracer()
+    limit = request.args.get("limit", 20, type=int)
+    try:
+        snapshot_id = tracer.take_snapshot()
+    except RuntimeError as e:
+        return jsonify({"success": False, "error": str(e)}), 409
+    summary = tracer.top(snapshot_id, limit)
+    return jsonify({"success": True, "data": dict(summary, id=snapshot_id)}), 201
+
+
+@admin_bp.route("/admin/memory/snapshots/<int:snapshot_id>", methods=["GET"])
+@admin_required
+def get_memory_snapshot(snapshot_id):
+    """
+    Return the top allocation sites and per-module totals of a snapshot.
+
+    Query Parameters:
+        - limit: Number of allocation sites (default: 20)
+    """
+    limit = request.args.get("limit", 20, type=int)
+    try:
+        summary = get_tracer().top(snapshot_id, limit)
+    except KeyError as e:
+        return jsonify({"success": False, "error": e.args[0]}), 404
+    return jsonify({"success": True, "data": dict(summary, id=snapshot_id)}), 200
+
+
+@admin_bp.route("/admin/memory/diff", methods=["GET"])
+@admin_required
+def diff_memory_snapshots():
+    """
+    Compare two snapshots.
+
+    Query Parameters:
+        - from: Id of the earlier snapshot
+        - to: Id of the later snapshot (default: a new snapshot taken now)
+        - limit: Number of allocation sites (default: 20)
+
+    Returns:
+        JSON with size/count growth per allocation site and module group
+    """
+    tracer = get_tracer()
+    from_id = request.args.get("from", type=int)
+    to_id = request.args.get("to", type=int)
+    limit = request.args.get("limit", 20, type=int)
+    if from_id is None:
+        return jsonify({"success": False, "error": "from is required"}), 400
+
+    try:
+        if to_id is None:
+            to_id = tracer.take_snapshot()
+        summary = tracer.diff(from_id, to_id, limit)
+    except RuntimeError as e:
+        return jsonify({"success": False, "error": str(e)}), 409
+    except KeyError as e:
+        return jsonify({"success": False, "error": e.args[0]}), 404
+    summary.update({"from": from_id, "to": to_id})
+    return jsonify({"success": True, "data": summary}), 200
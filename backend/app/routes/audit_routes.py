@@ -2,12 +2,15 @@
 from flask import Blueprint, jsonify, request
 from app import db
 from app.models.audit_log import AuditLog
-from sqlalchemy import desc
+from app.utils.change_tracking import mark_changed, AUDIT_LOGS
+from app.utils.http_cache import conditional_get
+from sqlalchemy import desc, func
 
 audit_bp = Blueprint('audit', __name__)
 
 
 @audit_bp.route('/audit-logs', methods=['GET'])
+@conditional_get(AUDIT_LOGS)
 def get_audit_logs():
     """
     Get all audit logs with optional filtering.
@@ -71,6 +74,7 @@ def get_audit_logs():
 
 
 @audit_bp.route('/audit-logs/<int:log_id>', methods=['GET'])
+@conditional_get(AUDIT_LOGS)
 def get_audit_log(log_id):
     """
     Get a specific audit log by ID.
@@ -96,6 +100,7 @@ def get_audit_log(log_id):
 
 
 @audit_bp.route('/audit-logs/stats', methods=['GET'])
+@conditional_get(AUDIT_LOGS)
 def get_audit_stats():
     """
     Get statistics about audit logs.
@@ -104,8 +109,6 @@ def get_audit_stats():
         JSON response with statistics
     """
     try:
-        from sqlalchemy import func
-
         # Count by action type
         action_counts = db.session.query(
             AuditLog.action,
@@ -160,9 +163,12 @@ def delete_audit_logs():
 
         # Count logs to be deleted
         count_to_delete = query.count()
+        last_id = db.session.query(func.max(AuditLog.id)).scalar()
 
         # Delete logs
         query.delete(synchronize_session=False)
+        AuditLog.log_purge(count_to_delete, last_id)
+        mark_changed(AUDIT_LOGS)
         db.session.commit()
 
         return jsonify({
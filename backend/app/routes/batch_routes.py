@@ -0,0 +1,194 @@
+"""Batch endpoint running several API operations in one round trip."""
+from contextlib import contextmanager
+
+from flask import Blueprint, current_app, request, jsonify
+from werkzeug.exceptions import MethodNotAllowed, NotFound
+from werkzeug.test import EnvironBuilder
+
+from app import db
+from app.utils.idempotency import BATCH_ENVIRON_KEY, idempotent
+
+batch_bp = Blueprint("batch", __name__)
+
+# Blueprints whose routes may be called from a batch
+BATCHABLE_BLUEPRINTS = {"absences", "absence_types", "audit"}
+ALLOWED_METHODS = {"GET", "POST", "PUT", "DELETE"}
+
+
+@contextmanager
+def deferred_commits(session):
+    """
+    Turn ``session.commit()`` calls into flushes while the block runs.
+
+    Services commit on their own; inside an atomic batch their work must stay in
+    the surrounding transaction so it can be committed or rolled back as a whole.
+    """
+    session.commit = session.flush  # instance attribute shadows the method
+    try:
+        yield
+    finally:
+        del session.commit
+
+
+def _resolve(method, path):
+    """Return an error message if the sub-request may not be dispatched."""
+    if method not in ALLOWED_METHODS:
+        return f"Method {method} is not allowed in a batch"
+    if not path or not path.startswith("/api/"):
+        return "Path must start with /api/"
+
+    adapter = current_app.url_map.bind("localhost")
+    try:
+        endpoint, _ = adapter.match(path.split("?", 1)[0], method=method)
+    except NotFound:
+        return f"No route for {path}"
+    except MethodNotAllowed:
+        return f"Method {method} is not allowed for {path}"
+
+    if endpoint.split(".", 1)[0] not in BATCHABLE_BLUEPRINTS:
+        return f"{path} cannot be called from a batch"
+    return None
+
+
+def _dispatch(operation):
+    """Run one sub-request in the current app context and return its result."""
+    method = str(operation.get("method", "GET")).upper()
+    path = operation.get("path")
+
+    error = _resolve(method, path)
+    if error:
+        return {"status": 400, "body": {"success": False, "error": error}}
+
+    builder = EnvironBuilder(
+        path=path,
+        method=method,
+        json=operation.get("body"),
+        headers=operation.get("headers") or {},
+        environ_overrides={BATCH_ENVIRON_KEY: True},
+    )
+    try:
+        # The app context (and so the database session) of the batch is reused
+        with current_app.request_context(builder.get_environ()):
+            response = current_app.full_dispatch_request()
+    except Exception as e:
+        return {"status": 500, "body": {"success": False, "error": str(e)}}
+    finally:
+        builder.close()
+
+    result = {"status": response.status_code, "body": response.get_json(silent=True)}
+    if response.headers.get("ETag"):
+        result["etag"] = response.headers["ETag"]
+    return result
+
+
+@batch_bp.route("/batch", methods=["POST"])
+@idempotent
+def run_batch():
+    """
+    Run an ordered list of API operations in one request.
+
+    An Idempotency-Key header applies to the batch as a whole; keys sent with
+    individual operations are ignored.
+
+    Request Body:
+        - requests: List of {"method", "path", "body", "headers"} objects, where
+          path is a full API path such as "/api/absences/5?fields=id"
+        - atomic: If true, run all operations in one transaction; the first
+          failing operation rolls everything back and the rest are skipped
+
+    Returns:
+        JSON with one {"status", "body"} result per operation, in order
+    """
+    data = request.get_json(silent=True) or {}
+    operations = data.get("requests")
+    atomic = bool(data.get("atomic", False))
+    max_requests = current_app.config.get("BATCH_MAX_REQUESTS", 50)
+
+    if not isinstance(operations, list) or not operations:
+        return (
+            jsonify({"success": False, "error": "requests must be a non-empty list"}),
+            400,
+        )
+    if len(operations) > max_requests:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "error": f"A batch may contain at most {max_requests} requests",
+                }
+            ),
+            400,
+        )
+
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict) or not isinstance(
+            operation.get("path"), str
+        ):
+            return (
+                jsonify(
+                    {
+                        "success": False,
+                        "error": f"requests[{index}] must be an object with a "
+                        "string path",
+                    }
+                ),
+                400,
+            )
+        if not isinstance(operation.get("headers") or {}, dict):
+            return (
+                jsonify(
+                    {
+                        "success": False,
+                        "error": f"requests[{index}].headers must be an object",
+                    }
+                ),
+                400,
+            )
+
+    session = db.session()
+    results = []
+    failed = False
+
+    if atomic:
+        with deferred_commits(session):
+            for operation in operations:
+                if failed:
+                    results.append(
+                        {
+                            "status": 424,
+                            "body": {
+                                "success": False,
+                                "error": "Skipped after an earlier failure",
+                            },
+                        }
+                    )
+                    continue
+                result = _dispatch(operation)
+                results.append(result)
+                failed = result["status"] >= 400
+        if failed:
+            session.rollback()
+        else:
+            session.commit()
+    else:
+        for operation in operations:
+            result = _dispatch(operation)
+            if result["status"] >= 400:
+                # Leave no half-done work behind for the next operation
+                session.rollback()
+                failed = True
+            results.append(result)
+
+    return (
+        jsonify(
+            {
+                "success": not failed,
+                "data": results,
+                "meta": {
+                    "atomic": atomic,
+                    "rolled_back": atomic and failed,
+                },
+            }
+        ),
+        200,
+    )
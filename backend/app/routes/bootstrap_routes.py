@@ -0,0 +1,78 @@
+"""Routes for the one-request SPA bootstrap payload."""
+import json
+
+from flask import Blueprint, Response, request, jsonify
+
+from app.services.bootstrap_service import BootstrapService
+
+bootstrap_bp = Blueprint("bootstrap", __name__)
+
+FILTER_PARAMS = (
+    "service_account",
+    "employee_fullname",
+    "absence_type",
+    "start_date",
+    "end_date",
+    "month",
+    "year",
+)
+
+
+def filters_from_args(args):
+    """
+    Build bootstrap filters from query parameters.
+
+    Returns None (current month) when no filter is given, or an empty dict when
+    ``all=true`` asks for every absence.
+    """
+    filters = {name: args.get(name) for name in FILTER_PARAMS if args.get(name)}
+    if filters:
+        return filters
+    if args.get("all", "false").lower() == "true":
+        return {}
+    return None
+
+
+@bootstrap_bp.route("/bootstrap", methods=["GET"])
+def get_bootstrap():
+    """
+    Get active absence types, absences and statistics in one response.
+
+    Query Parameters:
+        - Same filters as /statistics (default: current month)
+        - all: "true" to return every absence instead of the current month
+    """
+    try:
+        payload = BootstrapService.get_payload(filters_from_args(request.args))
+        return (
+            jsonify({"success": True, "data": payload}),
+            200,
+        )
+    except Exception as e:
+        return (
+            jsonify({"success": False, "error": str(e)}),
+            400,
+        )
+
+
+def render_index_with_bootstrap(index_path):
+    """
+    Serve index.html with the bootstrap payload inlined.
+
+    The payload matches the SPA's initial view (the current month, so the page
+    does not grow with the table) and is exposed as
+    ``window.__ABSENCEHUB_BOOTSTRAP__``, so first paint needs no API round trip.
+
+    Args:
+        index_path (Path): Path of the built index.html
+
+    Returns:
+        Response: HTML response
+    """
+    html = index_path.read_text(encoding="utf-8")
+    payload = json.dumps(BootstrapService.get_payload())
+    # Keep "</script>" (or any closing tag) inside the data from ending the element
+    payload = payload.replace("</", "<\\/")
+    script = f"<script>window.__ABSENCEHUB_BOOTSTRAP__ = {payload};</script>"
+    html = html.replace("</head>", f"{script}</head>", 1)
+    return Response(html, mimetype="text/html", headers={"Cache-Control": "no-cache"})
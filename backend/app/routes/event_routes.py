@@ -0,0 +1,65 @@
+"""Server-Sent Events stream of absence and absence type changes."""
+import json
+import queue
+
+from flask import Blueprint, Response, current_app, jsonify
+
+from app.utils.events import get_broker
+from app.utils.metrics import unmetered
+
+event_bp = Blueprint("events", __name__)
+
+
+@event_bp.route("/events", methods=["GET"])
+@unmetered
+def stream_events():
+    """
+    Stream change notices as Server-Sent Events.
+
+    Each committed create/update/delete produces one ``change`` event whose data
+    is a JSON object such as::
+
+        {"entity": "absence", "id": 12, "action": "updated",
+         "months": ["2025-01", "2025-02"]}
+
+    Clients refetch only the affected months (or nothing at all). A comment line
+    is sent every EVENT_HEARTBEAT_SECONDS to keep proxies from closing the stream.
+
+    A stream occupies a request thread for as long as it is open, so a worker
+    serves at most EVENT_MAX_STREAMS of them and answers 503 beyond that; the
+    SPA then retries later instead of holding the threads the API needs.
+    """
+    broker = get_broker()
+    heartbeat = current_app.config.get("EVENT_HEARTBEAT_SECONDS", 15)
+    subscriber = broker.subscribe(current_app.config.get("EVENT_MAX_STREAMS"))
+    if subscriber is None:
+        return (
+            jsonify({"success": False, "error": "Too many open event streams"}),
+            503,
+            {"Retry-After": "60"},
+        )
+
+    def generate():
+        # Ask clients to reconnect quickly if the stream drops
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                notice = subscriber.get(timeout=heartbeat)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: change\ndata: {json.dumps(notice)}\n\n"
+
+    response = Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Disable response buffering in nginx-style reverse proxies
+            "X-Accel-Buffering": "no",
+        },
+    )
+    # Also runs when the client leaves before the generator started, so the
+    # slot is never leaked
+    response.call_on_close(lambda: broker.unsubscribe(subscriber))
+    return response
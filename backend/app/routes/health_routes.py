@@ -1,10 +1,76 @@
 """Health check endpoints."""
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, current_app, jsonify
+
+from app import db
+from app.utils.metrics import get_metrics
+from app.utils.readiness import get_readiness
+from app.utils.result_cache import get_cache
+from app.utils.singleflight import get_singleflight
+from app.utils.sql_instrumentation import compiled_cache
+from app.utils.warmup import get_warmup
 
 health_bp = Blueprint("health", __name__)
 
 
 @health_bp.route("/health", methods=["GET"])
 def health_check():
-    """Health check endpoint."""
+    """Liveness check: constant time, never touches the database."""
     return jsonify({"status": "ok", "message": "Application is running"}), 200
+
+
+@health_bp.route("/ready", methods=["GET"])
+def readiness_check():
+    """
+    Readiness check for load balancers.
+
+    Checks that the warmup finished, runs SELECT 1, checks pool capacity and
+    that migrations are at head; the outcome is cached for READINESS_CACHE_SECONDS.
+
+    Returns:
+        200 with status "ready", or 503 with status "not_ready" and the
+        failing checks
+    """
+    # Flask-Migrate is only set up under the Flask CLI; servers check the
+    # directory it uses by default
+    migrate = current_app.extensions.get("migrate")
+    result = get_readiness().status(
+        db.engine, migrate.directory if migrate else "migrations", get_warmup()
+    )
+    response = jsonify(
+        {
+            "status": "ready" if result["ready"] else "not_ready",
+            "checks": result["checks"],
+            "cached": result["cached"],
+        }
+    )
+    response.headers["Cache-Control"] = "no-store"
+    return response, 200 if result["ready"] else 503
+
+
+@health_bp.route("/cache/stats", methods=["GET"])
+def cache_stats():
+    """Result cache, request coalescing and SQL compiled cache metrics."""
+    cache = get_cache()
+    flight = get_singleflight()
+    return (
+        jsonify(
+            {
+                "success": True,
+                "data": {
+                    "result_cache": cache.stats() if cache else None,
+                    "singleflight": flight.stats() if flight else None,
+                    "compiled_cache": compiled_cache.to_dict(db.engine),
+                },
+            }
+        ),
+        200,
+    )
+
+
+@health_bp.route("/metrics", methods=["GET"])
+def metrics():
+    """Request, database pool and cache metrics in Prometheus text format."""
+    registry = get_metrics()
+    if registry is None:
+        return jsonify({"success": False, "error": "Metrics are disabled"}), 404
+    return Response(registry.render(), mimetype="text/plain; version=0.0.4")
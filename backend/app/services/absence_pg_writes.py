@@ -0,0 +1,225 @@
+"""Single-statement UPDATE/DELETE ... RETURNING write path for PostgreSQL.
+
+The ORM write path needs about five round trips per update (load, overlap SELECT,
+UPDATE, audit INSERT, COMMIT). Here the load, overlap check, update and audit
+insert are one statement built from data-modifying CTEs, so a write costs the
+statement plus its COMMIT.
+
+Audit values are rendered with the same keys and formats as
+``EmployeeAbsence.to_dict()`` so both paths produce identical audit logs.
+"""
+from datetime import date, datetime
+
+from sqlalchemy import text
+
+from app import db
+
+# ISO 8601 like datetime.isoformat(), which leaves out zero microseconds
+# (colons escaped for text())
+_TIMESTAMP_FORMAT = "'YYYY-MM-DD\"T\"HH24\\:MI\\:SS'"
+_MICROSECONDS_FORMAT = "'.US'"
+
+
+def _timestamp(column):
+    """SQL expression rendering a timestamp column like isoformat()."""
+    return (
+        f"to_char({column}, {_TIMESTAMP_FORMAT}) || CASE "
+        f"WHEN {column} = date_trunc('second', {column}) THEN '' "
+        f"ELSE to_char({column}, {_MICROSECONDS_FORMAT}) END"
+    )
+
+
+def _absence_json(alias):
+    """SQL expression serializing an employee_absences row like to_dict()."""
+    return f"""json_build_object(
+        'id', {alias}.id,
+        'service_account', {alias}.service_account,
+        'employee_fullname', {alias}.employee_fullname,
+        'absence_type', {alias}.absence_type,
+        'start_date', {alias}.start_date,
+        'end_date', {alias}.end_date,
+        'is_half_day', {alias}.is_half_day,
+        'created_at', {_timestamp(alias + '.created_at')},
+        'updated_at', {_timestamp(alias + '.updated_at')},
+        'version', {alias}.version
+    )"""
+
+
+UPDATE_RETURNING = text(
+    f"""
+    WITH old AS (
+        SELECT * FROM employee_absences WHERE id = :id FOR UPDATE
+    ),
+    changed AS (
+        SELECT
+            old.id,
+            old.service_account,
+            CASE WHEN :set_fullname THEN CAST(:employee_fullname AS VARCHAR)
+                 ELSE old.employee_fullname END AS employee_fullname,
+            CASE WHEN :set_type THEN CAST(:absence_type AS VARCHAR)
+                 ELSE old.absence_type END AS absence_type,
+            CASE WHEN :set_start THEN CAST(:start_date AS DATE)
+                 ELSE old.start_date END AS start_date,
+            CASE WHEN :set_end THEN CAST(:end_date AS DATE)
+                 ELSE old.end_date END AS end_date,
+            CASE WHEN :set_half_day THEN CAST(:is_half_day AS BOOLEAN)
+                 ELSE old.is_half_day END AS is_half_day
+        FROM old
+    ),
+    new AS (
+        -- A half day always ends on its start date
+        SELECT
+            id, service_account, employee_fullname, absence_type, start_date,
+            CASE WHEN :set_half_day AND is_half_day THEN start_date
+                 ELSE end_date END AS end_date,
+            is_half_day
+        FROM changed
+    ),
+    conflict AS (
+        SELECT other.id, other.absence_type, other.start_date, other.end_date
+        FROM employee_absences other, new
+        WHERE :check_overlap
+          AND other.service_account = new.service_account
+          AND other.id <> new.id
+          AND other.start_date <= new.end_date
+          AND other.end_date >= new.start_date
+        LIMIT 1
+    ),
+    updated AS (
+        UPDATE employee_absences target
+        SET employee_fullname = new.employee_fullname,
+            absence_type = new.absence_type,
+            start_date = new.start_date,
+            end_date = new.end_date,
+            is_half_day = new.is_half_day,
+            updated_at = :now,
+            version = target.version + 1
+        FROM new
+        WHERE target.id = new.id
+          AND (CAST(:expected_version AS INTEGER) IS NULL
+               OR target.version = CAST(:expected_version AS INTEGER))
+          AND NOT EXISTS (SELECT 1 FROM conflict)
+        RETURNING target.*
+    ),
+    audit AS (
+        INSERT INTO audit_logs (
+            action, entity_type, entity_id, "user",
+            old_values, new_values, timestamp, description
+        )
+        SELECT
+            'UPDATE', 'EmployeeAbsence', updated.id, 'system',
+            {_absence_json("old")}, {_absence_json("updated")}, :now,
+            'Updated absence for ' || updated.service_account
+                || ' (' || updated.absence_type || ')'
+        FROM updated, old
+        RETURNING id
+    )
+    SELECT
+        (SELECT {_absence_json("old")} FROM old) AS old_values,
+        (SELECT {_absence_json("updated")} FROM updated) AS new_values,
+        (SELECT json_build_object(
+            'id', conflict.id,
+            'absence_type', conflict.absence_type,
+            'start_date', conflict.start_date,
+            'end_date', conflict.end_date
+        ) FROM conflict) AS conflict
+    """
+)
+
+DELETE_RETURNING = text(
+    f"""
+    WITH deleted AS (
+        DELETE FROM employee_absences
+        WHERE id = :id
+          AND (CAST(:expected_version AS INTEGER) IS NULL
+               OR version = CAST(:expected_version AS INTEGER))
+        RETURNING *
+    ),
+    audit AS (
+        INSERT INTO audit_logs (
+            action, entity_type, entity_id, "user",
+            old_values, new_values, timestamp, description
+        )
+        SELECT
+            'DELETE', 'EmployeeAbsence', deleted.id, 'system',
+            {_absence_json("deleted")}, NULL, :now,
+            'Deleted absence for ' || deleted.service_account
+                || ' (' || deleted.absence_type || ')'
+        FROM deleted
+        RETURNING id
+    )
+    SELECT {_absence_json("deleted")} AS old_values FROM deleted
+    """
+)
+
+
+def update_returning(absence_id, data, check_overlap, expected_version=None):
+    """
+    Apply an update, its overlap check and its audit entry in one statement.
+
+    Args:
+        absence_id (int): Absence ID
+        data (dict): Fields to update (same keys as AbsenceService.update)
+        check_overlap (bool): Whether to reject overlapping absences
+        expected_version (int): Only update if the row has this version
+
+    Returns:
+        tuple: (old_values, new_values, conflict) dictionaries; old_values is None
+            if the absence does not exist, new_values is None if a conflicting
+            absence (described by conflict) or a version mismatch prevented the
+            update
+    """
+    params = {
+        "id": absence_id,
+        "now": datetime.utcnow(),
+        "check_overlap": check_overlap,
+        "expected_version": expected_version,
+    }
+    for flag, field in (
+        ("set_fullname", "employee_fullname"),
+        ("set_type", "absence_type"),
+        ("set_start", "start_date"),
+        ("set_end", "end_date"),
+        ("set_half_day", "is_half_day"),
+    ):
+        params[flag] = field in data
+        params[field] = data.get(field)
+
+    row = db.session.execute(UPDATE_RETURNING, params).one()
+    return row.old_values, row.new_values, row.conflict
+
+
+def delete_returning(absence_id, expected_version=None):
+    """
+    Delete an absence and write its audit entry in one statement.
+
+    Args:
+        absence_id (int): Absence ID
+        expected_version (int): Only delete if the row has this version
+
+    Returns:
+        dict: Values of the deleted absence, or None if no row matched
+    """
+    row = db.session.execute(
+        DELETE_RETURNING,
+        {
+            "id": absence_id,
+            "now": datetime.utcnow(),
+            "expected_version": expected_version,
+        },
+    ).first()
+    return row.old_values if row else None
+
+
+def absence_from_values(values):
+    """Build a detached EmployeeAbsence from to_dict()-style values."""
+    from app.models.absence import EmployeeAbsence
+
+    absence = EmployeeAbsence(**values)
+    for field in ("start_date", "end_date"):
+        if values.get(field):
+            setattr(absence, field, date.fromisoformat(values[field]))
+    for field in ("created_at", "updated_at"):
+        if values.get(field):
+            setattr(absence, field, datetime.fromisoformat(values[field]))
+    return absence
@@ -1,15 +1,50 @@
 """Business logic for absence management."""
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+
+from flask import abort, current_app
+from sqlalchemy import select
+
 from app import db
 from app.models.absence import EmployeeAbsence
 from app.models.audit_log import AuditLog
+from app.services import absence_pg_writes
+from app.utils.change_tracking import mark_changed, ABSENCES, AUDIT_LOGS
+from app.utils.events import affected_months, queue_event
+from app.utils.result_cache import cached
+from app.utils.versioning import check_version, commit_versioned
+from app.utils.write_locks import lock_employee
 from app.validators.absence_validators import (
     validate_service_account,
     validate_date_range,
     validate_absence_type,
     ValidationError,
+    VersionConflictError,
 )
 
 
+def period_bounds(filters):
+    """
+    First and last day of the month (YYYY-MM) or year (YYYY) filter.
+
+    The month wins when both are given.
+
+    Args:
+        filters (dict): Filter parameters
+
+    Returns:
+        tuple: (first, last) dates, or None if the value is invalid
+    """
+    try:
+        if filters.get("month"):
+            year, month = map(int, filters["month"].split("-"))
+            return date(year, month, 1), date(year, month, monthrange(year, month)[1])
+        year = int(filters["year"])
+        return date(year, 1, 1), date(year, 12, 31)
+    except (ValueError, AttributeError, TypeError):
+        return None  # Invalid format, skip the filter
+
+
 class AbsenceService:
     """Service class for absence operations."""
 
@@ -32,6 +67,9 @@ class AbsenceService:
         validate_date_range(data.get("start_date"), data.get("end_date"))
         validate_absence_type(data.get("absence_type"))
 
+        # Serialize writes per employee so the overlap check stays valid
+        lock_employee(data.get("service_account"))
+
         # Check for overlapping absences
         AbsenceService._check_overlap(
             data.get("service_account"),
@@ -44,6 +82,13 @@ class AbsenceService:
         absence = EmployeeAbsence.from_dict(data)
         db.session.add(absence)
         db.session.flush()  # Flush to get the ID before logging
+        mark_changed(ABSENCES)
+        queue_event(
+            "absence",
+            absence.id,
+            "created",
+            affected_months((absence.start_date, absence.end_date)),
+        )
 
         # Log the creation
         AuditLog.log_create(
@@ -58,88 +103,65 @@ class AbsenceService:
         return absence
 
     @staticmethod
-    def _apply_filters(query, filters):
+    def _apply_filters(statement, filters):
         """
-        Apply filters to a query.
+        Apply filters to a select() (or a legacy Query).
+
+        Filter values only ever end up in bound parameters, so every filter
+        combination compiles to one statement that SQLAlchemy's compiled cache
+        reuses whatever the values are.
 
         Args:
-            query: SQLAlchemy query object
+            statement: SQLAlchemy select() or Query
             filters (dict): Filter parameters
 
         Returns:
-            query: Filtered query object
+            The filtered statement
         """
         if not filters:
-            return query
+            return statement
 
-        # LIKE search for service_account
+        # Substring search; "%" and "_" typed by the user match literally
         if filters.get("service_account"):
-            service_account = filters.get("service_account")
-            query = query.filter(
-                EmployeeAbsence.service_account.ilike(f"%{service_account}%")
+            statement = statement.where(
+                EmployeeAbsence.service_account.icontains(
+                    filters["service_account"], autoescape=True
+                )
             )
-
-        # LIKE search for employee_fullname
         if filters.get("employee_fullname"):
-            fullname = filters.get("employee_fullname")
-            query = query.filter(
-                EmployeeAbsence.employee_fullname.ilike(f"%{fullname}%")
+            statement = statement.where(
+                EmployeeAbsence.employee_fullname.icontains(
+                    filters["employee_fullname"], autoescape=True
+                )
             )
 
         # Exact match for absence_type
         if filters.get("absence_type"):
-            query = query.filter(
-                EmployeeAbsence.absence_type == filters.get("absence_type")
+            statement = statement.where(
+                EmployeeAbsence.absence_type == filters["absence_type"]
             )
 
-        # Filter by month (YYYY-MM format)
-        if filters.get("month"):
-            from datetime import datetime
-            month_str = filters.get("month")
-            try:
-                # Parse month (format: YYYY-MM)
-                year, month = map(int, month_str.split("-"))
-                # Get first day of month
-                from calendar import monthrange
-                last_day = monthrange(year, month)[1]
-                start_of_month = datetime(year, month, 1).date()
-                end_of_month = datetime(year, month, last_day).date()
-
-                query = query.filter(
-                    EmployeeAbsence.start_date <= end_of_month,
-                    EmployeeAbsence.end_date >= start_of_month
+        # Month (YYYY-MM) or year (YYYY): absences overlapping the period
+        if filters.get("month") or filters.get("year"):
+            period = period_bounds(filters)
+            if period is not None:
+                statement = statement.where(
+                    EmployeeAbsence.start_date <= period[1],
+                    EmployeeAbsence.end_date >= period[0],
                 )
-            except (ValueError, AttributeError):
-                pass  # Invalid month format, skip filter
-
-        # Filter by year (YYYY format)
-        elif filters.get("year"):
-            from datetime import datetime
-            year_str = filters.get("year")
-            try:
-                year = int(year_str)
-                start_of_year = datetime(year, 1, 1).date()
-                end_of_year = datetime(year, 12, 31).date()
-
-                query = query.filter(
-                    EmployeeAbsence.start_date <= end_of_year,
-                    EmployeeAbsence.end_date >= start_of_year
-                )
-            except (ValueError, AttributeError):
-                pass  # Invalid year format, skip filter
 
         # Date range filters (if month/year not provided)
         elif filters.get("start_date") or filters.get("end_date"):
             if filters.get("start_date"):
-                query = query.filter(
-                    EmployeeAbsence.start_date >= filters.get("start_date")
+                statement = statement.where(
+                    EmployeeAbsence.start_date >= filters["start_date"]
                 )
             if filters.get("end_date"):
-                query = query.filter(
-                    EmployeeAbsence.end_date <= filters.get("end_date")
+                statement = statement.where(
+                    EmployeeAbsence.end_date <= filters["end_date"]
                 )
 
-        return query
+        return statement
 
     @staticmethod
     def get_all(filters=None):
@@ -159,9 +181,140 @@ class AbsenceService:
         Returns:
             list: List of EmployeeAbsence objects
         """
-        query = EmployeeAbsence.query
-        query = AbsenceService._apply_filters(query, filters)
-        return query.order_by(EmployeeAbsence.updated_at.desc()).all()
+        statement = AbsenceService._apply_filters(select(EmployeeAbsence), filters)
+        statement = statement.order_by(EmployeeAbsence.updated_at.desc())
+        return db.session.scalars(statement).all()
+
+    @staticmethod
+    def get_all_serialized(filters=None, fields=None):
+        """
+        Get all absences with optional filters as serialized dictionaries.
+
+        When a sparse fieldset is given only those columns are selected from the
+        database, so unused columns are neither loaded nor serialized. Results
+        are cached per filter combination until the absences table changes.
+
+        Args:
+            filters (dict): Filter parameters (see get_all)
+            fields (tuple): Optional subset of EmployeeAbsence.SERIALIZABLE_FIELDS
+
+        Returns:
+            list: List of absence dictionaries
+        """
+        return cached(
+            "absences",
+            {"filters": filters, "fields": fields},
+            (ABSENCES,),
+            lambda: AbsenceService._query_serialized(filters, fields),
+        )
+
+    @staticmethod
+    def _query_serialized(filters, fields):
+        """Run the (uncached) serialized absence list query."""
+        if not fields:
+            return [absence.to_dict() for absence in AbsenceService.get_all(filters)]
+
+        columns = [getattr(EmployeeAbsence, field) for field in fields]
+        statement = AbsenceService._apply_filters(select(*columns), filters)
+        statement = statement.order_by(EmployeeAbsence.updated_at.desc())
+        rows = db.session.execute(statement).all()
+        return [EmployeeAbsence.row_to_dict(row, fields) for row in rows]
+
+    @staticmethod
+    def get_changes(since=None, safety_seconds=5):
+        """
+        Get absences changed since a change-feed token.
+
+        The feed is driven by the audit log: the token is the id of the last
+        audit entry the client has seen. Several changes to the same absence are
+        collapsed into its current row (or a tombstone if it was deleted).
+
+        Audit ids are allocated before commit, so a slow transaction can make a
+        lower id visible after a higher one. The returned token therefore never
+        advances past entries younger than ``safety_seconds``; those are sent
+        again on the next call, which is harmless because upserts are idempotent.
+
+        Deleting audit entries (DELETE /api/audit-logs) records a PURGE entry.
+        A token older than the latest purge may have missed changes whose
+        entries are gone, and a token above every remaining id means the ids
+        were reused after the table was emptied: both get a full sync instead.
+
+        Args:
+            since (int): Last token seen by the client, or None for a full sync
+            safety_seconds (int): Age an entry needs before the token moves past it
+
+        Returns:
+            dict: {"upserts": [...], "deleted": [...], "token": str, "reset": bool}
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=safety_seconds)
+
+        if since is not None:
+            last_id = db.session.query(db.func.max(AuditLog.id)).scalar() or 0
+            if since > last_id:
+                since = None
+
+        if since is None:
+            # Full sync: everything the client needs plus a starting token
+            token = (
+                db.session.query(db.func.max(AuditLog.id))
+                .filter(AuditLog.timestamp < cutoff)
+                .scalar()
+            ) or 0
+            return {
+                "upserts": AbsenceService.get_all_serialized(),
+                "deleted": [],
+                "token": str(token),
+                "reset": True,
+            }
+
+        entries = (
+            db.session.query(
+                AuditLog.id, AuditLog.entity_id, AuditLog.action, AuditLog.timestamp
+            )
+            .filter(
+                AuditLog.id > since,
+                db.or_(
+                    AuditLog.entity_type == "EmployeeAbsence",
+                    AuditLog.action == AuditLog.PURGE,
+                ),
+            )
+            .order_by(AuditLog.id)
+            .all()
+        )
+        if any(action == AuditLog.PURGE for _, _, action, _ in entries):
+            return AbsenceService.get_changes(None, safety_seconds)
+
+        token = since
+        settled = True
+        last_action = {}
+        for entry_id, entity_id, action, timestamp in entries:
+            if entity_id is not None:
+                last_action[entity_id] = action
+            # Advance the token only over the settled prefix of the feed
+            if settled and timestamp < cutoff:
+                token = entry_id
+            else:
+                settled = False
+
+        changed_ids = [
+            entity_id for entity_id, action in last_action.items() if action != "DELETE"
+        ]
+        upserts = []
+        if changed_ids:
+            rows = EmployeeAbsence.query.filter(
+                EmployeeAbsence.id.in_(changed_ids)
+            ).all()
+            upserts = [row.to_dict() for row in rows]
+
+        found_ids = {row["id"] for row in upserts}
+        deleted = sorted(set(last_action) - found_ids)
+
+        return {
+            "upserts": upserts,
+            "deleted": deleted,
+            "token": str(token),
+            "reset": False,
+        }
 
     @staticmethod
     def get_by_id(absence_id):
@@ -174,27 +327,36 @@ class AbsenceService:
         Returns:
             EmployeeAbsence: Absence or None if not found
         """
-        return EmployeeAbsence.query.get(absence_id)
+        return db.session.get(EmployeeAbsence, absence_id)
 
     @staticmethod
-    def update(absence_id, data):
+    def update(absence_id, data, expected_version=None):
         """
         Update existing absence with validation.
 
         Args:
             absence_id (int): Absence ID
             data (dict): Data to update
+            expected_version (int): Version the client edited (None = any)
 
         Returns:
             EmployeeAbsence: Updated absence
 
         Raises:
             ValidationError: If validation fails
+            VersionConflictError: If the absence was modified in the meantime
         """
+        if AbsenceService._use_returning_writes():
+            return AbsenceService._update_returning(
+                absence_id, data, expected_version
+            )
+
         absence = EmployeeAbsence.query.get_or_404(absence_id)
+        check_version(absence.version, expected_version)
 
         # Capture old values for audit log
         old_values = absence.to_dict()
+        old_range = (absence.start_date, absence.end_date)
 
         # Validate fields that are being updated
         if "start_date" in data and "end_date" in data:
@@ -204,6 +366,7 @@ class AbsenceService:
 
         # Check for overlapping absences (exclude current record)
         if "start_date" in data or "end_date" in data or "absence_type" in data:
+            lock_employee(absence.service_account)
             start_date = data.get("start_date") or absence.start_date
             end_date = data.get("end_date") or absence.end_date
             absence_type = data.get("absence_type") or absence.absence_type
@@ -231,6 +394,14 @@ class AbsenceService:
             if absence.is_half_day and absence.start_date:
                 absence.end_date = absence.start_date
 
+        mark_changed(ABSENCES)
+        queue_event(
+            "absence",
+            absence.id,
+            "updated",
+            affected_months(old_range, (absence.start_date, absence.end_date)),
+        )
+
         # Log the update
         new_values = absence.to_dict()
         AuditLog.log_update(
@@ -241,21 +412,29 @@ class AbsenceService:
             description=f'Updated absence for {absence.service_account} ({absence.absence_type})'
         )
 
-        db.session.commit()
+        commit_versioned(db.session)
         return absence
 
     @staticmethod
-    def delete(absence_id):
+    def delete(absence_id, expected_version=None):
         """
         Delete absence.
 
         Args:
             absence_id (int): Absence ID
+            expected_version (int): Version the client saw (None = any)
 
         Returns:
             EmployeeAbsence: Deleted absence
+
+        Raises:
+            VersionConflictError: If the absence was modified in the meantime
         """
+        if AbsenceService._use_returning_writes():
+            return AbsenceService._delete_returning(absence_id, expected_version)
+
         absence = EmployeeAbsence.query.get_or_404(absence_id)
+        check_version(absence.version, expected_version)
 
         # Capture values before deletion for audit log
         old_values = absence.to_dict()
@@ -269,6 +448,113 @@ class AbsenceService:
         )
 
         db.session.delete(absence)
+        mark_changed(ABSENCES)
+        queue_event(
+            "absence",
+            absence_id,
+            "deleted",
+            affected_months((absence.start_date, absence.end_date)),
+        )
+        commit_versioned(db.session)
+        return absence
+
+    @staticmethod
+    def _use_returning_writes():
+        """Whether to use the single-statement PostgreSQL write path."""
+        return (
+            current_app.config.get("RETURNING_WRITES", True)
+            and db.engine.dialect.name == "postgresql"
+        )
+
+    @staticmethod
+    def _update_returning(absence_id, data, expected_version=None):
+        """
+        Update an absence with one UPDATE ... RETURNING statement (PostgreSQL).
+
+        Loading the row, the overlap check, the update and the audit insert all
+        happen in a single statement; see app.services.absence_pg_writes.
+        """
+        # Validate fields that are being updated
+        if "start_date" in data and "end_date" in data:
+            validate_date_range(data.get("start_date"), data.get("end_date"))
+        if "absence_type" in data:
+            validate_absence_type(data.get("absence_type"))
+
+        check_overlap = (
+            "start_date" in data or "end_date" in data or "absence_type" in data
+        )
+        if check_overlap:
+            # The lock must be held before the statement takes its snapshot
+            service_account = db.session.execute(
+                select(EmployeeAbsence.service_account).where(
+                    EmployeeAbsence.id == absence_id
+                )
+            ).scalar()
+            if service_account is None:
+                abort(404)
+            lock_employee(service_account)
+
+        old_values, new_values, conflict = absence_pg_writes.update_returning(
+            absence_id, data, check_overlap, expected_version
+        )
+        if old_values is None:
+            abort(404)
+        check_version(old_values["version"], expected_version)
+        if new_values is None:
+            db.session.rollback()
+            raise ValidationError(
+                f"OVERLAP_ERROR|{conflict['absence_type']}|{conflict['id']}|"
+                f"{conflict['start_date']}|{conflict['end_date']}|"
+                f"{data.get('start_date') or old_values['start_date']}|"
+                f"{data.get('end_date') or old_values['end_date']}"
+            )
+
+        # The statement bypassed the ORM: drop any stale copy of the row
+        db.session.expire_all()
+        mark_changed(ABSENCES, AUDIT_LOGS)
+        queue_event(
+            "absence",
+            absence_id,
+            "updated",
+            affected_months(
+                *(
+                    (
+                        datetime.strptime(values["start_date"], "%Y-%m-%d").date(),
+                        datetime.strptime(values["end_date"], "%Y-%m-%d").date(),
+                    )
+                    for values in (old_values, new_values)
+                )
+            ),
+        )
+        db.session.commit()
+        return absence_pg_writes.absence_from_values(new_values)
+
+    @staticmethod
+    def _delete_returning(absence_id, expected_version=None):
+        """
+        Delete an absence with one DELETE ... RETURNING statement (PostgreSQL).
+
+        The audit insert is part of the same statement.
+        """
+        old_values = absence_pg_writes.delete_returning(absence_id, expected_version)
+        if old_values is None:
+            # Only a failed delete pays for telling "missing" from "modified"
+            current = db.session.get(EmployeeAbsence, absence_id)
+            if current is None:
+                abort(404)
+            check_version(current.version, expected_version)
+            # Changed and changed back (or deleted and recreated) in between
+            raise VersionConflictError("Resource was modified, please retry")
+
+        db.session.expire_all()
+        absence = absence_pg_writes.absence_from_values(old_values)
+        mark_changed(ABSENCES, AUDIT_LOGS)
+        queue_event(
+            "absence",
+            absence_id,
+            "deleted",
+            affected_months((absence.start_date, absence.end_date)),
+        )
         db.session.commit()
         return absence
 
@@ -288,16 +574,16 @@ class AbsenceService:
             ValidationError: If overlap is found
         """
         # Check for ANY overlapping absence for this employee (regardless of type)
-        query = EmployeeAbsence.query.filter(
+        statement = select(EmployeeAbsence).where(
             EmployeeAbsence.service_account == service_account,
             EmployeeAbsence.start_date <= end_date,
             EmployeeAbsence.end_date >= start_date,
         )
 
         if exclude_id:
-            query = query.filter(EmployeeAbsence.id != exclude_id)
+            statement = statement.where(EmployeeAbsence.id != exclude_id)
 
-        conflicting = query.first()
+        conflicting = db.session.scalars(statement.limit(1)).first()
         if conflicting:
             # Return error in English/German (frontend will handle translation)
             raise ValidationError(
@@ -316,15 +602,19 @@ class AbsenceService:
         Returns:
             dict: Statistics about absences in days
         """
-        # Start with base query
-        query = EmployeeAbsence.query
-
-        # Apply filters if provided
-        if filters:
-            query = AbsenceService._apply_filters(query, filters)
+        return cached(
+            "statistics",
+            {"filters": filters},
+            (ABSENCES,),
+            lambda: AbsenceService._compute_statistics(filters),
+        )
 
+    @staticmethod
+    def _compute_statistics(filters):
+        """Compute (uncached) statistics for the given filters."""
         # Get all filtered absences
-        absences = query.all()
+        statement = AbsenceService._apply_filters(select(EmployeeAbsence), filters)
+        absences = db.session.scalars(statement).all()
 
         # Calculate total days
         total_days = sum(absence.calculate_days() for absence in absences)
@@ -1,6 +1,9 @@
 """Business logic for absence type management."""
 from app import db
 from app.models.absence_type import AbsenceType
+from app.utils.change_tracking import mark_changed, ABSENCE_TYPES
+from app.utils.events import queue_event
+from app.utils.versioning import check_version, commit_versioned
 
 
 class AbsenceTypeService:
@@ -87,28 +90,34 @@ class AbsenceTypeService:
 
         # Save to database
         db.session.add(absence_type)
+        db.session.flush()
+        mark_changed(ABSENCE_TYPES)
+        queue_event("absence_type", absence_type.id, "created")
         db.session.commit()
 
         return absence_type
 
     @staticmethod
-    def update(type_id, data):
+    def update(type_id, data, expected_version=None):
         """
         Update existing absence type.
 
         Args:
             type_id (int): Absence type ID
             data (dict): Updated data
+            expected_version (int): Version the client edited (None = any)
 
         Returns:
             AbsenceType: Updated absence type
 
         Raises:
             ValueError: If validation fails
+            VersionConflictError: If the type was modified in the meantime
         """
         absence_type = AbsenceTypeService.get_by_id(type_id)
         if not absence_type:
             raise ValueError(f'Absence type with ID {type_id} not found')
+        check_version(absence_type.version, expected_version)
 
         # Check if new name conflicts with existing
         if 'name' in data and data['name'] != absence_type.name:
@@ -135,51 +144,61 @@ class AbsenceTypeService:
             absence_type.is_active = data['is_active']
 
         # Save changes
-        db.session.commit()
+        mark_changed(ABSENCE_TYPES)
+        queue_event("absence_type", absence_type.id, "updated")
+        commit_versioned(db.session)
 
         return absence_type
 
     @staticmethod
-    def delete(type_id):
+    def delete(type_id, expected_version=None):
         """
         Delete absence type (soft delete by setting is_active=False).
 
         Args:
             type_id (int): Absence type ID
+            expected_version (int): Version the client saw (None = any)
 
         Returns:
             AbsenceType: Deleted absence type
 
         Raises:
             ValueError: If type not found
+            VersionConflictError: If the type was modified in the meantime
         """
         absence_type = AbsenceTypeService.get_by_id(type_id)
         if not absence_type:
             raise ValueError(f'Absence type with ID {type_id} not found')
+        check_version(absence_type.version, expected_version)
 
         # Soft delete
         absence_type.is_active = False
-        db.session.commit()
+        mark_changed(ABSENCE_TYPES)
+        queue_event("absence_type", absence_type.id, "updated")
+        commit_versioned(db.session)
 
         return absence_type
 
     @staticmethod
-    def hard_delete(type_id):
+    def hard_delete(type_id, expected_version=None):
         """
         Permanently delete absence type from database.
 
         Args:
             type_id (int): Absence type ID
+            expected_version (int): Version the client saw (None = any)
 
         Returns:
             AbsenceType: Deleted absence type
 
         Raises:
             ValueError: If type not found or has dependencies
+            VersionConflictError: If the type was modified in the meantime
         """
         absence_type = AbsenceTypeService.get_by_id(type_id)
         if not absence_type:
             raise ValueError(f'Absence type with ID {type_id} not found')
+        check_version(absence_type.version, expected_version)
 
         # Check if type is used in any absences
         from app.models.absence import EmployeeAbsence
@@ -196,6 +215,8 @@ class AbsenceTypeService:
 
         # Hard delete
         db.session.delete(absence_type)
-        db.session.commit()
+        mark_changed(ABSENCE_TYPES)
+        queue_event("absence_type", type_id, "deleted")
+        commit_versioned(db.session)
 
         return absence_type
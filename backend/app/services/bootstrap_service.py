@@ -0,0 +1,55 @@
+"""Business logic for the SPA bootstrap payload."""
+from datetime import date
+
+from app import db
+from app.services.absence_service import AbsenceService
+from app.services.absence_type_service import AbsenceTypeService
+
+
+class BootstrapService:
+    """Service class assembling everything the SPA needs for first paint."""
+
+    @staticmethod
+    def get_payload(filters=None):
+        """
+        Get active absence types, absences and statistics in one call.
+
+        All reads run in the same database transaction. On PostgreSQL it is a
+        REPEATABLE READ transaction, so the three parts come from one snapshot.
+
+        Args:
+            filters (dict): Absence filters; defaults to the current month.
+                Pass an empty dict for all absences.
+
+        Returns:
+            dict: {"absence_types": [...], "absences": [...],
+                   "statistics": {...}, "filters": {...}}
+        """
+        if filters is None:
+            filters = {"month": date.today().strftime("%Y-%m")}
+
+        session = db.session()
+        snapshot = (
+            db.engine.dialect.name == "postgresql" and not session.in_transaction()
+        )
+        if snapshot:
+            session.connection(
+                execution_options={"isolation_level": "REPEATABLE READ"}
+            )
+
+        absence_types = AbsenceTypeService.get_all(active_only=True)
+        if snapshot:
+            # The result cache keys on the generations current when the key is
+            # built; a write committed since the snapshot began has bumped them
+            # without being visible here, so the older result must not be cached
+            absences = AbsenceService._query_serialized(filters or None, None)
+            statistics = AbsenceService._compute_statistics(filters or None)
+        else:
+            absences = AbsenceService.get_all_serialized(filters or None)
+            statistics = AbsenceService.get_statistics(filters or None)
+        return {
+            "absence_types": [absence_type.to_dict() for absence_type in absence_types],
+            "absences": absences,
+            "statistics": statistics,
+            "filters": filters,
+        }
@@ -0,0 +1,40 @@
+"""Access control for operator-only diagnostics (profiling, memory tracing).
+
+Diagnostics are enabled by setting ADMIN_TOKEN; requests must then send the
+token in the ``X-Admin-Token`` header. Without a token every admin feature is
+switched off.
+"""
+import hmac
+from functools import wraps
+
+from flask import current_app, jsonify, request
+
+HEADER = "X-Admin-Token"
+
+
+def admin_enabled(app=None):
+    """Whether an admin token is configured."""
+    return bool((app or current_app).config.get("ADMIN_TOKEN"))
+
+
+def is_admin_request():
+    """Whether the current request carries the configured admin token."""
+    token = current_app.config.get("ADMIN_TOKEN")
+    if not token:
+        return False
+    supplied = request.headers.get(HEADER, "")
+    return hmac.compare_digest(supplied.encode("utf-8"), token.encode("utf-8"))
+
+
+def admin_required(view):
+    """Decorate a view so only requests with the admin token may call it."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not admin_enabled():
+            return jsonify({"success": False, "error": "Admin API is disabled"}), 404
+        if not is_admin_request():
+            return jsonify({"success": False, "error": "Admin token required"}), 403
+        return view(*args, **kwargs)
+
+    return wrapper
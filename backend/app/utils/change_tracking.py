@@ -0,0 +1,216 @@
+"""Per-table change generations for conditional requests and cache invalidation.
+
+Services call ``mark_changed(table)`` while they modify rows, and every ORM flush
+marks the tables of the objects it wrote. The marks are kept on the SQLAlchemy
+session and only turned into a generation bump once the transaction commits, so
+readers never observe a new generation before the data is visible (and rolled
+back work never bumps anything).
+
+Generations live in an in-process store by default. When ``SHARED_STATE_DIR`` is
+configured they are kept in small files in that directory so every worker process
+on the host sees the same values.
+"""
+import itertools
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from flask import current_app, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+ABSENCES = "employee_absences"
+ABSENCE_TYPES = "absence_types"
+AUDIT_LOGS = "audit_logs"
+
+EXTENSION_KEY = "change_tracking"
+PENDING_KEY = "change_tracking.pending"
+BYPASS_ENVIRON_KEY = "absencehub.bypass_caches"
+
+
+class MemoryGenerationStore:
+    """Generation store shared by the threads of a single process."""
+
+    # Writes made by other worker processes never reach this store
+    shared = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generations = {}
+        self._started_at = time.time()
+        # Random epoch so that validators issued by a previous process never match
+        self.epoch = uuid.uuid4().hex[:12]
+
+    def get(self, table):
+        """Return (generation, modified_at timestamp) for a table."""
+        return self._generations.get(table, (0, self._started_at))
+
+    def bump(self, table):
+        """Advance the generation of a table and return the new value."""
+        with self._lock:
+            generation, _ = self.get(table)
+            self._generations[table] = (generation + 1, time.time())
+            return generation + 1
+
+
+class FileGenerationStore:
+    """Generation store backed by one file per table in a shared directory."""
+
+    shared = True
+
+    def __init__(self, directory):
+        self.directory = os.path.join(directory, "generations")
+        os.makedirs(self.directory, exist_ok=True)
+        self._started_at = time.time()
+        self.epoch = self._read_epoch()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _read_epoch(self):
+        path = self._path("epoch")
+        try:
+            with open(path) as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            epoch = uuid.uuid4().hex[:12]
+            self._write(path, epoch)
+            return epoch
+
+    def _write(self, path, content):
+        # Write to a private temporary file and rename so readers never see
+        # a partially written value.
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def get(self, table):
+        """Return (generation, modified_at timestamp) for a table."""
+        try:
+            with open(self._path(table)) as f:
+                generation, modified_at = f.read().split()
+            return int(generation), float(modified_at)
+        except (FileNotFoundError, ValueError):
+            return 0, self._started_at
+
+    def bump(self, table):
+        """
+        Advance the generation of a table and return the new value.
+
+        Generations are nanosecond timestamps (forced to increase), so concurrent
+        writers in different processes never need a shared lock: whichever value
+        lands last is still different from every value handed out before.
+        """
+        generation, _ = self.get(table)
+        now = time.time()
+        generation = max(generation + 1, time.time_ns())
+        self._write(self._path(table), f"{generation} {now}")
+        return generation
+
+
+def init_app(app):
+    """Attach the generation store configured for the application."""
+    shared_dir = app.config.get("SHARED_STATE_DIR")
+    if shared_dir:
+        store = FileGenerationStore(shared_dir)
+    else:
+        store = MemoryGenerationStore()
+    app.extensions[EXTENSION_KEY] = store
+    return store
+
+
+def get_store():
+    """Return the generation store of the current application."""
+    return current_app.extensions[EXTENSION_KEY]
+
+
+def get_generation(table):
+    """Return the current generation of a table."""
+    return get_store().get(table)[0]
+
+
+def get_last_modified(*tables):
+    """Return the most recent modification time of the given tables (UTC)."""
+    store = get_store()
+    modified_at = max(store.get(table)[1] for table in tables)
+    return datetime.fromtimestamp(int(modified_at), tz=timezone.utc)
+
+
+def mark_changed(*tables):
+    """
+    Record that the current transaction modified the given tables.
+
+    The generations are bumped after the transaction commits.
+    """
+    from app import db
+
+    db.session.info.setdefault(PENDING_KEY, set()).update(tables)
+
+
+def has_pending_changes():
+    """
+    Return True if the current transaction has written but not yet committed.
+
+    Generation-keyed caches must be bypassed then: the uncommitted data is not
+    covered by the current generation and may still be rolled back.
+    """
+    from app import db
+
+    return bool(db.session.info.get(PENDING_KEY))
+
+
+def bypass_caches():
+    """
+    Make the rest of the current request skip generation-keyed caches.
+
+    Result cache lookups (and their single-flight coalescing) and conditional
+    GETs then run the real work, e.g. for a profiled request.
+    """
+    request.environ[BYPASS_ENVIRON_KEY] = True
+
+
+def caches_bypassed():
+    """
+    Return True if generation-keyed caches must not be used right now.
+
+    That is the case while the transaction has uncommitted writes (see
+    has_pending_changes) and in requests that called bypass_caches().
+    """
+    if has_pending_changes():
+        return True
+    return has_request_context() and request.environ.get(BYPASS_ENVIRON_KEY, False)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed_tables(session, flush_context):
+    # new/dirty/deleted still describe the objects written by this flush
+    tables = {
+        obj.__table__.name
+        for obj in itertools.chain(session.new, session.dirty, session.deleted)
+        if hasattr(obj, "__table__")
+    }
+    if tables:
+        session.info.setdefault(PENDING_KEY, set()).update(tables)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_pending_generations(session):
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending or not has_app_context():
+        return
+
+    store = current_app.extensions.get(EXTENSION_KEY)
+    if store is None:
+        return
+    for table in pending:
+        store.bump(table)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_generations(session, previous_transaction):
+    if previous_transaction.parent is not None:
+        return  # only a savepoint was rolled back
+    session.info.pop(PENDING_KEY, None)
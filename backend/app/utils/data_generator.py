@@ -0,0 +1,443 @@
+"""Deterministic synthetic absences for benchmarks and load tests.
+
+Unlike ``seed_data`` (a couple of dozen random rows through the ORM), this
+generator builds datasets of millions of rows that look like real usage:
+
+    - every employee has a chronological sequence of absences that never
+      overlap, spread over the configured date range;
+    - absence types follow a realistic mix, each with its own duration range
+      and half-day share (sick days are short, vacations long);
+    - the audit log gets the matching history: a CREATE per absence, UPDATEs
+      for some of them and cancelled absences (CREATE + DELETE).
+
+Output depends only on the seed: employee ``i`` always gets the same rows
+from ``random.Random(f"{seed}:{i}")`` no matter how employees are split
+across worker processes. Absence ids are assigned up front from a per-employee
+block, so workers never coordinate. On PostgreSQL (psycopg2 or psycopg 3)
+every worker writes its share with COPY; with other databases or drivers
+workers only generate rows and the parent inserts them in batches.
+"""
+import csv
+import io
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.pool import NullPool
+
+from app.models.absence import EmployeeAbsence
+from app.models.audit_log import AuditLog
+
+# Type -> (weight, (min days, max days), half-day probability)
+TYPE_PROFILES = {
+    "Urlaub": (0.42, (1, 15), 0.10),
+    "Home Office": (0.33, (1, 3), 0.25),
+    "Krankheit": (0.18, (1, 6), 0.05),
+    "Sonstige": (0.07, (1, 3), 0.20),
+}
+ABSENCES_PER_EMPLOYEE = 40
+UPDATE_PROBABILITY = 0.15
+CANCEL_PROBABILITY = 0.05
+
+FIRST_NAMES = tuple(
+    "Anna Ben Clara David Emma Felix Greta Hannes Ida Jonas Klara Lukas Mia Noah "
+    "Paula Tim".split()
+)
+LAST_NAMES = tuple(
+    "Becker Fischer Hoffmann Koch Meyer Müller Richter Schmidt Schneider Schulz "
+    "Wagner Weber Wolf Zimmermann".split()
+)
+
+ABSENCE_COLUMNS = (
+    "id",
+    "service_account",
+    "employee_fullname",
+    "absence_type",
+    "start_date",
+    "end_date",
+    "is_half_day",
+    "created_at",
+    "updated_at",
+    "version",
+)
+AUDIT_COLUMNS = (
+    "action",
+    "entity_type",
+    "entity_id",
+    "user",
+    "old_values",
+    "new_values",
+    "timestamp",
+    "description",
+)
+
+_TYPES = tuple(TYPE_PROFILES)
+_WEIGHTS = tuple(profile[0] for profile in TYPE_PROFILES.values())
+
+
+def employee_identity(index):
+    """Return the (service account, full name) of employee ``index``."""
+    first = FIRST_NAMES[index % len(FIRST_NAMES)]
+    last = LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]
+    account = f"s.{first}.{last}{index}".lower().replace("ü", "ue")
+    return account, f"{first} {last}"
+
+
+def plan_employees(rows, employees=None, first_id=1):
+    """
+    Split ``rows`` absences over the employees.
+
+    Args:
+        rows (int): Total number of (live) absences
+        employees (int): Number of employees (default: one per
+            ABSENCES_PER_EMPLOYEE absences)
+        first_id (int): Smallest absence id to hand out
+
+    Returns:
+        list: (employee index, absence count, first absence id) per employee.
+            Each employee owns the id block [first id, first id + 2 * count)
+            so cancelled absences get ids too.
+    """
+    employees = employees or max(1, math.ceil(rows / ABSENCES_PER_EMPLOYEE))
+    employees = min(employees, rows) or 1
+    per_employee, remainder = divmod(rows, employees)
+    plan = []
+    offset = 0
+    for index in range(employees):
+        count = per_employee + (1 if index < remainder else 0)
+        plan.append((index, count, first_id + 2 * offset))
+        offset += count
+    return plan
+
+
+def _audit_values(row):
+    """The absence as AuditLog stores it (EmployeeAbsence.to_dict() format)."""
+    return {
+        key: value.isoformat() if isinstance(value, (date, datetime)) else value
+        for key, value in row.items()
+    }
+
+
+def _audit(action, row, old_values, new_values, timestamp):
+    verb = {"CREATE": "Created", "UPDATE": "Updated", "DELETE": "Deleted"}[action]
+    return {
+        "action": action,
+        "entity_type": "EmployeeAbsence",
+        "entity_id": row["id"],
+        "user": "system",
+        "old_values": old_values,
+        "new_values": new_values,
+        "timestamp": timestamp,
+        "description": (
+            f"{verb} absence for {row['service_account']} ({row['absence_type']})"
+        ),
+    }
+
+
+def generate_employee(seed, index, count, first_id, start, end, audit=True):
+    """
+    Generate the absences (and audit history) of one employee.
+
+    Args:
+        seed (int): Dataset seed
+        index (int): Employee index
+        count (int): Number of live absences to generate
+        first_id (int): First id of the employee's id block
+        start (date): First day absences may start on
+        end (date): Day around which the sequence should end
+        audit (bool): Whether to generate audit log rows
+
+    Returns:
+        tuple: (absence rows, audit rows) as lists of column dictionaries
+    """
+    rng = random.Random(f"{seed}:{index}")
+    account, fullname = employee_identity(index)
+    absences = []
+    audits = []
+    if count == 0:
+        return absences, audits
+
+    # Average gap that spreads the sequence over the date range (the type
+    # mix averages about 5 calendar days per absence, plus the day after it)
+    span_days = max((end - start).days, 1)
+    mean_gap = max(span_days / (count * (1 + CANCEL_PROBABILITY)) - 6, 1)
+    current = start + timedelta(days=rng.randint(0, int(mean_gap)))
+    next_id = first_id
+    cancellations = 0
+
+    while len(absences) < count:
+        # Absences start on working days
+        while current.weekday() >= 5:
+            current += timedelta(days=1)
+
+        absence_type = rng.choices(_TYPES, _WEIGHTS)[0]
+        _, (min_days, max_days), half_day_share = TYPE_PROFILES[absence_type]
+        half_day = rng.random() < half_day_share
+        days = 1 if half_day else rng.randint(min_days, max_days)
+        last_day = current + timedelta(days=days - 1)
+
+        # Vacations are planned ahead, sick leave is entered on the day
+        lead_days = 0 if absence_type == "Krankheit" else rng.randint(1, 60)
+        created_at = datetime.combine(
+            current - timedelta(days=lead_days), datetime.min.time()
+        ) + timedelta(seconds=rng.randint(7 * 3600, 18 * 3600))
+
+        row = {
+            "id": next_id,
+            "service_account": account,
+            "employee_fullname": fullname,
+            "absence_type": absence_type,
+            "start_date": current,
+            "end_date": last_day,
+            "is_half_day": half_day,
+            "created_at": created_at,
+            "updated_at": created_at,
+            "version": 1,
+        }
+        next_id += 1
+        # At most ``count`` cancellations fit into the employee's id block
+        cancelled = rng.random() < CANCEL_PROBABILITY and cancellations < count
+        cancellations += cancelled
+        updated = not cancelled and not half_day and rng.random() < UPDATE_PROBABILITY
+
+        created = row
+        if updated:
+            # The employee first entered a shorter absence, then extended it
+            created = dict(
+                row, end_date=current + timedelta(days=rng.randint(0, days - 1))
+            )
+            row["updated_at"] = created_at + timedelta(hours=rng.randint(1, 72))
+            row["version"] = 2
+        if audit:
+            audits.append(
+                _audit("CREATE", row, None, _audit_values(created), created_at)
+            )
+            if updated:
+                audits.append(
+                    _audit(
+                        "UPDATE",
+                        row,
+                        _audit_values(created),
+                        _audit_values(row),
+                        row["updated_at"],
+                    )
+                )
+
+        if cancelled:
+            if audit:
+                deleted_at = created_at + timedelta(hours=rng.randint(1, 240))
+                audits.append(
+                    _audit("DELETE", row, _audit_values(row), None, deleted_at)
+                )
+        else:
+            absences.append(row)
+
+        current = last_day + timedelta(days=1 + rng.randint(0, int(2 * mean_gap)))
+
+    return absences, audits
+
+
+def generate_chunk(seed, chunk, start, end, audit=True):
+    """Generate the rows of several employees (a list of plan entries)."""
+    absences = []
+    audits = []
+    for index, count, first_id in chunk:
+        employee_absences, employee_audits = generate_employee(
+            seed, index, count, first_id, start, end, audit
+        )
+        absences.extend(employee_absences)
+        audits.extend(employee_audits)
+    return absences, audits
+
+
+def _csv_value(value):
+    # None -> empty unquoted field, which COPY reads as NULL
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return value
+
+
+# PostgreSQL drivers whose cursors support COPY FROM STDIN
+COPY_DRIVERS = ("psycopg2", "psycopg")
+
+
+def copy_rows(connection, table, columns, rows):
+    """
+    Write rows with PostgreSQL COPY.
+
+    Args:
+        connection: DBAPI connection of one of the COPY_DRIVERS
+        table (str): Table name
+        columns (tuple): Column names, in row order
+        rows (list): Column dictionaries
+    """
+    if not rows:
+        return
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_csv_value(row[column]) for column in columns])
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    statement = f"COPY {table} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+    with connection.cursor() as cursor:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+        else:  # psycopg 3
+            with cursor.copy(statement) as copy:
+                copy.write(buffer.getvalue())
+
+
+def insert_rows(connection, table, rows, batch_size=10000):
+    """Write rows with batched executemany INSERTs (any database)."""
+    for offset in range(0, len(rows), batch_size):
+        connection.execute(insert(table), rows[offset:offset + batch_size])
+
+
+def _copy_chunk(url, seed, chunk, start, end, audit):
+    """Worker: generate a chunk and COPY it into PostgreSQL."""
+    absences, audits = generate_chunk(seed, chunk, start, end, audit)
+    engine = create_engine(url, poolclass=NullPool)
+    try:
+        connection = engine.raw_connection()
+        try:
+            copy_rows(
+                connection, EmployeeAbsence.__tablename__, ABSENCE_COLUMNS, absences
+            )
+            copy_rows(connection, AuditLog.__tablename__, AUDIT_COLUMNS, audits)
+            connection.commit()
+        finally:
+            connection.close()
+    finally:
+        engine.dispose()
+    return len(absences), len(audits)
+
+
+def _chunks(plan, workers):
+    # Several chunks per worker keep all processes busy until the end
+    size = max(1, min(2000, math.ceil(len(plan) / (workers * 4))))
+    return [plan[offset:offset + size] for offset in range(0, len(plan), size)]
+
+
+def generate_dataset(
+    engine,
+    rows,
+    employees=None,
+    seed=42,
+    start=date(2020, 1, 1),
+    end=date(2025, 12, 31),
+    audit=True,
+    workers=None,
+    replace=False,
+    batch_size=10000,
+):
+    """
+    Generate absences (and their audit history) into a database.
+
+    Args:
+        engine: SQLAlchemy engine of the target database (tables must exist)
+        rows (int): Number of absences to create
+        employees (int): Number of employees (default: rows / 40)
+        seed (int): Seed; the same seed always produces the same dataset
+        start (date): Earliest absence start
+        end (date): Day the absence sequences are spread up to
+        audit (bool): Also write the audit history
+        workers (int): Processes used for generation (default: CPU count)
+        replace (bool): Delete existing absences and audit entries first
+        batch_size (int): Rows per INSERT batch (non-PostgreSQL databases)
+
+    Returns:
+        dict: Counts of employees, absences and audit rows plus the duration
+    """
+    started = time.perf_counter()
+    workers = max(1, workers or os.cpu_count() or 1)
+    absences_table = EmployeeAbsence.__table__
+    audit_table = AuditLog.__table__
+    is_postgres = engine.dialect.name == "postgresql"
+    # In-memory SQLite exists only in this process's connection
+    in_process = workers == 1 or engine.url.database in (None, "", ":memory:")
+
+    with engine.begin() as connection:
+        if replace:
+            last_audit_id = connection.execute(select(func.max(audit_table.c.id)))
+            last_audit_id = last_audit_id.scalar() or 0
+            connection.execute(absences_table.delete())
+            if audit:
+                connection.execute(audit_table.delete())
+            # The deletions have no audit entries: change feed clients resync.
+            # Only the PostgreSQL sequence never hands emptied ids out again.
+            marker_id = {} if is_postgres else {"id": last_audit_id + 1}
+            connection.execute(
+                insert(audit_table).values(
+                    **marker_id,
+                    action=AuditLog.PURGE,
+                    entity_type="AuditLog",
+                    user="system",
+                    timestamp=datetime.utcnow(),
+                    description="Replaced by generate-data",
+                )
+            )
+        first_id = (
+            connection.execute(select(func.max(absences_table.c.id))).scalar() or 0
+        ) + 1
+
+    plan = plan_employees(rows, employees, first_id)
+    chunks = _chunks(plan, workers)
+    totals = [0, 0]
+
+    if is_postgres and engine.dialect.driver in COPY_DRIVERS and not in_process:
+        url = engine.url.render_as_string(hide_password=False)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_copy_chunk, url, seed, chunk, start, end, audit)
+                for chunk in chunks
+            ]
+            for future in futures:
+                absences, audits = future.result()
+                totals[0] += absences
+                totals[1] += audits
+    else:
+        def write(result):
+            absences, audits = result
+            with engine.begin() as connection:
+                insert_rows(connection, absences_table, absences, batch_size)
+                insert_rows(connection, audit_table, audits, batch_size)
+            totals[0] += len(absences)
+            totals[1] += len(audits)
+
+        if in_process:
+            for chunk in chunks:
+                write(generate_chunk(seed, chunk, start, end, audit))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                args = [(seed, chunk, start, end, audit) for chunk in chunks]
+                for result in pool.map(generate_chunk, *zip(*args)):
+                    write(result)
+
+    if is_postgres:
+        # Ids were assigned explicitly; move the sequence past them
+        with engine.begin() as connection:
+            connection.execute(
+                text(
+                    "SELECT setval(pg_get_serial_sequence('employee_absences', "
+                    "'id'), (SELECT COALESCE(MAX(id), 1) FROM employee_absences))"
+                )
+            )
+
+    return {
+        "employees": len(plan),
+        "absences": totals[0],
+        "audit_logs": totals[1],
+        "seconds": round(time.perf_counter() - started, 3),
+    }
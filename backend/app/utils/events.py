@@ -0,0 +1,370 @@
+"""Change notifications pushed to connected clients (Server-Sent Events).
+
+Services queue compact notices (entity, id, action, affected months) on the
+SQLAlchemy session; they are published to the configured broker only after the
+transaction commits. The PostgreSQL broker sends them with ``pg_notify`` inside
+the transaction itself, right before COMMIT: PostgreSQL delivers them exactly
+when the commit succeeds, with no extra connection or round trip afterwards.
+Each worker process delivers the notices it receives from the broker to its own
+SSE subscribers.
+
+Brokers:
+    - "local":    in-process only (single worker)
+    - "file":     JSON lines appended to a file under ``SHARED_STATE_DIR`` and
+                  tailed by every worker on the host
+    - "postgres": PostgreSQL LISTEN/NOTIFY on the application database (psycopg2
+                  or psycopg 3)
+
+Each open stream keeps a request thread busy, so EVENT_MAX_STREAMS caps them
+per worker and leaves the other threads to the API.
+"""
+import json
+import logging
+import os
+import queue
+import select
+import threading
+import time
+from datetime import timedelta
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+EXTENSION_KEY = "event_broker"
+PENDING_KEY = "events.pending"
+CHANNEL = "absencehub_events"
+
+# All notices of a transaction in one statement
+_NOTIFY = text(
+    "SELECT pg_notify(:channel, payload) "
+    "FROM unnest(CAST(:payloads AS TEXT[])) AS payload"
+)
+
+logger = logging.getLogger(__name__)
+
+
+def affected_months(*date_ranges):
+    """
+    Return the sorted YYYY-MM months touched by the given date ranges.
+
+    Args:
+        *date_ranges: (start_date, end_date) tuples; ranges with missing dates
+            are ignored
+
+    Returns:
+        list: Month strings, e.g. ["2025-01", "2025-02"]
+    """
+    months = set()
+    for start_date, end_date in date_ranges:
+        if not start_date or not end_date:
+            continue
+        current = start_date.replace(day=1)
+        while current <= end_date:
+            months.add(current.strftime("%Y-%m"))
+            current = (current + timedelta(days=32)).replace(day=1)
+    return sorted(months)
+
+
+def queue_event(entity, entity_id, action, months=None):
+    """
+    Queue a change notice to be published when the current transaction commits.
+
+    Args:
+        entity (str): "absence" or "absence_type"
+        entity_id (int): Id of the changed row
+        action (str): "created", "updated" or "deleted"
+        months (list): Months affected by the change (YYYY-MM)
+    """
+    from app import db
+
+    notice = {"entity": entity, "id": entity_id, "action": action}
+    if months is not None:
+        notice["months"] = months
+    db.session.info.setdefault(PENDING_KEY, []).append(notice)
+
+
+class LocalBroker:
+    """Deliver notices to the subscribers of this process."""
+
+    # Whether notices are sent inside the writing transaction (see
+    # publish_in_transaction) instead of after its commit
+    transactional = False
+
+    def __init__(self, max_queue_size=100):
+        self.max_queue_size = max_queue_size
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, limit=None):
+        """
+        Register a subscriber and return the queue it should read from.
+
+        Args:
+            limit (int): Subscribers this process accepts at most
+
+        Returns:
+            queue.Queue: The subscriber's queue, or None if ``limit`` is reached
+        """
+        self._start()
+        subscriber = queue.Queue(maxsize=self.max_queue_size)
+        with self._lock:
+            if limit is not None and len(self._subscribers) >= limit:
+                return None
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        """Remove a subscriber registered with subscribe()."""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def subscriber_count(self):
+        """Return the number of connected subscribers in this process."""
+        return len(self._subscribers)
+
+    def publish(self, notices):
+        """Publish committed notices."""
+        self._dispatch(notices)
+
+    def _dispatch(self, notices):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            for notice in notices:
+                try:
+                    subscriber.put_nowait(notice)
+                except queue.Full:
+                    # A stalled client only misses notices; it resyncs on reconnect
+                    pass
+
+    def _start(self):
+        """Start background delivery (nothing to do for in-process delivery)."""
+
+
+class FileBroker(LocalBroker):
+    """Share notices between processes through an append-only JSON lines file."""
+
+    def __init__(self, directory, max_bytes=1024 * 1024, poll_interval=0.25, **kwargs):
+        super().__init__(**kwargs)
+        self.path = os.path.join(directory, "events.jsonl")
+        self.max_bytes = max_bytes
+        self.poll_interval = poll_interval
+        self._thread = None
+        os.makedirs(directory, exist_ok=True)
+
+    def publish(self, notices):
+        """Append notices to the shared file (the tailers deliver them)."""
+        data = "".join(json.dumps(notice) + "\n" for notice in notices)
+        try:
+            if os.path.getsize(self.path) > self.max_bytes:
+                # Start over; tailers notice the shrink and rewind
+                open(self.path, "w").close()
+        except FileNotFoundError:
+            pass
+        # A single O_APPEND write keeps lines from different processes intact
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data.encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._tail, name="event-file-tailer", daemon=True
+            )
+            self._thread.start()
+
+    def _tail(self):
+        try:
+            offset = os.path.getsize(self.path)
+        except FileNotFoundError:
+            offset = 0
+        buffer = b""
+
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                size = os.path.getsize(self.path)
+            except FileNotFoundError:
+                continue
+            if size < offset:
+                offset, buffer = 0, b""
+            if size == offset:
+                continue
+
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                chunk = f.read(size - offset)
+            offset += len(chunk)
+
+            *lines, buffer = (buffer + chunk).split(b"\n")
+            notices = []
+            for line in lines:
+                try:
+                    notices.append(json.loads(line))
+                except ValueError:
+                    continue
+            if notices:
+                self._dispatch(notices)
+
+
+class PostgresBroker(LocalBroker):
+    """Share notices between processes (and hosts) with LISTEN/NOTIFY."""
+
+    transactional = True
+
+    def __init__(self, engine, **kwargs):
+        super().__init__(**kwargs)
+        self.engine = engine
+        self._thread = None
+
+    def publish(self, notices):
+        """Send notices outside of any session, on a pooled connection."""
+        with self.engine.connect() as connection:
+            self._notify(connection, notices)
+            connection.commit()
+
+    def publish_in_transaction(self, session, notices):
+        """Send notices in the session's transaction; COMMIT delivers them."""
+        self._notify(session, notices)
+
+    @staticmethod
+    def _notify(executor, notices):
+        executor.execute(
+            _NOTIFY,
+            {
+                "channel": CHANNEL,
+                "payloads": [json.dumps(notice) for notice in notices],
+            },
+        )
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._listen, name="event-pg-listener", daemon=True
+            )
+            self._thread.start()
+
+    def _listen(self):
+        while True:
+            try:
+                self._listen_once()
+            except Exception as e:  # noqa: BLE001 - reconnect on any failure
+                logger.warning("Event listener error, reconnecting: %s", e)
+                time.sleep(1)
+
+    def _listen_once(self):
+        # A DBAPI connection held for the listener's lifetime, in autocommit
+        connection = self.engine.raw_connection()
+        try:
+            dbapi_connection = connection.dbapi_connection
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+            if callable(dbapi_connection.notifies):
+                self._receive_psycopg(dbapi_connection)
+            else:
+                self._receive_psycopg2(dbapi_connection)
+        finally:
+            connection.invalidate()
+
+    def _receive_psycopg(self, dbapi_connection):
+        # psycopg 3: notifies() blocks and yields each notification as it arrives
+        for notify in dbapi_connection.notifies():
+            self._dispatch_payloads([notify.payload])
+
+    def _receive_psycopg2(self, dbapi_connection):
+        # psycopg2: poll() moves arrived notifications to the notifies list
+        while True:
+            if select.select([dbapi_connection], [], [], 5.0) == ([], [], []):
+                continue
+            dbapi_connection.poll()
+            payloads = []
+            while dbapi_connection.notifies:
+                payloads.append(dbapi_connection.notifies.pop(0).payload)
+            self._dispatch_payloads(payloads)
+
+    def _dispatch_payloads(self, payloads):
+        notices = []
+        for payload in payloads:
+            try:
+                notices.append(json.loads(payload))
+            except ValueError:
+                continue
+        if notices:
+            self._dispatch(notices)
+
+
+def init_app(app):
+    """Create the event broker configured for the application."""
+    broker_name = app.config.get("EVENT_BROKER", "auto")
+    uri = app.config.get("SQLALCHEMY_DATABASE_URI") or ""
+    shared_dir = app.config.get("SHARED_STATE_DIR")
+
+    if broker_name == "auto":
+        if uri.startswith("postgresql"):
+            broker_name = "postgres"
+        elif shared_dir:
+            broker_name = "file"
+        else:
+            broker_name = "local"
+
+    if broker_name == "postgres":
+        from app import db
+
+        with app.app_context():
+            broker = PostgresBroker(db.engine)
+    elif broker_name == "file":
+        if not shared_dir:
+            raise RuntimeError("EVENT_BROKER=file requires SHARED_STATE_DIR")
+        broker = FileBroker(shared_dir)
+    else:
+        broker = LocalBroker()
+
+    app.extensions[EXTENSION_KEY] = broker
+    return broker
+
+
+def get_broker():
+    """Return the event broker of the current application."""
+    return current_app.extensions.get(EXTENSION_KEY)
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_pending_events(session):
+    if not session.info.get(PENDING_KEY) or not has_app_context():
+        return
+
+    broker = current_app.extensions.get(EXTENSION_KEY)
+    if broker is None or not broker.transactional:
+        return
+    # Part of the transaction: a failed COMMIT sends nothing
+    broker.publish_in_transaction(session, session.info.pop(PENDING_KEY))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_events(session):
+    notices = session.info.pop(PENDING_KEY, None)
+    if not notices or not has_app_context():
+        return
+
+    broker = current_app.extensions.get(EXTENSION_KEY)
+    if broker is None:
+        return
+    try:
+        broker.publish(notices)
+    except Exception as e:  # noqa: BLE001 - notifications must not fail writes
+        current_app.logger.warning("Could not publish change events: %s", e)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_events(session, previous_transaction):
+    if previous_transaction.parent is not None:
+        return  # only a savepoint was rolled back
+    session.info.pop(PENDING_KEY, None)
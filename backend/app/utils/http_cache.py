@@ -0,0 +1,177 @@
+"""Conditional request support.
+
+Collections are validated with weak ETags derived from table change generations;
+single resources carry a strong ETag built from their row version, which clients
+send back in If-Match to make PUT/DELETE conditional.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from flask import current_app, jsonify, make_response, request
+
+from app.utils import change_tracking
+from app.validators.absence_validators import VersionConflictError
+
+
+def normalized_query():
+    """
+    Return the query string of the current request in a canonical form.
+
+    Parameters are sorted and empty values dropped, so equivalent requests
+    (e.g. ``?month=2025-01&absence_type=`` and ``?month=2025-01``) share a key.
+    """
+    items = sorted(
+        (key, value) for key, value in request.args.items(multi=True) if value != ""
+    )
+    return "&".join(f"{key}={value}" for key, value in items)
+
+
+def collection_etag(*tables):
+    """
+    Build a weak ETag for the current request from the given table generations.
+
+    Args:
+        *tables (str): Tables whose contents determine the response
+
+    Returns:
+        str: ETag value (without the W/ prefix and quotes)
+    """
+    store = change_tracking.get_store()
+    generations = ",".join(f"{table}:{store.get(table)[0]}" for table in tables)
+    key = f"{store.epoch}|{generations}|{request.path}?{normalized_query()}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+
+
+def conditional_gets_enabled():
+    """
+    Return True if collection validators may be handed out (CONDITIONAL_GETS).
+
+    "auto" enables them only with a shared generation store: the in-process store
+    of one worker never sees the writes made by the others, so behind several
+    workers a stale ETag could keep being confirmed with 304.
+    """
+    mode = current_app.config.get("CONDITIONAL_GETS", "auto")
+    if mode == "auto":
+        return change_tracking.get_store().shared
+    return mode == "on"
+
+
+def conditional_get(*tables):
+    """
+    Decorate a GET view so it honours If-None-Match and If-Modified-Since.
+
+    The validators are derived from the change generations of ``tables`` and the
+    normalized query, so a matching request is answered with 304 before the view
+    (and its database queries) run at all. Without conditional GETs (see
+    conditional_gets_enabled) the view always runs and sends no validators.
+
+    Args:
+        *tables (str): Tables whose contents determine the response
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not conditional_gets_enabled():
+                return view(*args, **kwargs)
+            if change_tracking.caches_bypassed():
+                # e.g. a read after a write inside an atomic batch
+                return view(*args, **kwargs)
+
+            etag = collection_etag(*tables)
+            last_modified = change_tracking.get_last_modified(*tables)
+            # Last-Modified has one second resolution: skip it while the newest
+            # change is this recent, or a second write within the same second
+            # could be answered with a stale 304.
+            if time.time() - last_modified.timestamp() < 2:
+                last_modified = None
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            elif request.if_modified_since and last_modified:
+                not_modified = request.if_modified_since >= last_modified
+            else:
+                not_modified = False
+
+            if not_modified:
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified:
+                response.last_modified = last_modified
+            # Let browsers keep the body but revalidate on every use
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def resource_etag(entity_id, version):
+    """
+    Build the strong ETag of one version of a single resource.
+
+    Args:
+        entity_id (int): Resource id
+        version (int): Row version
+
+    Returns:
+        str: ETag value (without quotes)
+    """
+    return f"{entity_id}-{version}"
+
+
+def if_match_version(entity_id):
+    """
+    Return the version the request's If-Match header requires.
+
+    Args:
+        entity_id (int): Id of the resource being modified
+
+    Returns:
+        int: Expected version, or None if the request is unconditional
+            (no If-Match or ``If-Match: *``)
+
+    Raises:
+        VersionConflictError: If If-Match names no version of this resource
+    """
+    if not request.if_match or request.if_match.star_tag:
+        return None
+
+    prefix = f"{entity_id}-"
+    for tag in request.if_match.as_set():
+        version = tag[len(prefix):]
+        if tag.startswith(prefix) and version.isdigit():
+            return int(version)
+    raise VersionConflictError("If-Match does not match the resource")
+
+
+def versioned_response(payload, entity_id, version, status=200):
+    """
+    Return a JSON response carrying the resource's strong ETag.
+
+    A GET whose If-None-Match already holds that ETag is answered with 304.
+
+    Args:
+        payload (dict): Response body
+        entity_id (int): Resource id
+        version (int): Row version
+        status (int): Status code of a full response
+
+    Returns:
+        Response: Flask response
+    """
+    etag = resource_etag(entity_id, version)
+    if request.method == "GET" and request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = make_response(jsonify(payload), status)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
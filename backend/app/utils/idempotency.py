@@ -0,0 +1,232 @@
+"""Idempotency-Key support for non-idempotent POST endpoints.
+
+Clients (and retrying proxies) may send the same create or batch request more
+than once. With an ``Idempotency-Key`` header the first request claims the key
+and its response is stored for IDEMPOTENCY_TTL seconds; a retry with the same key
+gets the stored response back without running the view again (no second overlap
+check, insert or audit write). Expired keys are purged in small batches.
+
+A claim whose request died before storing a response (killed worker, deploy)
+would otherwise block its key until it expires: once a claim is older than
+IDEMPOTENCY_LEASE seconds a retry of the same request takes it over.
+"""
+import hashlib
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import current_app, jsonify, make_response, request
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models.idempotency_key import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+# Set on sub-requests of /api/batch: the batch's own key covers them
+BATCH_ENVIRON_KEY = "absencehub.batch_subrequest"
+
+_last_purge = 0.0
+
+
+def request_fingerprint():
+    """Return a hash identifying the method, path and body of the request."""
+    digest = hashlib.sha256()
+    digest.update(request.method.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(request.full_path.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(request.get_data())
+    return digest.hexdigest()
+
+
+def _error(message, status):
+    return jsonify({"success": False, "error": message}), status
+
+
+def _replay(record):
+    response = make_response(record.response_body, record.status_code)
+    response.mimetype = "application/json"
+    response.headers[REPLAY_HEADER] = "true"
+    return response
+
+
+def _claim(key, fingerprint):
+    """
+    Claim a key for the current request.
+
+    Returns:
+        IdempotencyKey: The existing record if the key is already taken, else None
+    """
+    now = datetime.utcnow()
+    ttl = current_app.config.get("IDEMPOTENCY_TTL", 86400)
+    lease = current_app.config.get("IDEMPOTENCY_LEASE", 60)
+
+    existing = db.session.get(IdempotencyKey, key)
+    if existing is not None and existing.expires_at < now:
+        db.session.delete(existing)
+        db.session.flush()
+        existing = None
+    if (
+        existing is not None
+        and not existing.is_complete
+        and existing.request_hash == fingerprint
+        and existing.created_at < now - timedelta(seconds=lease)
+    ):
+        return _take_over(existing, now, ttl)
+    if existing is not None:
+        return existing
+
+    db.session.add(
+        IdempotencyKey(
+            key=key,
+            request_hash=fingerprint,
+            created_at=now,
+            expires_at=now + timedelta(seconds=ttl),
+        )
+    )
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent request claimed the key first
+        db.session.rollback()
+        return db.session.get(IdempotencyKey, key)
+    return None
+
+
+def _take_over(record, now, ttl):
+    """
+    Renew an abandoned claim for the current request.
+
+    The update only matches the claim as it was read, so of several concurrent
+    retries exactly one takes it over; the others see it in progress.
+
+    Returns:
+        IdempotencyKey: The current record if another request was faster, else None
+    """
+    result = db.session.execute(
+        update(IdempotencyKey)
+        .where(
+            IdempotencyKey.key == record.key,
+            IdempotencyKey.created_at == record.created_at,
+            IdempotencyKey.status_code.is_(None),
+        )
+        .values(created_at=now, expires_at=now + timedelta(seconds=ttl))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    if result.rowcount == 1:
+        return None
+    return db.session.get(IdempotencyKey, record.key)
+
+
+def _release(key, response):
+    """Store the response for a claimed key, or free it on retryable errors."""
+    # Views return errors without rolling back; start from a clean session
+    db.session.rollback()
+    record = db.session.get(IdempotencyKey, key)
+    if record is None:
+        return
+
+    if response is None or response.status_code >= 500 or response.status_code == 409:
+        # Let the client retry a request that failed on our side (or timed out
+        # waiting for a lock)
+        db.session.delete(record)
+    else:
+        record.status_code = response.status_code
+        record.response_body = response.get_data(as_text=True)
+    db.session.commit()
+
+
+def idempotent(view):
+    """
+    Decorate a POST view so requests carrying an Idempotency-Key run once.
+
+    Responses with status < 500 (except 409) are stored and replayed (with an
+    ``Idempotent-Replayed: true`` header) for requests repeating the key. Reusing
+    a key for a different request is rejected with 422; repeating it while the
+    first request still runs is rejected with 409.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key or request.environ.get(BATCH_ENVIRON_KEY):
+            return view(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return _error(
+                f"{HEADER} must be at most {MAX_KEY_LENGTH} characters", 400
+            )
+
+        fingerprint = request_fingerprint()
+        existing = _claim(key, fingerprint)
+        if existing is not None:
+            if existing.request_hash != fingerprint:
+                return _error(f"{HEADER} was already used for another request", 422)
+            if not existing.is_complete:
+                return _error(f"A request with this {HEADER} is in progress", 409)
+            return _replay(existing)
+
+        response = None
+        try:
+            response = make_response(view(*args, **kwargs))
+        finally:
+            _release(key, response)
+        _maybe_purge()
+        return response
+
+    return wrapper
+
+
+def purge_expired(batch_size=None, max_batches=None):
+    """
+    Delete expired idempotency keys in batches.
+
+    Each batch is a short transaction, so purging never holds locks on many rows.
+
+    Args:
+        batch_size (int): Keys per batch (default: IDEMPOTENCY_PURGE_BATCH)
+        max_batches (int): Stop after this many batches (default: until done)
+
+    Returns:
+        int: Number of deleted keys
+    """
+    batch_size = batch_size or current_app.config.get("IDEMPOTENCY_PURGE_BATCH", 500)
+    deleted = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        expired = (
+            select(IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at < datetime.utcnow())
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = db.session.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.key.in_(expired))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        deleted += result.rowcount
+        batches += 1
+        if result.rowcount < batch_size:
+            break
+    return deleted
+
+
+def _maybe_purge():
+    """Purge one batch of expired keys at most every IDEMPOTENCY_PURGE_INTERVAL."""
+    global _last_purge
+
+    interval = current_app.config.get("IDEMPOTENCY_PURGE_INTERVAL", 300)
+    now = time.monotonic()
+    if now - _last_purge < interval:
+        return
+    _last_purge = now
+    try:
+        purge_expired(max_batches=1)
+    except Exception as e:  # noqa: BLE001 - cleanup must not fail the request
+        db.session.rollback()
+        current_app.logger.warning("Could not purge idempotency keys: %s", e)
@@ -0,0 +1,123 @@
+"""Import-time report for the application start.
+
+Runs ``python -X importtime`` in a fresh interpreter that creates the app (so
+nothing is cached from the current process) and aggregates the per-module
+numbers by top-level package. Use it to find what a cold start pays for before
+the first request can be served::
+
+    flask import-time --top 15
+"""
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+LINE_PREFIX = "import time:"
+
+
+def parse_importtime(output):
+    """
+    Parse the stderr of ``python -X importtime``.
+
+    Args:
+        output: The captured stderr
+
+    Returns:
+        list: Dicts with module, depth, self_us and cumulative_us, in import
+            order
+    """
+    records = []
+    for line in output.splitlines():
+        if not line.startswith(LINE_PREFIX):
+            continue
+        fields = line[len(LINE_PREFIX):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        records.append(
+            {
+                "module": module,
+                # importtime indents nested imports by two spaces per level
+                "depth": (len(name) - len(module) - 1) // 2,
+                "self_us": int(fields[0]),
+                "cumulative_us": int(fields[1]),
+            }
+        )
+    return records
+
+
+def summarize(records, top=20):
+    """
+    Aggregate import times by top-level package.
+
+    Args:
+        records: Output of parse_importtime()
+        top: Number of packages and modules to list
+
+    Returns:
+        dict: Total milliseconds, the slowest packages (sum of their modules'
+            own time) and the slowest individual modules
+    """
+    packages = defaultdict(lambda: {"self_us": 0, "modules": 0})
+    for record in records:
+        package = packages[record["module"].split(".")[0]]
+        package["self_us"] += record["self_us"]
+        package["modules"] += 1
+
+    total_us = sum(record["self_us"] for record in records)
+    by_package = sorted(packages.items(), key=lambda item: -item[1]["self_us"])
+    slowest = sorted(records, key=lambda record: -record["self_us"])
+    return {
+        "total_ms": round(total_us / 1000, 1),
+        "modules": len(records),
+        "packages": [
+            {
+                "package": name,
+                "ms": round(stats["self_us"] / 1000, 1),
+                "share": round(stats["self_us"] / total_us, 3) if total_us else 0,
+                "modules": stats["modules"],
+            }
+            for name, stats in by_package[:top]
+        ],
+        "slowest_modules": [
+            {"module": record["module"], "ms": round(record["self_us"] / 1000, 1)}
+            for record in slowest[:top]
+        ],
+    }
+
+
+def measure_import_time(config_name=None, env=None, timeout=120):
+    """
+    Create the app in a fresh interpreter under ``-X importtime``.
+
+    Args:
+        config_name: Configuration to create the app with (default: FLASK_ENV)
+        env: Environment for the interpreter (default: the current one)
+        timeout: Seconds before the interpreter is killed
+
+    Returns:
+        list: Parsed records, see parse_importtime()
+
+    Raises:
+        RuntimeError: If the app cannot be created
+    """
+    code = f"from app import create_app; create_app({config_name!r})"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR,
+        env=dict(os.environ if env is None else env),
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    if result.returncode != 0:
+        errors = [
+            line
+            for line in result.stderr.splitlines()
+            if not line.startswith(LINE_PREFIX)
+        ]
+        raise RuntimeError("Creating the app failed:\n" + "\n".join(errors[-20:]))
+    return parse_importtime(result.stderr)
@@ -0,0 +1,193 @@
+"""tracemalloc snapshots for tracking down memory growth in a worker.
+
+An operator starts tracing, takes a snapshot, exercises the suspect endpoints
+(e.g. large ``/api/absences`` and ``/api/statistics`` calls), takes a second
+snapshot and compares the two. Allocations are attributed to the innermost
+frame inside the ``app`` package, so memory allocated by SQLAlchemy or Flask on
+behalf of a service is reported under that service; totals are grouped by
+module group (``app.models``, ``app.services``, ``app.routes``, ...).
+"""
+import sys
+import threading
+import tracemalloc
+from collections import OrderedDict
+from datetime import datetime
+
+from flask import current_app
+
+EXTENSION_KEY = "memory_tracing"
+APP_PACKAGE = "app"
+# Module groups reported separately; other app modules count as "app"
+MODULE_GROUPS = (
+    "app.models",
+    "app.services",
+    "app.routes",
+    "app.utils",
+    "app.validators",
+)
+
+_IGNORED_FILES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _module_names():
+    """Map source file names to module names for the loaded modules."""
+    names = {}
+    for name, module in list(sys.modules.items()):
+        filename = getattr(module, "__file__", None)
+        if filename:
+            names[filename] = name
+    return names
+
+
+def module_group(module):
+    """Return the reporting group of a module name."""
+    if module is None:
+        return "other"
+    for group in MODULE_GROUPS:
+        if module == group or module.startswith(group + "."):
+            return group
+    if module == APP_PACKAGE or module.startswith(APP_PACKAGE + "."):
+        return APP_PACKAGE
+    return module.split(".", 1)[0]
+
+
+def _attribute(traceback, modules):
+    """
+    Pick the frame an allocation is reported under.
+
+    Returns:
+        tuple: (module name, "file:line") of the innermost app frame, or of the
+            innermost frame if no app code was involved
+    """
+    # tracemalloc stores the most recent frame first
+    for frame in traceback:
+        module = modules.get(frame.filename)
+        if module and (module == APP_PACKAGE or module.startswith(APP_PACKAGE + ".")):
+            return module, f"{frame.filename}:{frame.lineno}"
+    frame = traceback[0]
+    return modules.get(frame.filename), f"{frame.filename}:{frame.lineno}"
+
+
+def _summarize(statistics, limit, size_key, count_key):
+    """Aggregate tracemalloc statistics by allocation site and module group."""
+    modules = _module_names()
+    sites = {}
+    groups = {}
+    for stat in statistics:
+        module, site = _attribute(stat.traceback, modules)
+        size = getattr(stat, size_key)
+        count = getattr(stat, count_key)
+
+        entry = sites.setdefault(
+            site, {"site": site, "module": module, "size": 0, "count": 0}
+        )
+        entry["size"] += size
+        entry["count"] += count
+
+        group = module_group(module)
+        totals = groups.setdefault(group, {"module": group, "size": 0, "count": 0})
+        totals["size"] += size
+        totals["count"] += count
+
+    def by_size(entry):
+        return abs(entry["size"])
+
+    return {
+        "total_size": sum(entry["size"] for entry in groups.values()),
+        "by_module": sorted(groups.values(), key=by_size, reverse=True),
+        "top_sites": sorted(sites.values(), key=by_size, reverse=True)[:limit],
+    }
+
+
+class MemoryTracer:
+    """Control tracemalloc and keep a bounded number of numbered snapshots."""
+
+    def __init__(self, max_snapshots=10):
+        self.max_snapshots = max_snapshots
+        self.snapshots = OrderedDict()  # id -> (taken_at, snapshot)
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self):
+        """Whether tracemalloc is running."""
+        return tracemalloc.is_tracing()
+
+    def start(self, frames=10):
+        """Start tracing with the given traceback depth."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self):
+        """Stop tracing and drop all snapshots."""
+        tracemalloc.stop()
+        with self._lock:
+            self.snapshots.clear()
+
+    def status(self):
+        """Return tracing state, traced memory and the stored snapshots."""
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": self.tracing,
+            "frames": tracemalloc.get_traceback_limit(),
+            "traced_current": current,
+            "traced_peak": peak,
+            "snapshots": [
+                {"id": snapshot_id, "taken_at": taken_at}
+                for snapshot_id, (taken_at, _) in self.snapshots.items()
+            ],
+        }
+
+    def take_snapshot(self):
+        """
+        Take and store a snapshot.
+
+        Returns:
+            int: Snapshot id
+
+        Raises:
+            RuntimeError: If tracing has not been started
+        """
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("Memory tracing is not running")
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED_FILES)
+        with self._lock:
+            snapshot_id = self._next_id
+            self._next_id += 1
+            self.snapshots[snapshot_id] = (datetime.utcnow().isoformat(), snapshot)
+            while len(self.snapshots) > self.max_snapshots:
+                self.snapshots.popitem(last=False)
+        return snapshot_id
+
+    def _get(self, snapshot_id):
+        try:
+            return self.snapshots[snapshot_id][1]
+        except KeyError:
+            raise KeyError(f"Snapshot {snapshot_id} not found") from None
+
+    def top(self, snapshot_id, limit=20):
+        """Return the largest allocation sites and module totals of a snapshot."""
+        statistics = self._get(snapshot_id).statistics("traceback")
+        return _summarize(statistics, limit, "size", "count")
+
+    def diff(self, from_id, to_id, limit=20):
+        """Return the allocation growth between two snapshots."""
+        statistics = self._get(to_id).compare_to(self._get(from_id), "traceback")
+        return _summarize(statistics, limit, "size_diff", "count_diff")
+
+
+def init_app(app):
+    """Attach the memory tracer of the application."""
+    tracer = MemoryTracer(app.config.get("MEMORY_MAX_SNAPSHOTS", 10))
+    app.extensions[EXTENSION_KEY] = tracer
+    return tracer
+
+
+def get_tracer():
+    """Return the memory tracer of the current application."""
+    return current_app.extensions[EXTENSION_KEY]
@@ -0,0 +1,510 @@
+"""Request metrics in Prometheus text format.
+
+Each worker process records into in-memory counters under a lock (a few
+microseconds per request). Latencies go into HDR-style log-linear histogram
+buckets: every power-of-two range of microseconds is split into four linear
+sub-buckets, so any observation is placed within 25% of its value from 64 µs up
+to about 33 s.
+
+With ``SHARED_STATE_DIR`` set, every process periodically writes a snapshot of
+its counters to ``<dir>/metrics/<pid>-<token>.json`` and ``/api/metrics`` adds
+up the snapshots of all workers. The token is drawn once per process, so a
+worker that gets the pid of an exited one never overwrites its snapshot.
+Counters of exited workers are kept so totals never go backwards: gunicorn's
+``child_exit`` hook calls mark_process_dead(), which folds the worker's counters
+into one dead-workers total and removes its file (like prometheus_client's
+multiprocess mode). Gauges (in-flight requests, pool usage) only count live
+workers.
+
+Long-lived streaming views (``/api/events``) are marked with ``@unmetered``;
+they would show up as requests in flight and as latencies of minutes.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+
+from flask import current_app, request
+
+EXTENSION_KEY = "metrics"
+START_KEY = "absencehub.metrics_start"
+# Counters folded in from exited workers, next to the per-process snapshots
+DEAD_WORKERS_FILE = "dead_workers.json"
+
+# Histogram layout: MIN_OCTAVE..MAX_OCTAVE powers of two, SUB_BUCKETS each
+MIN_OCTAVE = 6  # 64 µs
+MAX_OCTAVE = 25  # ~33.5 s
+SUB_BUCKET_BITS = 2
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+
+def _bucket_bounds():
+    """Upper bounds (µs) of the finite histogram buckets."""
+    bounds = []
+    for octave in range(MIN_OCTAVE, MAX_OCTAVE):
+        base = 1 << octave
+        step = base >> SUB_BUCKET_BITS
+        bounds.extend(base + step * (sub + 1) for sub in range(SUB_BUCKETS))
+    return bounds
+
+
+BUCKET_BOUNDS_US = _bucket_bounds()
+# Observations at or above the last bound land in the +Inf bucket
+OVERFLOW_BUCKET = len(BUCKET_BOUNDS_US)
+
+
+def bucket_index(duration_us):
+    """
+    Return the histogram bucket of a duration.
+
+    Args:
+        duration_us (int): Duration in microseconds
+
+    Returns:
+        int: Index into BUCKET_BOUNDS_US (OVERFLOW_BUCKET for +Inf)
+    """
+    if duration_us < (1 << MIN_OCTAVE):
+        return 0
+    octave = duration_us.bit_length() - 1
+    if octave >= MAX_OCTAVE:
+        return OVERFLOW_BUCKET
+    sub = (duration_us >> (octave - SUB_BUCKET_BITS)) & (SUB_BUCKETS - 1)
+    return (octave - MIN_OCTAVE) * SUB_BUCKETS + sub
+
+
+_process_token = (None, None)  # (pid, token)
+
+
+def process_token():
+    """Return a random token identifying this process (new after a fork)."""
+    global _process_token
+    pid = os.getpid()
+    if _process_token[0] != pid:
+        _process_token = (pid, uuid.uuid4().hex[:12])
+    return _process_token[1]
+
+
+def unmetered(view):
+    """Leave a view's requests out of the request metrics (e.g. streams)."""
+    view.unmetered = True
+    return view
+
+
+class MetricsRegistry:
+    """Request counters and latency histograms of one worker process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}  # (blueprint, route, method, status) -> count
+        self.histograms = {}  # (blueprint, route, method) -> [buckets, sum_us]
+        self.in_flight = 0
+
+    def start_request(self):
+        """Count a request as in flight."""
+        with self._lock:
+            self.in_flight += 1
+
+    def end_request(self):
+        """Count a request as finished."""
+        with self._lock:
+            self.in_flight -= 1
+
+    def observe(self, blueprint, route, method, status, duration_us):
+        """Record one finished request."""
+        index = bucket_index(duration_us)
+        with self._lock:
+            key = (blueprint, route, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            histogram = self.histograms.get(key[:3])
+            if histogram is None:
+                histogram = self.histograms[key[:3]] = [
+                    [0] * (OVERFLOW_BUCKET + 1),
+                    0,
+                ]
+            histogram[0][index] += 1
+            histogram[1] += duration_us
+
+    def snapshot(self, gauges=None, counters=None):
+        """
+        Return the registry as a JSON-serializable dictionary.
+
+        Args:
+            gauges (dict): Extra point-in-time values (e.g. pool usage)
+            counters (dict): Extra monotonic values (e.g. cache hits)
+        """
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "token": process_token(),
+                "requests": [
+                    list(key) + [count] for key, count in self.requests.items()
+                ],
+                "histograms": [
+                    list(key) + [list(buckets), total]
+                    for key, (buckets, total) in self.histograms.items()
+                ],
+                "gauges": dict(gauges or {}, in_flight=self.in_flight),
+                "counters": dict(counters or {}),
+            }
+
+
+class FileMetricsStore:
+    """Per-process snapshot files in a directory shared by all workers."""
+
+    def __init__(self, directory):
+        self.directory = os.path.join(directory, "metrics")
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _replace(self, name, content):
+        path = os.path.join(self.directory, name)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(content, f)
+        os.replace(tmp_path, path)
+
+    def _read(self, name):
+        try:
+            with open(os.path.join(self.directory, name), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def write(self, snapshot):
+        """Replace this process's snapshot file."""
+        self._replace(f"{snapshot['pid']}-{snapshot['token']}.json", snapshot)
+
+    def read_all(self):
+        """Return the snapshots of all live workers plus the dead-workers total."""
+        snapshots = {}
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json") and entry.name != DEAD_WORKERS_FILE:
+                snapshot = self._read(entry.name)
+                if snapshot is not None:
+                    snapshots[entry.name] = snapshot
+        # Read last: a file folded in the meantime is then listed as folded
+        dead = self._read(DEAD_WORKERS_FILE)
+        if dead is None:
+            return list(snapshots.values())
+        for name in dead["folded"]:
+            snapshots.pop(name, None)
+        return list(snapshots.values()) + [dead]
+
+    def mark_process_dead(self, pid):
+        """
+        Fold the counters of an exited process into the dead-workers total.
+
+        Only one process (the gunicorn master) may call this: the total is
+        read, updated and replaced without a lock.
+        """
+        dead = self._read(DEAD_WORKERS_FILE) or _as_snapshot(merge_snapshots([]))
+        # Names stay listed until their file is gone, so readers skip them
+        folded = [
+            name
+            for name in dead.get("folded", [])
+            if os.path.exists(os.path.join(self.directory, name))
+        ]
+        names = [
+            entry.name
+            for entry in os.scandir(self.directory)
+            if entry.name.startswith(f"{pid}-") and entry.name.endswith(".json")
+        ]
+        snapshots = [dead]
+        for name in names:
+            snapshot = self._read(name)
+            if snapshot is not None:
+                snapshots.append(snapshot)
+        dead = _as_snapshot(merge_snapshots(snapshots))
+        dead["folded"] = folded + names
+        self._replace(DEAD_WORKERS_FILE, dead)
+        for name in names:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+
+def mark_process_dead(pid, directory=None):
+    """
+    Fold an exited worker's metrics into the dead-workers total.
+
+    Args:
+        pid (int): Process ID of the exited worker
+        directory (str): Shared state directory (default: SHARED_STATE_DIR)
+    """
+    directory = directory or os.environ.get("SHARED_STATE_DIR")
+    if directory:
+        FileMetricsStore(directory).mark_process_dead(pid)
+
+
+def _pid_alive(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge_snapshots(snapshots):
+    """
+    Add up worker snapshots.
+
+    Returns:
+        dict: Snapshot-shaped totals plus the number of live workers
+    """
+    requests = {}
+    histograms = {}
+    gauges = {}
+    counters = {}
+    workers = 0
+
+    for snapshot in snapshots:
+        for *key, count in snapshot["requests"]:
+            key = tuple(key)
+            requests[key] = requests.get(key, 0) + count
+        for *key, buckets, total in snapshot["histograms"]:
+            key = tuple(key)
+            merged = histograms.setdefault(key, [[0] * len(buckets), 0])
+            merged[0] = [a + b for a, b in zip(merged[0], buckets)]
+            merged[1] += total
+        for name, value in snapshot["counters"].items():
+            counters[name] = counters.get(name, 0) + value
+        if snapshot["pid"] is not None and _pid_alive(snapshot["pid"]):
+            workers += 1
+            for name, value in snapshot["gauges"].items():
+                gauges[name] = gauges.get(name, 0) + value
+
+    return {
+        "requests": requests,
+        "histograms": histograms,
+        "gauges": gauges,
+        "counters": counters,
+        "workers": workers,
+    }
+
+
+def _as_snapshot(totals):
+    """Turn merged totals back into a snapshot without gauges or a process."""
+    return {
+        "pid": None,
+        "token": None,
+        "requests": [list(key) + [count] for key, count in totals["requests"].items()],
+        "histograms": [
+            list(key) + [buckets, total]
+            for key, (buckets, total) in totals["histograms"].items()
+        ],
+        "gauges": {},
+        "counters": totals["counters"],
+        "folded": [],
+    }
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+# name -> (type, help) of the gauges and counters collected besides requests
+_EXTRA_METRICS = {
+    "in_flight": ("gauge", "HTTP requests currently being served"),
+    "db_pool_size": ("gauge", "Configured database connection pool size"),
+    "db_pool_checked_out": ("gauge", "Database connections in use"),
+    "db_pool_checked_in": ("gauge", "Idle database connections in the pool"),
+    "db_pool_overflow": ("gauge", "Database connections above the pool size"),
+    "result_cache_hits": ("counter", "Result cache lookups answered from cache"),
+    "result_cache_misses": ("counter", "Result cache lookups that computed"),
+    "singleflight_executions": ("counter", "Coalesced computations executed"),
+    "singleflight_shared": ("counter", "Callers served by another's computation"),
+    "sql_compiled_cache_hits": ("counter", "Statements reused from the SQL cache"),
+    "sql_compiled_cache_misses": ("counter", "Statements compiled on execution"),
+}
+# Hit ratio gauges rendered from counter pairs: name -> (hits, misses, help)
+_RATIOS = {
+    "result_cache_hit_ratio": (
+        "result_cache_hits",
+        "result_cache_misses",
+        "Share of cache hits",
+    ),
+    "sql_compiled_cache_hit_ratio": (
+        "sql_compiled_cache_hits",
+        "sql_compiled_cache_misses",
+        "Share of statements served from the compiled cache",
+    ),
+}
+
+
+def render(totals):
+    """
+    Render merged totals in the Prometheus text exposition format.
+
+    Args:
+        totals (dict): Result of merge_snapshots()
+
+    Returns:
+        str: Exposition text
+    """
+    lines = [
+        "# HELP absencehub_http_requests_total HTTP requests by route and status",
+        "# TYPE absencehub_http_requests_total counter",
+    ]
+    for (blueprint, route, method, status), count in sorted(totals["requests"].items()):
+        labels = _labels(blueprint=blueprint, route=route, method=method, status=status)
+        lines.append(f"absencehub_http_requests_total{{{labels}}} {count}")
+
+    name = "absencehub_http_request_duration_seconds"
+    lines.append(f"# HELP {name} HTTP request latency by route")
+    lines.append(f"# TYPE {name} histogram")
+    for (blueprint, route, method), (buckets, total_us) in sorted(
+        totals["histograms"].items()
+    ):
+        labels = _labels(blueprint=blueprint, route=route, method=method)
+        cumulative = 0
+        for bound, count in zip(BUCKET_BOUNDS_US, buckets):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound / 1e6:g}"}} {cumulative}')
+        cumulative += buckets[OVERFLOW_BUCKET]
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {total_us / 1e6:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {cumulative}")
+
+    values = dict(totals["gauges"], **totals["counters"])
+    for key, (kind, help_text) in _EXTRA_METRICS.items():
+        if key not in values:
+            continue
+        metric = f"absencehub_{key}_total" if kind == "counter" else f"absencehub_{key}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.append(f"{metric} {values[key]}")
+
+    counters = totals["counters"]
+    for key, (hits, misses, help_text) in _RATIOS.items():
+        if hits not in counters:
+            continue
+        lookups = counters[hits] + counters.get(misses, 0)
+        ratio = counters[hits] / lookups if lookups else 0.0
+        lines.append(f"# HELP absencehub_{key} {help_text}")
+        lines.append(f"# TYPE absencehub_{key} gauge")
+        lines.append(f"absencehub_{key} {ratio:.4f}")
+
+    lines.append("# HELP absencehub_workers Worker processes reporting metrics")
+    lines.append("# TYPE absencehub_workers gauge")
+    lines.append(f"absencehub_workers {totals['workers']}")
+    return "\n".join(lines) + "\n"
+
+
+class Metrics:
+    """Registry, optional shared store and the flush schedule of a process."""
+
+    def __init__(self, store=None, flush_interval=1.0):
+        self.registry = MetricsRegistry()
+        self.store = store
+        self.flush_interval = flush_interval
+        self._last_flush = 0.0
+
+    def collect_snapshot(self):
+        """Snapshot the registry plus pool and cache statistics."""
+        from app import db
+        from app.utils.result_cache import get_cache
+        from app.utils.singleflight import get_singleflight
+        from app.utils.sql_instrumentation import compiled_cache
+
+        gauges = {}
+        pool = db.engine.pool
+        for key, attribute in (
+            ("db_pool_size", "size"),
+            ("db_pool_checked_out", "checkedout"),
+            ("db_pool_checked_in", "checkedin"),
+            ("db_pool_overflow", "overflow"),
+        ):
+            # Not every pool class (e.g. SQLite's StaticPool) keeps these
+            if hasattr(pool, attribute):
+                gauges[key] = getattr(pool, attribute)()
+
+        counters = {}
+        cache = get_cache()
+        if cache is not None:
+            counters["result_cache_hits"] = cache.hits
+            counters["result_cache_misses"] = cache.misses
+        flight = get_singleflight()
+        if flight is not None:
+            counters["singleflight_executions"] = flight.executions
+            counters["singleflight_shared"] = flight.shared
+        counters["sql_compiled_cache_hits"] = compiled_cache.hits
+        counters["sql_compiled_cache_misses"] = compiled_cache.misses
+        return self.registry.snapshot(gauges, counters)
+
+    def maybe_flush(self, force=False):
+        """Write this process's snapshot if the flush interval has passed."""
+        if self.store is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = now
+        self.store.write(self.collect_snapshot())
+
+    def render(self):
+        """Return the exposition text for all workers (or just this one)."""
+        if self.store is None:
+            return render(merge_snapshots([self.collect_snapshot()]))
+        self.maybe_flush(force=True)
+        return render(merge_snapshots(self.store.read_all()))
+
+
+def init_app(app):
+    """Record request metrics for the application."""
+    if not app.config.get("METRICS_ENABLED", True):
+        return None
+
+    shared_dir = app.config.get("SHARED_STATE_DIR")
+    metrics = Metrics(
+        store=FileMetricsStore(shared_dir) if shared_dir else None,
+        flush_interval=app.config.get("METRICS_FLUSH_INTERVAL", 1.0),
+    )
+    app.extensions[EXTENSION_KEY] = metrics
+    registry = metrics.registry
+
+    from app.utils.idempotency import BATCH_ENVIRON_KEY
+
+    @app.before_request
+    def _start_request_metrics():
+        if request.environ.get(BATCH_ENVIRON_KEY):
+            return  # operations of /api/batch are part of the batch request
+        if getattr(app.view_functions.get(request.endpoint), "unmetered", False):
+            return
+        request.environ[START_KEY] = time.perf_counter_ns()
+        registry.start_request()
+
+    @app.after_request
+    def _record_request_metrics(response):
+        started = request.environ.get(START_KEY)
+        if started is not None:
+            rule = request.url_rule
+            registry.observe(
+                request.blueprint or "app",
+                rule.rule if rule is not None else "unmatched",
+                request.method,
+                response.status_code,
+                (time.perf_counter_ns() - started) // 1000,
+            )
+        return response
+
+    @app.teardown_request
+    def _end_request_metrics(exc):
+        if request.environ.pop(START_KEY, None) is not None:
+            registry.end_request()
+            metrics.maybe_flush()
+
+    return metrics
+
+
+def get_metrics():
+    """Return the metrics of the current application (None if disabled)."""
+    return current_app.extensions.get(EXTENSION_KEY)
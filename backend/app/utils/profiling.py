@@ -0,0 +1,327 @@
+"""On-demand and sampled request profiling.
+
+Two ways to profile a request:
+
+    - ``?__profile=1`` (admin only): the request runs under cProfile and the
+      response is replaced by a JSON report: the top functions by cumulative
+      time plus the time spent in the hot spots listed in FOCUS_FUNCTIONS.
+      ``?__profile=sample`` uses the stack sampler instead and also returns
+      collapsed stacks (the input format of flamegraph tools). The request
+      bypasses the result cache, single-flight coalescing and conditional
+      GETs, so the report shows the work a cache miss does.
+    - PROFILE_SAMPLE_RATE > 0: that fraction of all requests is profiled with
+      the stack sampler in the background. Collapsed stacks are aggregated per
+      route (see ``/api/admin/profiles``) and appended to
+      ``<PROFILE_DIR>/<route>.collapsed`` when PROFILE_DIR is set.
+
+When neither an admin token nor a sample rate is configured no hooks are
+registered, so profiling costs nothing.
+"""
+import io
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import current_app, jsonify, request
+
+from app.utils.admin import admin_enabled, is_admin_request
+from app.utils.change_tracking import bypass_caches
+
+EXTENSION_KEY = "profiling"
+PARAMETER = "__profile"
+ENVIRON_KEY = "absencehub.profiler"
+
+# Report label -> function names whose time is reported separately
+FOCUS_FUNCTIONS = {
+    "_apply_filters": ("_apply_filters",),
+    "to_dict": ("to_dict", "row_to_dict"),
+    "calculate_days": ("calculate_days",),
+    "sql": ("do_execute", "do_executemany", "do_execute_no_params"),
+}
+MAX_STACK_DEPTH = 128
+
+
+def _frame_label(code, module):
+    return f"{module}:{code.co_name}"
+
+
+def collapse_stack(frame):
+    """Return a frame's call stack as ``outer;...;inner`` labels."""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        module = frame.f_globals.get("__name__", "?")
+        labels.append(_frame_label(frame.f_code, module))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """Sample the call stack of one thread at a fixed interval."""
+
+    def __init__(self, thread_id, interval=0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start sampling in a background thread."""
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[collapse_stack(frame)] += 1
+
+    def stop(self):
+        """Stop sampling and return the collapsed stack counts."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.samples
+
+
+def _name_matches(label, names):
+    return label.rsplit(":", 1)[-1] in names
+
+
+def summarize_samples(samples, interval, top=20):
+    """
+    Summarize collapsed stacks.
+
+    Args:
+        samples (Counter): Collapsed stack -> sample count
+        interval (float): Seconds between samples
+        top (int): Number of functions to list
+
+    Returns:
+        dict: Sample count, top functions by self and inclusive time, focus times
+    """
+    own = Counter()
+    inclusive = Counter()
+    focus = Counter()
+    for stack, count in samples.items():
+        labels = stack.split(";")
+        own[labels[-1]] += count
+        for label in set(labels):
+            inclusive[label] += count
+        for name, functions in FOCUS_FUNCTIONS.items():
+            if any(_name_matches(label, functions) for label in labels):
+                focus[name] += count
+
+    def ms(count):
+        return round(count * interval * 1000, 3)
+
+    return {
+        "samples": sum(samples.values()),
+        "interval_ms": interval * 1000,
+        "top_self": [
+            {"function": label, "samples": count, "ms": ms(count)}
+            for label, count in own.most_common(top)
+        ],
+        "top_inclusive": [
+            {"function": label, "samples": count, "ms": ms(count)}
+            for label, count in inclusive.most_common(top)
+        ],
+        "focus_ms": {name: ms(focus[name]) for name in FOCUS_FUNCTIONS},
+    }
+
+
+def summarize_cprofile(profile, top=20):
+    """
+    Summarize a cProfile run.
+
+    Returns:
+        dict: Top functions by cumulative time and the focus times
+    """
+    import pstats
+
+    stats = pstats.Stats(profile, stream=io.StringIO())
+    rows = []
+    focus = Counter()
+    for (filename, line, name), (_, nc, tottime, cumtime, _) in stats.stats.items():
+        rows.append(
+            {
+                "function": f"{os.path.basename(filename)}:{line}({name})",
+                "calls": nc,
+                "tottime_ms": round(tottime * 1000, 3),
+                "cumtime_ms": round(cumtime * 1000, 3),
+            }
+        )
+        for label, functions in FOCUS_FUNCTIONS.items():
+            if name in functions:
+                focus[label] += cumtime
+
+    rows.sort(key=lambda row: row["cumtime_ms"], reverse=True)
+    return {
+        "top_cumulative": rows[:top],
+        "focus_ms": {
+            label: round(focus[label] * 1000, 3) for label in FOCUS_FUNCTIONS
+        },
+    }
+
+
+class ProfileStore:
+    """Collapsed stacks of sampled requests, aggregated per route."""
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self.routes = {}  # route -> {"requests": int, "samples": Counter}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def add(self, route, samples):
+        """Add the samples of one request."""
+        with self._lock:
+            entry = self.routes.setdefault(
+                route, {"requests": 0, "samples": Counter()}
+            )
+            entry["requests"] += 1
+            entry["samples"].update(samples)
+        if self.directory and samples:
+            name = re.sub(r"[^A-Za-z0-9_.-]+", "_", route).strip("_") or "root"
+            lines = "".join(f"{stack} {count}\n" for stack, count in samples.items())
+            path = os.path.join(self.directory, f"{name}.collapsed")
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+    def collapsed(self, route=None):
+        """Return aggregated collapsed stacks (optionally of one route)."""
+        with self._lock:
+            entries = [
+                entry
+                for name, entry in self.routes.items()
+                if route is None or name == route
+            ]
+            merged = Counter()
+            for entry in entries:
+                merged.update(entry["samples"])
+        return "".join(f"{stack} {count}\n" for stack, count in merged.items())
+
+    def report(self, interval, top=20):
+        """Return the per-route summary of all sampled requests."""
+        with self._lock:
+            routes = {
+                name: (entry["requests"], Counter(entry["samples"]))
+                for name, entry in self.routes.items()
+            }
+        return {
+            name: dict(summarize_samples(samples, interval, top), requests=requests)
+            for name, (requests, samples) in sorted(routes.items())
+        }
+
+    def clear(self):
+        """Drop all aggregated samples."""
+        with self._lock:
+            self.routes.clear()
+
+
+class Profiling:
+    """Profiling settings and the sampled-profile store of the application."""
+
+    def __init__(self, sample_rate, interval, top, store):
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.top = top
+        self.store = store
+
+
+def _route():
+    rule = request.url_rule
+    return f"{request.method} {rule.rule if rule is not None else request.path}"
+
+
+def init_app(app):
+    """Register the profiling hooks if profiling can be used at all."""
+    sample_rate = float(app.config.get("PROFILE_SAMPLE_RATE") or 0)
+    if not admin_enabled(app) and sample_rate <= 0:
+        return None
+
+    profiling = Profiling(
+        sample_rate=sample_rate,
+        interval=app.config.get("PROFILE_SAMPLE_INTERVAL", 0.001),
+        top=app.config.get("PROFILE_TOP_N", 20),
+        store=ProfileStore(app.config.get("PROFILE_DIR")),
+    )
+    app.extensions[EXTENSION_KEY] = profiling
+
+    @app.before_request
+    def _start_profiler():
+        mode = request.args.get(PARAMETER)
+        if mode and is_admin_request():
+            # A cache hit would leave nothing to diagnose
+            bypass_caches()
+            if mode != "sample":
+                import cProfile
+
+                mode = "cprofile"
+                profiler = cProfile.Profile()
+                try:
+                    profiler.enable()
+                except ValueError:
+                    # Only one cProfile may run per process (Python 3.12+)
+                    mode = "sample"
+            if mode == "sample":
+                profiler = StackSampler(threading.get_ident(), profiling.interval)
+                profiler.start()
+            request.environ[ENVIRON_KEY] = (mode, profiler, time.perf_counter())
+        elif profiling.sample_rate and random.random() < profiling.sample_rate:
+            profiler = StackSampler(threading.get_ident(), profiling.interval)
+            profiler.start()
+            request.environ[ENVIRON_KEY] = ("background", profiler, time.perf_counter())
+
+    @app.after_request
+    def _finish_profiler(response):
+        entry = request.environ.pop(ENVIRON_KEY, None)
+        if entry is None:
+            return response
+        mode, profiler, started = entry
+
+        if mode == "background":
+            profiling.store.add(_route(), profiler.stop())
+            return response
+
+        report = {
+            "route": _route(),
+            "status": response.status_code,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            "mode": mode,
+        }
+        if mode == "sample":
+            samples = profiler.stop()
+            report.update(summarize_samples(samples, profiling.interval, profiling.top))
+            report["collapsed"] = "".join(
+                f"{stack} {count}\n" for stack, count in samples.items()
+            )
+        else:
+            profiler.disable()
+            report.update(summarize_cprofile(profiler, profiling.top))
+        return jsonify({"success": True, "data": report})
+
+    @app.teardown_request
+    def _stop_abandoned_profiler(exc):
+        # The request failed before after_request ran
+        entry = request.environ.pop(ENVIRON_KEY, None)
+        if entry is not None:
+            mode, profiler, _ = entry
+            if mode == "cprofile":
+                profiler.disable()
+            else:
+                profiler.stop()
+
+    return profiling
+
+
+def get_profiling():
+    """Return the profiling settings of the current application (or None)."""
+    return current_app.extensions.get(EXTENSION_KEY)
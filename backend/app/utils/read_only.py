@@ -0,0 +1,144 @@
+"""Read-only database sessions for GET requests.
+
+GET and HEAD requests never write, so their session is switched to a
+read-only policy for the duration of the request (READ_ONLY_GETS):
+
+- autoflush and expire-on-commit are off: queries do not flush first and
+  loaded objects stay usable after a commit without being reloaded
+- on PostgreSQL every transaction is READ ONLY (plus DEFERRABLE when the
+  engine uses SERIALIZABLE isolation, where it lets long reads run on a safe
+  snapshot without risking serialization failures)
+- flushing changes raises ReadOnlyTransactionError on every database, so a
+  write sneaking into a GET handler fails in the SQLite tests as well
+- with READ_REPLICA_URL the transactions go to that replica instead of the
+  primary
+
+Requests that join a transaction already in progress (sub-requests of an
+atomic /api/batch) keep the session as it is. A replica lags behind the
+primary: a GET right after a write may not see it yet. Generation-keyed caches
+would file that older answer under the new generation (and hand out an ETag
+for it) until the next write, so requests reading from a replica bypass the
+result cache and conditional GETs.
+"""
+import weakref
+
+from flask import current_app, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+
+EXTENSION_KEY = "read_only"
+READ_ONLY_KEY = "read_only"
+ENVIRON_KEY = "absencehub.read_only_session"
+READ_ONLY_METHODS = ("GET", "HEAD")
+
+
+class ReadOnlyTransactionError(RuntimeError):
+    """Raised when a read-only session tries to flush changes."""
+
+
+class RoutingSession(Session):
+    """Session using read-only engines (or the replica) while it is read-only."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        """Return the engine for the session's current policy."""
+        if bind is None and self.info.get(READ_ONLY_KEY):
+            engine = current_app.extensions[EXTENSION_KEY]["replica"]
+            if engine is None:
+                engine = super().get_bind(mapper=mapper, clause=clause, **kwargs)
+            return read_only_engine(engine)
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+_read_only_engines = weakref.WeakKeyDictionary()
+
+
+def read_only_engine(engine):
+    """
+    ``engine`` with read-only transactions on PostgreSQL.
+
+    The driver then opens transactions with ``BEGIN READ ONLY`` (the same as
+    ``SET TRANSACTION READ ONLY``, without an extra statement), and the setting
+    is reverted when a connection goes back to the pool. The variant shares
+    the pool and the compiled statement cache of ``engine``.
+    """
+    if engine.dialect.name != "postgresql":
+        return engine
+    if engine not in _read_only_engines:
+        # create_engine(isolation_level=...), e.g. via SQLALCHEMY_ENGINE_OPTIONS,
+        # or the isolation_level execution option
+        isolation = engine.get_execution_options().get("isolation_level") or getattr(
+            engine.dialect, "_on_connect_isolation_level", None
+        )
+        _read_only_engines[engine] = engine.execution_options(
+            postgresql_readonly=True,
+            postgresql_deferrable=isolation == "SERIALIZABLE",
+        )
+    return _read_only_engines[engine]
+
+
+@event.listens_for(RoutingSession, "before_flush")
+def _reject_writes(session, flush_context, instances):
+    if session.info.get(READ_ONLY_KEY) and (
+        session.new or session.dirty or session.deleted
+    ):
+        where = f" ({request.method} {request.path})" if has_request_context() else ""
+        raise ReadOnlyTransactionError(f"Cannot write in a read-only session{where}")
+
+
+def begin_read_only(session):
+    """
+    Switch ``session`` to the read-only policy.
+
+    Returns:
+        tuple: The previous (autoflush, expire_on_commit) to restore, or None
+            if the session is inside a transaction and was left alone
+    """
+    if session.in_transaction() or session.info.get(READ_ONLY_KEY):
+        return None
+    previous = (session.autoflush, session.expire_on_commit)
+    session.autoflush = False
+    session.expire_on_commit = False
+    session.info[READ_ONLY_KEY] = True
+    return previous
+
+
+def end_read_only(session, previous):
+    """Restore the policy saved by begin_read_only() and end the transaction."""
+    if session.in_transaction():
+        session.rollback()  # nothing to keep: the transaction could not write
+    session.autoflush, session.expire_on_commit = previous
+    session.info.pop(READ_ONLY_KEY, None)
+
+
+def init_app(app):
+    """Give the GET and HEAD requests of the application read-only sessions."""
+    if not app.config.get("READ_ONLY_GETS", True):
+        return
+    # Not a Flask-SQLAlchemy bind: no model lives only there, and binds would
+    # add a "replica" metadata to the shared db object
+    url = app.config.get("READ_REPLICA_URL")
+    options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    replica = create_engine(url, **options) if url else None
+    app.extensions[EXTENSION_KEY] = {"replica": replica}
+
+    from app import db
+    from app.utils import change_tracking
+    from app.utils.idempotency import BATCH_ENVIRON_KEY
+
+    @app.before_request
+    def _begin_read_only():
+        if request.method not in READ_ONLY_METHODS:
+            return
+        if request.environ.get(BATCH_ENVIRON_KEY):
+            return  # sub-requests share the session of the batch
+        previous = begin_read_only(db.session())
+        if previous is not None:
+            request.environ[ENVIRON_KEY] = previous
+            if replica is not None:
+                change_tracking.bypass_caches()
+
+    @app.teardown_request
+    def _end_read_only(exc):
+        previous = request.environ.pop(ENVIRON_KEY, None)
+        if previous is not None:
+            end_read_only(db.session(), previous)
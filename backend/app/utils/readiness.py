@@ -0,0 +1,136 @@
+"""Readiness checks for load balancer probes.
+
+``/api/health`` only says the process is alive. ``/api/ready`` says whether it
+can serve traffic: the warmup finished, the database answers, the connection
+pool has room and the schema migrations are at head. The result is cached for
+READINESS_CACHE_SECONDS so frequent probes from several load balancers cost one
+round of checks per interval.
+"""
+import os
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import text
+
+EXTENSION_KEY = "readiness"
+
+
+def check_database(engine):
+    """Run a trivial query."""
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return {"ok": True}
+
+
+def check_pool(engine):
+    """Check that a connection can be checked out without waiting."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout") or not hasattr(pool, "size"):
+        return {"ok": True, "skipped": "pool does not report usage"}
+
+    checked_out = pool.checkedout()
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    result = {"checked_out": checked_out, "size": pool.size()}
+    if max_overflow < 0:
+        result["ok"] = True  # unlimited overflow
+        return result
+    capacity = pool.size() + max_overflow
+    result["available"] = capacity - checked_out
+    result["ok"] = checked_out < capacity
+    return result
+
+
+def check_migrations(engine, directory):
+    """Check that the database schema is at the newest Alembic revision."""
+    if not directory or not os.path.isdir(directory):
+        return {"ok": True, "skipped": "no migrations directory"}
+
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    config = Config()
+    config.set_main_option("script_location", directory)
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+    with engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+    return {
+        "ok": current == heads,
+        "current": sorted(current),
+        "head": sorted(heads),
+    }
+
+
+def check_warmup(warmup):
+    """Check that the warmup finished; a failed warmup is started again."""
+    if warmup is None:
+        return {"ok": True, "skipped": "warmup is off"}
+    result = warmup.status()
+    if result["state"] == "failed":
+        warmup.start()
+    return result
+
+
+class Readiness:
+    """Runs the readiness checks, caching the outcome for a short interval."""
+
+    def __init__(self, cache_seconds=5.0):
+        self.cache_seconds = cache_seconds
+        self._lock = threading.Lock()
+        self._result = None
+        self._checked_at = 0.0
+
+    def status(self, engine, migrations_directory=None, warmup=None):
+        """
+        Return the (possibly cached) readiness of the application.
+
+        Not ready while the warmup (if any) has not finished.
+
+        Returns:
+            dict: {"ready": bool, "checks": {name: result}, "cached": bool}
+        """
+        with self._lock:
+            # Probes arriving while checks run wait for them instead of
+            # starting another round
+            if (
+                self._result is not None
+                and time.monotonic() - self._checked_at < self.cache_seconds
+            ):
+                return dict(self._result, cached=True)
+
+            checks = {}
+            for name, check, args in (
+                ("warmup", check_warmup, (warmup,)),
+                ("pool", check_pool, (engine,)),
+                ("database", check_database, (engine,)),
+                ("migrations", check_migrations, (engine, migrations_directory)),
+            ):
+                try:
+                    checks[name] = check(*args)
+                except Exception as e:  # noqa: BLE001 - any failure means not ready
+                    checks[name] = {"ok": False, "error": str(e)}
+
+            self._result = {
+                "ready": all(result["ok"] for result in checks.values()),
+                "checks": checks,
+            }
+            self._checked_at = time.monotonic()
+            return dict(self._result, cached=False)
+
+    def invalidate(self):
+        """Forget the cached outcome so the next probe runs the checks."""
+        with self._lock:
+            self._result = None
+
+
+def init_app(app):
+    """Attach the readiness checker of the application."""
+    readiness = Readiness(app.config.get("READINESS_CACHE_SECONDS", 5))
+    app.extensions[EXTENSION_KEY] = readiness
+    return readiness
+
+
+def get_readiness():
+    """Return the readiness checker of the current application."""
+    return current_app.extensions[EXTENSION_KEY]
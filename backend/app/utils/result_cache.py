@@ -0,0 +1,276 @@
+"""Filter-keyed cache for expensive read results (absence lists, statistics).
+
+Entries are keyed by a namespace, the normalized parameters and the current change
+generations of the tables the result depends on. A committed write bumps the
+generation, so later lookups use a new key and stale entries simply age out of
+the LRU (or expire through the TTL).
+
+Two backends are available:
+    - "memory": an LRU dictionary private to the worker process
+    - "file":   JSON files under ``SHARED_STATE_DIR`` shared by all workers
+
+"auto" picks "file" when ``SHARED_STATE_DIR`` is set and no cache otherwise: the
+generations of a worker's in-process store miss the writes of other workers, so
+a memory cache behind several workers would serve stale results until the TTL.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+
+from flask import current_app
+
+from app.utils import change_tracking
+from app.utils.singleflight import get_singleflight
+
+EXTENSION_KEY = "result_cache"
+
+
+class MemoryCacheBackend:
+    """Thread-safe in-process LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return (found, value) for a key."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl):
+        """Store a value for ``ttl`` seconds, evicting least recently used entries."""
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FileCacheBackend:
+    """LRU cache stored as JSON files in a directory shared between processes."""
+
+    def __init__(self, directory, max_entries):
+        self.directory = os.path.join(directory, "result_cache")
+        self.max_entries = max_entries
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """Return (found, value) for a key."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return False, None
+
+        if entry["expires_at"] < time.time():
+            self._remove(path)
+            return False, None
+
+        # Touch the file so pruning treats it as recently used
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return True, entry["value"]
+
+    def set(self, key, value, ttl):
+        """Store a value for ``ttl`` seconds, pruning the oldest files if needed."""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"expires_at": time.time() + ttl, "value": value}, f)
+        os.replace(tmp_path, path)
+        self._prune()
+
+    def _prune(self):
+        entries = [
+            entry
+            for entry in os.scandir(self.directory)
+            if entry.name.endswith(".json")
+        ]
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        # Drop a little more than needed so pruning does not run on every set
+        excess = len(entries) - int(self.max_entries * 0.9)
+        for entry in entries[:excess]:
+            self._remove(entry.path)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        """Remove all entries."""
+        for entry in os.scandir(self.directory):
+            self._remove(entry.path)
+
+    def __len__(self):
+        return sum(1 for name in os.listdir(self.directory) if name.endswith(".json"))
+
+
+def _normalize(value):
+    """Convert filter values to a canonical JSON-compatible form."""
+    if isinstance(value, dict):
+        return {
+            str(key): _normalize(item)
+            for key, item in sorted(value.items())
+            if item not in (None, "")
+        }
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+class ResultCache:
+    """Generation-aware result cache with hit and miss counters."""
+
+    def __init__(self, backend, ttl):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute):
+        """
+        Return a cached result or compute and store it.
+
+        Args:
+            key (str): Cache key (see make_key)
+            compute (callable): Produces the (JSON-serializable) result on a miss
+
+        Returns:
+            The cached or freshly computed result
+        """
+        found, value = self.backend.get(key)
+        with self._lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if found:
+            return value
+
+        value = compute()
+        self.backend.set(key, value, self.ttl)
+        return value
+
+    def stats(self):
+        """Return hit/miss counters for this process."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def make_key(namespace, params, tables):
+    """
+    Build the key identifying a result.
+
+    Args:
+        namespace (str): Kind of result (e.g. "absences", "statistics")
+        params (dict): Parameters the result depends on (e.g. filters)
+        tables (tuple): Tables whose change generations invalidate the result
+
+    Returns:
+        str: Hex digest identifying the result
+    """
+    store = change_tracking.get_store()
+    generations = [store.get(table)[0] for table in tables]
+    raw = json.dumps(
+        [namespace, store.epoch, generations, _normalize(params or {})],
+        sort_keys=True,
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def init_app(app):
+    """Create the result cache configured for the application."""
+    backend_name = app.config.get("RESULT_CACHE_BACKEND", "auto")
+    max_entries = app.config.get("RESULT_CACHE_MAX_ENTRIES", 256)
+    shared_dir = app.config.get("SHARED_STATE_DIR")
+    if backend_name == "auto":
+        backend_name = "file" if shared_dir else "none"
+
+    if backend_name == "none":
+        app.extensions[EXTENSION_KEY] = None
+        return None
+
+    if backend_name == "file":
+        if not shared_dir:
+            raise RuntimeError("RESULT_CACHE_BACKEND=file requires SHARED_STATE_DIR")
+        backend = FileCacheBackend(shared_dir, max_entries)
+    else:
+        backend = MemoryCacheBackend(max_entries)
+
+    cache = ResultCache(backend, app.config.get("RESULT_CACHE_TTL", 300))
+    app.extensions[EXTENSION_KEY] = cache
+    return cache
+
+
+def get_cache():
+    """Return the result cache of the current application (None if disabled)."""
+    return current_app.extensions.get(EXTENSION_KEY)
+
+
+def cached(namespace, params, tables, compute):
+    """
+    Look up a result in the application's cache, computing it on a miss.
+
+    Concurrent misses for the same key inside this worker are coalesced so the
+    computation runs once. Without a cache only the coalescing applies.
+    """
+    if change_tracking.caches_bypassed():
+        return compute()
+
+    key = make_key(namespace, params, tables)
+    flight = get_singleflight()
+    if flight is not None:
+        compute = _coalesced(flight, key, compute)
+
+    cache = get_cache()
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(key, compute)
+
+
+def _coalesced(flight, key, compute):
+    def run():
+        return flight.do(key, compute)
+
+    return run
@@ -0,0 +1,47 @@
+"""Response serialization helpers."""
+
+
+def to_columnar(records, fields, dictionary_fields=()):
+    """
+    Convert a list of dictionaries into a column-oriented payload.
+
+    Each field becomes a single array instead of being repeated as a key in every
+    record. Low-cardinality fields listed in ``dictionary_fields`` are
+    dictionary-encoded: the column holds indexes into a list of distinct values.
+
+    Args:
+        records (list): Serialized records sharing the same keys
+        fields (tuple): Field names to emit, in output order
+        dictionary_fields (tuple): Fields to dictionary-encode
+
+    Returns:
+        dict: Columnar payload with "fields", "count", "columns" and "dictionaries"
+    """
+    columns = {field: [] for field in fields}
+    dictionaries = {}
+    encoders = {}
+
+    for field in fields:
+        if field in dictionary_fields:
+            dictionaries[field] = []
+            encoders[field] = {}
+
+    for record in records:
+        for field in fields:
+            value = record[field]
+            encoder = encoders.get(field)
+            if encoder is not None:
+                index = encoder.get(value)
+                if index is None:
+                    index = encoder[value] = len(dictionaries[field])
+                    dictionaries[field].append(value)
+                value = index
+            columns[field].append(value)
+
+    return {
+        "layout": "columnar",
+        "fields": list(fields),
+        "count": len(records),
+        "columns": columns,
+        "dictionaries": dictionaries,
+    }
@@ -0,0 +1,108 @@
+"""Single-flight coalescing of identical concurrent computations.
+
+When several threads of a worker ask for the same key at the same time, only the
+first one (the leader) runs the computation; the others wait for it and share its
+result. A follower that waits longer than the timeout stops waiting and computes
+the value itself, so a stuck leader cannot block every request behind it.
+"""
+import threading
+
+from flask import current_app
+
+EXTENSION_KEY = "singleflight"
+
+
+class _Call:
+    """An in-flight computation and the threads waiting for it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key."""
+
+    def __init__(self, timeout=10.0):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executions = 0
+        self.shared = 0
+        self.timeouts = 0
+
+    def do(self, key, compute, timeout=None):
+        """
+        Run ``compute`` once for all concurrent callers using the same key.
+
+        Args:
+            key (str): Identifies identical computations
+            compute (callable): Produces the result
+            timeout (float): Seconds a follower waits before computing on its own
+                (defaults to the instance timeout)
+
+        Returns:
+            The result of the leader's (or this caller's own) computation
+
+        Raises:
+            Exception: Whatever the leader's computation raised
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                call.waiters += 1
+                leader = False
+
+        if leader:
+            try:
+                call.result = compute()
+                return call.result
+            except Exception as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                    self.executions += 1
+                call.done.set()
+
+        if not call.done.wait(self.timeout if timeout is None else timeout):
+            with self._lock:
+                self.timeouts += 1
+            return compute()
+
+        with self._lock:
+            self.shared += 1
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self):
+        """Return coalescing counters for this process."""
+        with self._lock:
+            in_flight = len(self._calls)
+        requests = self.executions + self.shared
+        return {
+            "executions": self.executions,
+            "shared": self.shared,
+            "timeouts": self.timeouts,
+            "in_flight": in_flight,
+            "collapsed_ratio": round(self.shared / requests, 4) if requests else 0.0,
+        }
+
+
+def init_app(app):
+    """Create the single-flight group used by the application's read services."""
+    flight = SingleFlight(timeout=app.config.get("SINGLEFLIGHT_TIMEOUT", 10.0))
+    app.extensions[EXTENSION_KEY] = flight
+    return flight
+
+
+def get_singleflight():
+    """Return the single-flight group of the current application."""
+    return current_app.extensions.get(EXTENSION_KEY)
@@ -0,0 +1,216 @@
+"""Per-request SQL instrumentation.
+
+Engine events time every statement and add it to the collectors active in the
+current context: one per request (pushed in ``before_request``) plus any opened
+with ``track_queries()``. At the end of a request the totals are reported in a
+``Server-Timing`` header, e.g.::
+
+    Server-Timing: db;dur=4.21;desc="3 queries", app;dur=11.80
+
+Statements slower than SLOW_QUERY_MS are logged with their duration and the
+route that ran them. Every execution also counts towards the process-wide hit
+ratio of SQLAlchemy's compiled statement cache (``compiled_cache``).
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import current_app, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CacheStats
+
+EXTENSION_KEY = "sql_instrumentation"
+ENVIRON_KEY = "absencehub.sql_stats"
+# Longest statement text kept for reports and logs
+MAX_STATEMENT_LENGTH = 500
+
+logger = logging.getLogger(__name__)
+
+_collectors = ContextVar("sql_collectors", default=())
+
+
+class QueryStats:
+    """Statement count, total time and slowest statement of a unit of work."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement = None
+        self.statements = []
+
+    def record(self, statement, duration_ms):
+        """Add one executed statement."""
+        self.count += 1
+        self.total_ms += duration_ms
+        self.statements.append(statement)
+        if duration_ms >= self.slowest_ms:
+            self.slowest_ms = duration_ms
+            self.slowest_statement = statement
+
+    def elapsed_ms(self):
+        """Milliseconds since the collector was created."""
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def server_timing(self):
+        """Return the Server-Timing header value for these statistics."""
+        return (
+            f'db;dur={self.total_ms:.2f};desc="{self.count} queries", '
+            f"app;dur={self.elapsed_ms():.2f}"
+        )
+
+    def to_dict(self):
+        """Summary without the statement list."""
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "slowest_ms": round(self.slowest_ms, 3),
+            "slowest_statement": self.slowest_statement,
+        }
+
+
+class CompiledCacheStats:
+    """Lookups in SQLAlchemy's compiled statement cache of this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    def record(self, cache_hit):
+        """Count one execution by its ``ExecutionContext.cache_hit`` value."""
+        with self._lock:
+            if cache_hit == CacheStats.CACHE_HIT:
+                self.hits += 1
+            elif cache_hit == CacheStats.CACHE_MISS:
+                self.misses += 1
+            else:
+                # Driver-level SQL and constructs that cannot be cached
+                self.uncached += 1
+
+    def reset(self):
+        """Start counting from zero."""
+        with self._lock:
+            self.hits = self.misses = self.uncached = 0
+
+    def to_dict(self, engine=None):
+        """
+        Counts and hit ratio, plus the cache size of ``engine`` if given.
+
+        Returns:
+            dict: hits, misses, uncached, hit_ratio (None before any lookup)
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            result = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "uncached": self.uncached,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
+        cache = getattr(engine, "_compiled_cache", None)
+        if cache is not None:
+            result["size"] = len(cache)
+            result["capacity"] = cache.capacity
+        return result
+
+
+compiled_cache = CompiledCacheStats()
+
+
+@contextmanager
+def track_queries():
+    """
+    Collect the statements executed inside the block.
+
+    Yields:
+        QueryStats: Filled in while the block runs
+    """
+    stats = QueryStats()
+    token = _collectors.set(_collectors.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+
+def current_stats():
+    """Return the statistics of the current request (None outside requests)."""
+    if not has_request_context():
+        return None
+    return request.environ.get(ENVIRON_KEY)
+
+
+def init_app(app):
+    """Time the statements of every request of the application."""
+    if not app.config.get("SQL_INSTRUMENTATION", True):
+        return
+    app.extensions[EXTENSION_KEY] = True
+
+    @app.before_request
+    def _start_request_stats():
+        stats = QueryStats()
+        request.environ[ENVIRON_KEY] = stats
+        # Sub-requests (e.g. of /api/batch) also count towards the outer request
+        request.environ[ENVIRON_KEY + ".token"] = _collectors.set(
+            _collectors.get() + (stats,)
+        )
+
+    @app.after_request
+    def _report_request_stats(response):
+        stats = current_stats()
+        if stats is not None and app.config.get("SERVER_TIMING", True):
+            response.headers["Server-Timing"] = stats.server_timing()
+        return response
+
+    @app.teardown_request
+    def _end_request_stats(exc):
+        token = request.environ.pop(ENVIRON_KEY + ".token", None)
+        if token is not None:
+            try:
+                _collectors.reset(token)
+            except ValueError:
+                pass  # torn down from another context; the context dies with it
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_timer(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start_times"):
+        connection.info["query_start_times"].pop()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        compiled_cache.record(context.cache_hit)
+    start_times = conn.info.get("query_start_times")
+    if not start_times:
+        return
+    duration_ms = (time.perf_counter() - start_times.pop()) * 1000
+
+    statement = statement[:MAX_STATEMENT_LENGTH]
+    for stats in _collectors.get():
+        stats.record(statement, duration_ms)
+
+    if not has_app_context():
+        return
+    threshold = current_app.config.get("SLOW_QUERY_MS", 200)
+    if threshold is not None and duration_ms >= threshold:
+        logger.warning(
+            "Slow query (%.1f ms) in %s %s: %s",
+            duration_ms,
+            request.method if has_request_context() else "-",
+            request.path if has_request_context() else "-",
+            statement,
+        )
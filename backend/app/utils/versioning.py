@@ -0,0 +1,48 @@
+"""Optimistic concurrency control based on row versions.
+
+``EmployeeAbsence`` and ``AbsenceType`` map their ``version`` column as the ORM
+version counter: every UPDATE/DELETE is issued as ``... WHERE id = ? AND
+version = ?`` and increments the version. A statement that matches no row means
+someone else changed the row first; SQLAlchemy reports that as StaleDataError,
+which is turned into VersionConflictError here.
+"""
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.validators.absence_validators import VersionConflictError
+
+
+def check_version(current_version, expected_version):
+    """
+    Reject a write based on an outdated version.
+
+    Args:
+        current_version (int): Version of the loaded row
+        expected_version (int): Version the client expects (None = unconditional)
+
+    Raises:
+        VersionConflictError: If the versions differ
+    """
+    if expected_version is not None and current_version != expected_version:
+        raise VersionConflictError(
+            f"Resource was modified (current version {current_version}, "
+            f"expected {expected_version})"
+        )
+
+
+def commit_versioned(session):
+    """
+    Commit, reporting a lost version race as VersionConflictError.
+
+    Args:
+        session: SQLAlchemy session
+
+    Raises:
+        VersionConflictError: If a versioned row changed since it was loaded
+    """
+    try:
+        session.commit()
+    except StaleDataError as e:
+        session.rollback()
+        raise VersionConflictError(
+            "Resource was modified by another request"
+        ) from e
@@ -0,0 +1,281 @@
+"""Warm a process up before it takes traffic.
+
+The first requests after a deploy pay for work done on demand: opening pool
+connections, compiling statements, filling SQLAlchemy's mapper and type caches
+and reading the SPA files. The warmup runs those hot paths once:
+
+- ``pool``: opens WARMUP_POOL_CONNECTIONS connections at the same time, so the
+  pool keeps them for the first concurrent requests
+- ``queries``: the absence list (by month and by employee search), statistics,
+  single-absence lookup and the overlap check, bypassing the result cache, so
+  their statements land in the engine's compiled cache
+- ``absence_types``: the active absence types every page loads first
+- ``static``: index.html and the assets it references (the build has no
+  separate manifest), plus the MIME type table used to serve them
+
+WARMUP selects the mode: ``background`` warms up in a thread while the server
+starts, ``blocking`` finishes before create_app returns (with
+``gunicorn --preload`` it runs once in the master before the workers fork) and
+``off`` skips it. /api/ready reports not ready until the warmup finished.
+
+Pool connections must not be shared across a fork: a forked worker drops the
+inherited ones and runs the ``pool`` step again, while compiled statements and
+loaded files are inherited. Fork hooks cannot be unregistered, so one hook is
+registered per process and it only visits the warmups of apps still alive.
+"""
+import mimetypes
+import os
+import re
+import threading
+import time
+import weakref
+from datetime import date
+
+import click
+from flask import current_app
+
+EXTENSION_KEY = "warmup"
+MODES = ("off", "background", "blocking")
+ASSET_PATTERN = re.compile(r'(?:src|href)="/?([^"]+\.(?:js|css))"')
+
+# Warmups of live apps; an app and its warmup drop out once collected
+_warmups = weakref.WeakSet()
+_fork_hook_lock = threading.Lock()
+_fork_hook_registered = False
+
+
+def open_pool_connections(engine, count):
+    """
+    Hold ``count`` connections at once so the pool keeps them open.
+
+    Returns:
+        dict: Number of connections opened
+    """
+    size = engine.pool.size() if hasattr(engine.pool, "size") else count
+    count = max(0, min(count, size))
+    connections = []
+    try:
+        for _ in range(count):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.exec_driver_sql("SELECT 1")
+    finally:
+        for connection in connections:
+            connection.close()
+    return {"connections": count}
+
+
+def run_hot_queries():
+    """
+    Run the statements behind the busiest endpoints once.
+
+    Returns:
+        dict: Number of queries run
+    """
+    from app import db
+    from app.services.absence_service import AbsenceService
+
+    # The current month is what the SPA opens on; the other filters use values
+    # matching (almost) nothing, compiling the statement is what counts
+    month = date.today().strftime("%Y-%m")
+    search = {"service_account": "s.warmup"}
+    queries = (
+        lambda: AbsenceService._query_serialized({"month": month}, None),
+        lambda: AbsenceService._query_serialized(search, None),
+        lambda: AbsenceService._compute_statistics({"month": month}),
+        lambda: AbsenceService._compute_statistics({"year": "1900"}),
+        lambda: AbsenceService._compute_statistics(search),
+        lambda: AbsenceService.get_by_id(0),
+        lambda: AbsenceService._check_overlap(
+            "s.warmup.check", None, date.today(), date.today()
+        ),
+    )
+    try:
+        for query in queries:
+            current_app.json.dumps(query())
+    finally:
+        db.session.remove()
+    return {"queries": len(queries)}
+
+
+def load_absence_types():
+    """
+    Load the active absence types.
+
+    Returns:
+        dict: Number of active types
+    """
+    from app import db
+    from app.services.absence_type_service import AbsenceTypeService
+
+    try:
+        types = [item.to_dict() for item in AbsenceTypeService.get_all(True)]
+    finally:
+        db.session.remove()
+    return {"absence_types": len(types)}
+
+
+def load_static_files(static_folder):
+    """
+    Read index.html and the assets it references.
+
+    Returns:
+        dict: Number of files and bytes read
+    """
+    index = os.path.join(static_folder or "", "index.html")
+    if not static_folder or not os.path.isfile(index):
+        return {"skipped": "no frontend build"}
+
+    mimetypes.init()
+    with open(index, encoding="utf-8") as handle:
+        html = handle.read()
+    files, size = 1, len(html)
+    for asset in ASSET_PATTERN.findall(html):
+        path = os.path.join(static_folder, asset)
+        if os.path.isfile(path):
+            mimetypes.guess_type(path)
+            with open(path, "rb") as handle:
+                size += len(handle.read())
+            files += 1
+    return {"files": files, "bytes": size}
+
+
+class Warmup:
+    """Runs the warmup steps once per process and reports their progress."""
+
+    def __init__(self, app, pool_connections=2):
+        self.app = app
+        self.pool_connections = pool_connections
+        self._lock = threading.Lock()
+        self._thread = None
+        self.state = "pending"
+        self.steps = {}
+        self.seconds = None
+
+    def step_functions(self):
+        """The warmup steps in the order they run."""
+        from app import db
+
+        return (
+            ("pool", lambda: open_pool_connections(db.engine, self.pool_connections)),
+            ("queries", run_hot_queries),
+            ("absence_types", load_absence_types),
+            ("static", lambda: load_static_files(self.app.static_folder)),
+        )
+
+    def run(self, only=None):
+        """
+        Run the warmup steps (or the ``only`` given) in an app context.
+
+        A failing step is recorded and the others still run; the warmup then
+        counts as failed and the next readiness probe starts it again.
+        """
+        with self._lock:
+            self.state = "running"
+        started = time.perf_counter()
+        steps = dict(self.steps)
+        with self.app.app_context():
+            for name, function in self.step_functions():
+                if only is not None and name not in only:
+                    continue
+                step_started = time.perf_counter()
+                try:
+                    steps[name] = dict(function(), ok=True)
+                except Exception as e:  # noqa: BLE001 - reported by /api/ready
+                    steps[name] = {"ok": False, "error": str(e)}
+                elapsed = time.perf_counter() - step_started
+                steps[name]["ms"] = round(elapsed * 1000, 1)
+
+        with self._lock:
+            self.steps = steps
+            self.seconds = round(time.perf_counter() - started, 3)
+            ok = all(step["ok"] for step in steps.values())
+            self.state = "done" if ok else "failed"
+        readiness = self.app.extensions.get("readiness")
+        if readiness is not None:
+            readiness.invalidate()
+        return self.status()
+
+    def start(self, only=None):
+        """Run the warmup in a daemon thread unless one is running already."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self.state = "running"
+            self._thread = threading.Thread(
+                target=self.run, args=(only,), name="warmup", daemon=True
+            )
+            self._thread.start()
+
+    def after_fork(self):
+        """Drop the parent's pool connections and reopen them in this process."""
+        from app import db
+
+        with self.app.app_context():
+            db.engine.dispose(close=False)
+        self._lock = threading.Lock()
+        self._thread = None
+        # A warmup still running in the parent did not survive the fork
+        self.start(only=("pool",) if self.state == "done" else None)
+
+    def status(self):
+        """
+        Return the warmup progress.
+
+        Returns:
+            dict: {"ok": bool, "state": str, "steps": {name: result}, ...}
+        """
+        with self._lock:
+            result = {"ok": self.state == "done", "state": self.state}
+            if self.steps:
+                result["steps"] = dict(self.steps)
+            if self.seconds is not None:
+                result["seconds"] = self.seconds
+        return result
+
+
+def _after_fork_in_child():
+    for warmup in list(_warmups):
+        warmup.after_fork()
+
+
+def _track(warmup):
+    """Redo the pool step of ``warmup`` in forked children while it is alive."""
+    global _fork_hook_registered
+    _warmups.add(warmup)
+    with _fork_hook_lock:
+        if _fork_hook_registered or not hasattr(os, "register_at_fork"):
+            return
+        os.register_at_fork(after_in_child=_after_fork_in_child)
+        _fork_hook_registered = True
+
+
+def init_app(app):
+    """
+    Attach and start the warmup configured by WARMUP.
+
+    Returns:
+        Warmup: The warmup, or None when WARMUP is "off"
+    """
+    mode = app.config.get("WARMUP", "off")
+    if mode not in MODES:
+        raise ValueError(f"WARMUP must be one of {', '.join(MODES)}, not '{mode}'")
+    if mode == "off":
+        return None
+    context = click.get_current_context(silent=True)
+    if context is not None and context.command.name != "run":
+        return None  # CLI commands other than "flask run" serve no traffic
+
+    warmup = Warmup(app, app.config.get("WARMUP_POOL_CONNECTIONS", 2))
+    app.extensions[EXTENSION_KEY] = warmup
+    _track(warmup)
+    if mode == "blocking":
+        warmup.run()
+    else:
+        warmup.start()
+    return warmup
+
+
+def get_warmup():
+    """Return the warmup of the current application, or None when it is off."""
+    return current_app.extensions.get(EXTENSION_KEY)
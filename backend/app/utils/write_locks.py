@@ -0,0 +1,135 @@
+"""Per-employee write locks serializing the overlap check and the write.
+
+``AbsenceService`` checks for overlapping absences and then writes; two
+concurrent requests for the same employee could both pass the check. Taking the
+employee's lock first closes that gap while writes for different employees keep
+running in parallel.
+
+    - PostgreSQL: a transaction-scoped advisory lock keyed on a hash of the
+      service account, released by the database on commit or rollback
+    - Other databases (SQLite): a per-key ``threading.Lock``, released when the
+      session's transaction ends; it only covers the threads of one process
+
+An atomic batch takes the locks of its operations in request order, so two
+batches can wait for each other. PostgreSQL detects that deadlock itself; the
+thread locks give up after WRITE_LOCK_TIMEOUT seconds with LockTimeoutError.
+"""
+import threading
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+HELD_KEY = "write_locks.held"
+DEFAULT_TIMEOUT = 10.0
+
+# First key of the two-key advisory lock, keeping our locks apart from others
+ADVISORY_LOCK_NAMESPACE = 0x41484231  # "AHB1"
+
+_ADVISORY_LOCK = text(
+    "SELECT pg_advisory_xact_lock(:namespace, hashtext(:key))"
+)
+
+
+class LockTimeoutError(Exception):
+    """An employee's write lock could not be taken in time (likely a deadlock)."""
+
+
+class KeyedLocks:
+    """Thread locks created on demand per key and dropped when unused."""
+
+    def __init__(self):
+        self._locks = {}  # key -> [lock, number of users]
+        self._guard = threading.Lock()
+
+    def acquire(self, key, timeout=-1):
+        """
+        Wait until the lock for ``key`` is held by the calling thread.
+
+        Args:
+            key: Lock key
+            timeout (float): Seconds to wait at most (-1 = no limit)
+
+        Returns:
+            bool: True if the lock was taken, False if the timeout expired
+        """
+        with self._guard:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        if entry[0].acquire(timeout=timeout):
+            return True
+        with self._guard:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[key]
+        return False
+
+    def release(self, key):
+        """Release a lock taken with acquire()."""
+        with self._guard:
+            entry = self._locks[key]
+            entry[0].release()
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[key]
+
+    def __len__(self):
+        return len(self._locks)
+
+
+_keyed_locks = KeyedLocks()
+
+
+def lock_employee(service_account, session=None):
+    """
+    Lock an employee's absences until the current transaction ends.
+
+    Taking the same lock again in the same transaction is a no-op.
+
+    Args:
+        service_account (str): Employee whose absences are about to change
+        session: SQLAlchemy session (defaults to ``db.session``)
+
+    Raises:
+        LockTimeoutError: If a thread lock is not free within WRITE_LOCK_TIMEOUT
+    """
+    if session is None:
+        from app import db
+
+        session = db.session()
+
+    # service account -> whether a thread lock (not an advisory lock) is held
+    held = session.info.setdefault(HELD_KEY, {})
+    if service_account in held:
+        return
+
+    # Begin the transaction now so its end reliably releases the lock
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        connection.execute(
+            _ADVISORY_LOCK,
+            {"namespace": ADVISORY_LOCK_NAMESPACE, "key": service_account},
+        )
+        held[service_account] = False
+    else:
+        timeout = DEFAULT_TIMEOUT
+        if has_app_context():
+            timeout = current_app.config.get("WRITE_LOCK_TIMEOUT", DEFAULT_TIMEOUT)
+        if not _keyed_locks.acquire(service_account, timeout):
+            raise LockTimeoutError(
+                f"Timed out waiting for the write lock of {service_account}, "
+                "please retry"
+            )
+        held[service_account] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _release_write_locks(session, transaction):
+    if transaction.parent is not None:
+        return  # a savepoint ended; the outer transaction keeps the locks
+
+    held = session.info.pop(HELD_KEY, None) or {}
+    for service_account, thread_lock in held.items():
+        # Advisory locks are released by the database itself
+        if thread_lock:
+            _keyed_locks.release(service_account)
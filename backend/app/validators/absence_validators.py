@@ -11,6 +11,12 @@ class ValidationError(Exception):
     pass
 
 
+class VersionConflictError(Exception):
+    """The resource changed since the version the client based its request on."""
+
+    pass
+
+
 def validate_service_account(service_account):
     """
     Validate service account format.
@@ -66,3 +72,34 @@ def validate_absence_type(absence_type):
         raise ValidationError(
             f"Invalid absence type. Allowed types: {', '.join(ALLOWED_ABSENCE_TYPES)}"
         )
+
+
+def validate_fields(fields_param, allowed_fields):
+    """
+    Parse and validate a comma-separated sparse fieldset.
+
+    Args:
+        fields_param (str): Comma-separated field names (e.g. "id,start_date")
+        allowed_fields (tuple): Field names that may be requested
+
+    Returns:
+        tuple: Requested field names in request order, or None if not provided
+
+    Raises:
+        ValidationError: If an unknown field is requested
+    """
+    if not fields_param:
+        return None
+
+    fields = []
+    for field in fields_param.split(","):
+        field = field.strip()
+        if not field or field in fields:
+            continue
+        if field not in allowed_fields:
+            raise ValidationError(
+                f"Invalid field '{field}'. Allowed fields: {', '.join(allowed_fields)}"
+            )
+        fields.append(field)
+
+    return tuple(fields) or None
@@ -0,0 +1,12 @@
+"""Microbenchmarks for the model, validator and service hot paths.
+
+Run from the backend directory::
+
+    python -m benchmarks                      # all cases, 1k/100k/1M rows
+    python -m benchmarks --sizes 1000 --filter calculate_days
+    python -m benchmarks --save-baseline      # store benchmarks/baseline.json
+    python -m benchmarks --compare            # fail on regressions
+
+Database cases use the testing configuration, i.e. an in-memory SQLite
+database unless TEST_DATABASE_URL points elsewhere.
+"""
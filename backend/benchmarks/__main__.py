@@ -0,0 +1,173 @@
+"""Command line entry point: ``python -m benchmarks``."""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Allow running from outside the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import create_app, db  # noqa: E402
+from benchmarks import cases  # noqa: E402
+from benchmarks.harness import (  # noqa: E402
+    compare,
+    format_duration,
+    load_results,
+    run_cases,
+    save_results,
+)
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_SIZES = "1000,100000,1000000"
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__
+    )
+    parser.add_argument(
+        "--sizes",
+        default=DEFAULT_SIZES,
+        help=f"Comma-separated row counts for database cases ({DEFAULT_SIZES})",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case")
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.1,
+        help="Minimum duration of one timed run in seconds",
+    )
+    parser.add_argument(
+        "--filter", help="Only run cases whose name contains this text"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Dataset seed")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument(
+        "--baseline",
+        default=str(DEFAULT_BASELINE),
+        help="Baseline JSON file (default: benchmarks/baseline.json)",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store the results as the new baseline",
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Compare with the baseline and exit 1 on regressions",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Allowed slowdown of the median before a case regresses (0.1 = 10%%)",
+    )
+    parser.add_argument(
+        "--min-delta-us",
+        type=float,
+        default=1.0,
+        help="Smallest slowdown per call (microseconds) that can be a regression",
+    )
+    return parser.parse_args(argv)
+
+
+def _selected(case_list, text):
+    return [case for case in case_list if not text or text in case.name]
+
+
+def _print_result(case, result):
+    print(
+        f"  {case.name:<36} median {format_duration(result['median']):>10}"
+        f"  min {format_duration(result['min']):>10}"
+        f"  stdev {format_duration(result['stdev']):>10}"
+        f"  ({result['runs']}x{result['loops']})",
+        flush=True,
+    )
+
+
+def run(args):
+    """Run the selected cases and return their results."""
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    options = {
+        "repeat": args.repeat,
+        "min_time": args.min_time,
+        "progress": _print_result,
+    }
+    results = {}
+
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        try:
+            for group in (cases.model_cases, cases.validator_cases, cases.query_cases):
+                selected = _selected(group(), args.filter)
+                if selected:
+                    print(group.__doc__.splitlines()[0])
+                    results.update(run_cases(selected, **options))
+
+            for rows in sizes:
+                # Only build the dataset if one of its cases is selected
+                names = [
+                    f"check_overlap[clear,{cases.size_label(rows)}]",
+                    f"check_overlap[conflict,{cases.size_label(rows)}]",
+                    f"get_statistics[{cases.size_label(rows)}]",
+                ]
+                if args.filter and not any(args.filter in name for name in names):
+                    continue
+                print(f"Dataset with {rows} absences", flush=True)
+                cases.populate(rows, seed=args.seed)
+                selected = _selected(cases.dataset_cases(rows), args.filter)
+                results.update(run_cases(selected, **options))
+        finally:
+            db.session.remove()
+            db.drop_all()
+    return results
+
+
+def report_comparison(rows, tolerance, min_delta_us):
+    """Print a comparison table and return the number of regressions."""
+    print(
+        f"\nComparison with baseline (tolerance {tolerance:.0%}, "
+        f"at least {min_delta_us:g} us per call):"
+    )
+    regressions = 0
+    for row in rows:
+        ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "-"
+        print(f"  {row['name']:<36} {ratio:>8}  {row['status']}")
+        regressions += row["status"] == "regression"
+    return regressions
+
+
+def main(argv=None):
+    """Run the benchmarks; returns the process exit code."""
+    args = parse_args(argv)
+    results = run(args)
+    metadata = {"sizes": args.sizes, "seed": args.seed, "repeat": args.repeat}
+
+    if args.output:
+        save_results(args.output, results, metadata)
+    if args.save_baseline:
+        save_results(args.baseline, results, metadata)
+        print(f"\nBaseline written to {args.baseline}")
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"\nNo baseline at {args.baseline}; run with --save-baseline")
+            return 2
+        baseline = load_results(args.baseline)["results"]
+        if args.filter:
+            baseline = {
+                name: result
+                for name, result in baseline.items()
+                if args.filter in name
+            }
+        rows = compare(results, baseline, args.tolerance, args.min_delta_us / 1e6)
+        if report_comparison(rows, args.tolerance, args.min_delta_us):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
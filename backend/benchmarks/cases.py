@@ -0,0 +1,197 @@
+"""Benchmark cases for the model, validator and service hot paths."""
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func
+
+from app import db
+from app.models.absence import EmployeeAbsence
+from app.services.absence_service import AbsenceService
+from app.utils.data_generator import employee_identity, generate_dataset
+from app.validators.absence_validators import (
+    ValidationError,
+    validate_absence_type,
+    validate_date_range,
+    validate_fields,
+    validate_service_account,
+)
+
+from benchmarks.harness import Case
+
+CALCULATE_DAYS_SPANS = (1, 5, 30, 90, 365)
+FIRST_DAY = date(2020, 1, 6)  # a Monday
+
+
+def size_label(rows):
+    """Return a short label such as 1k or 1M for a row count."""
+    for suffix, factor in (("M", 1000000), ("k", 1000)):
+        if rows >= factor and rows % factor == 0:
+            return f"{rows // factor}{suffix}"
+    return str(rows)
+
+
+def _absence(span, is_half_day=False):
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    return EmployeeAbsence(
+        id=1,
+        service_account="s.john.doe",
+        employee_fullname="John Doe",
+        absence_type="Urlaub",
+        start_date=FIRST_DAY,
+        end_date=FIRST_DAY + timedelta(days=span - 1),
+        is_half_day=is_half_day,
+        created_at=now,
+        updated_at=now,
+        version=1,
+    )
+
+
+def model_cases():
+    """EmployeeAbsence.calculate_days(), to_dict() and row_to_dict()."""
+    cases = []
+    for span in CALCULATE_DAYS_SPANS:
+        absence = _absence(span)
+        cases.append(
+            Case(f"calculate_days[{span}d]", absence.calculate_days, "model")
+        )
+    cases.append(
+        Case("calculate_days[half_day]", _absence(1, True).calculate_days, "model")
+    )
+
+    absence = _absence(5)
+    sparse = ("id", "start_date", "end_date", "absence_type")
+    cases.append(Case("to_dict", absence.to_dict, "model"))
+    cases.append(
+        Case(
+            "row_to_dict[4_fields]",
+            lambda: EmployeeAbsence.row_to_dict(absence, sparse),
+            "model",
+        )
+    )
+    return cases
+
+
+def validator_cases():
+    """The field validators run on every create and update."""
+    start, end = date(2025, 3, 3), date(2025, 3, 7)
+    fields = ",".join(EmployeeAbsence.SERIALIZABLE_FIELDS[:5])
+
+    def invalid_service_account():
+        try:
+            validate_service_account("john.doe")
+        except ValidationError:
+            pass
+
+    return [
+        Case(
+            "validate_service_account",
+            lambda: validate_service_account("s.john.doe"),
+            "validators",
+        ),
+        Case(
+            "validate_service_account[invalid]",
+            invalid_service_account,
+            "validators",
+        ),
+        Case(
+            "validate_date_range",
+            lambda: validate_date_range(start, end),
+            "validators",
+        ),
+        Case(
+            "validate_absence_type",
+            lambda: validate_absence_type("Sonstige"),
+            "validators",
+        ),
+        Case(
+            "validate_fields",
+            lambda: validate_fields(fields, EmployeeAbsence.SERIALIZABLE_FIELDS),
+            "validators",
+        ),
+    ]
+
+
+FILTER_SETS = {
+    "none": {},
+    "search": {"service_account": "john", "employee_fullname": "Doe"},
+    "month": {"month": "2025-03"},
+    "year": {"year": "2025"},
+    "date_range": {"start_date": "2025-01-01", "end_date": "2025-06-30"},
+    "all": {
+        "service_account": "john",
+        "employee_fullname": "Doe",
+        "absence_type": "Urlaub",
+        "month": "2025-03",
+    },
+}
+
+
+def query_cases():
+    """AbsenceService._apply_filters() query building (no execution)."""
+    cases = []
+    for name, filters in FILTER_SETS.items():
+
+        def build(filters=filters):
+            return AbsenceService._apply_filters(db.select(EmployeeAbsence), filters)
+
+        cases.append(Case(f"apply_filters[{name}]", build, "query"))
+    return cases
+
+
+def populate(rows, seed=42):
+    """
+    Replace the absences with ``rows`` generated ones (no audit history).
+
+    Args:
+        rows (int): Number of absences to insert
+        seed (int): Random seed
+    """
+    db.session.commit()
+    generate_dataset(db.engine, rows, seed=seed, audit=False, workers=1, replace=True)
+
+
+def dataset_cases(rows):
+    """
+    Cases that query the database; populate(rows) must have run.
+
+    get_statistics is timed through _compute_statistics so the result cache
+    does not turn every run after the first into a dictionary lookup.
+    """
+    label = size_label(rows)
+    service_account, _ = employee_identity(0)
+    latest_end = db.session.execute(
+        db.select(func.max(EmployeeAbsence.end_date)).where(
+            EmployeeAbsence.service_account == service_account
+        )
+    ).scalar_one()
+    taken_start, taken_end = db.session.execute(
+        db.select(EmployeeAbsence.start_date, EmployeeAbsence.end_date)
+        .where(EmployeeAbsence.service_account == service_account)
+        .order_by(EmployeeAbsence.start_date)
+        .limit(1)
+    ).one()
+    free_start = latest_end + timedelta(days=1)
+    free_end = free_start + timedelta(days=4)
+
+    def check_overlap_clear():
+        AbsenceService._check_overlap(
+            service_account, "Urlaub", free_start, free_end
+        )
+
+    def check_overlap_conflict():
+        try:
+            AbsenceService._check_overlap(
+                service_account, "Urlaub", taken_start, taken_end
+            )
+        except ValidationError:
+            pass
+
+    def statistics():
+        AbsenceService._compute_statistics(None)
+        # Do not let the identity map grow across runs
+        db.session.expunge_all()
+
+    return [
+        Case(f"check_overlap[clear,{label}]", check_overlap_clear, "service"),
+        Case(f"check_overlap[conflict,{label}]", check_overlap_conflict, "service"),
+        Case(f"get_statistics[{label}]", statistics, "service"),
+    ]
@@ -0,0 +1,168 @@
+"""Timing, baseline storage and comparison for the benchmark suite."""
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+
+class Case:
+    """A named benchmark: ``func`` is timed, ``setup`` runs once before."""
+
+    def __init__(self, name, func, group, setup=None):
+        self.name = name
+        self.func = func
+        self.group = group
+        self.setup = setup
+
+
+def _time_loops(func, loops):
+    started = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return time.perf_counter() - started
+
+
+def measure(func, repeat=5, min_time=0.1):
+    """
+    Time a function.
+
+    The number of calls per run is calibrated (like ``timeit.autorange``) so a
+    run takes at least ``min_time``; slow functions run once per run. One
+    warmup run is discarded.
+
+    Args:
+        func (callable): Function to time, called without arguments
+        repeat (int): Number of timed runs
+        min_time (float): Minimum duration of one run in seconds
+
+    Returns:
+        dict: Per-call timings in seconds (min, median, mean, stdev, max) plus
+            the number of runs and calls per run
+    """
+    loops = 1
+    while True:
+        elapsed = _time_loops(func, loops)
+        if elapsed >= min_time:
+            break
+        # Aim slightly above min_time instead of doubling blindly
+        loops = max(loops * 2, int(loops * min_time * 1.2 / max(elapsed, 1e-9)))
+
+    timings = [_time_loops(func, loops) / loops for _ in range(repeat)]
+    return {
+        "runs": repeat,
+        "loops": loops,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "stdev": statistics.stdev(timings) if repeat > 1 else 0.0,
+        "max": max(timings),
+    }
+
+
+def run_cases(cases, repeat=5, min_time=0.1, progress=None):
+    """
+    Run benchmark cases in order.
+
+    Args:
+        cases (iterable): Case objects
+        repeat (int): Timed runs per case
+        min_time (float): Minimum duration of one run in seconds
+        progress (callable): Called with (case, result) after each case
+
+    Returns:
+        dict: Case name -> timing result
+    """
+    results = {}
+    for case in cases:
+        if case.setup is not None:
+            case.setup()
+        result = measure(case.func, repeat=repeat, min_time=min_time)
+        result["group"] = case.group
+        results[case.name] = result
+        if progress is not None:
+            progress(case, result)
+    return results
+
+
+def environment():
+    """Describe the machine the results were taken on."""
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def save_results(path, results, metadata=None):
+    """Write results (with environment metadata) as JSON."""
+    document = {
+        "created_at": datetime.utcnow().isoformat(),
+        "environment": environment(),
+        "metadata": metadata or {},
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path):
+    """Read a results file written by save_results()."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results, baseline, tolerance=0.1, min_delta=1e-6):
+    """
+    Compare results with a baseline.
+
+    Medians are compared; a case regresses when its median is more than
+    ``tolerance`` (a fraction) slower than the baseline median and also at
+    least ``min_delta`` seconds slower per call. Cases taking a microsecond or
+    less easily vary by 40% between identical runs (frequency scaling, cache
+    state), so a ratio alone flags noise.
+
+    Args:
+        results (dict): Case name -> timing result
+        baseline (dict): Case name -> timing result of the baseline run
+        tolerance (float): Allowed relative slowdown
+        min_delta (float): Smallest per-call difference (seconds) that counts
+
+    Returns:
+        list: One dict per case with name, ratio and status
+            ("faster", "slower", "same", "regression", "new" or "missing")
+    """
+    rows = []
+    for name in sorted(set(results) | set(baseline)):
+        current = results.get(name)
+        previous = baseline.get(name)
+        if current is None:
+            rows.append({"name": name, "ratio": None, "status": "missing"})
+            continue
+        if previous is None:
+            rows.append({"name": name, "ratio": None, "status": "new"})
+            continue
+
+        ratio = current["median"] / previous["median"]
+        significant = abs(current["median"] - previous["median"]) >= min_delta
+        if ratio > 1 + tolerance and significant:
+            status = "regression"
+        elif ratio < 1 - tolerance and significant:
+            status = "faster"
+        elif ratio > 1:
+            status = "slower"
+        else:
+            status = "same"
+        rows.append({"name": name, "ratio": ratio, "status": status})
+    return rows
+
+
+def format_duration(seconds):
+    """Format a duration with a unit that keeps 3-4 significant digits."""
+    for unit, factor in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * factor >= 1:
+            return f"{seconds * factor:.3g} {unit}"
+    return f"{seconds * 1e9:.3g} ns"
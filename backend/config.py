@@ -10,6 +10,73 @@ class Config:
 
     SECRET_KEY = os.environ.get("SECRET_KEY") or "dev-secret-key-change-in-production"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Directory shared by all worker processes on the host (change generations,
+    # caches, ...). Leave unset to keep that state inside each process.
+    SHARED_STATE_DIR = os.environ.get("SHARED_STATE_DIR")
+    # ETag/Last-Modified revalidation of collections: auto|on|off ("auto" needs
+    # SHARED_STATE_DIR, so every worker sees the same change generations)
+    CONDITIONAL_GETS = os.environ.get("CONDITIONAL_GETS", "auto")
+    # Result cache for absence lists and statistics: auto|memory|file|none
+    # ("auto" uses the shared file cache when SHARED_STATE_DIR is set, else none)
+    RESULT_CACHE_BACKEND = os.environ.get("RESULT_CACHE_BACKEND", "auto")
+    RESULT_CACHE_MAX_ENTRIES = int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", "256"))
+    RESULT_CACHE_TTL = int(os.environ.get("RESULT_CACHE_TTL", "300"))  # seconds
+    # Seconds a request waits for an identical in-flight computation
+    SINGLEFLIGHT_TIMEOUT = float(os.environ.get("SINGLEFLIGHT_TIMEOUT", "10"))
+    # Audit entries younger than this are re-sent by the change feed (seconds)
+    CHANGE_FEED_SAFETY_SECONDS = int(os.environ.get("CHANGE_FEED_SAFETY_SECONDS", "5"))
+    # Fan-out of change events to SSE clients: auto|local|file|postgres
+    # ("auto" uses LISTEN/NOTIFY on PostgreSQL, else the shared file if configured)
+    EVENT_BROKER = os.environ.get("EVENT_BROKER", "auto")
+    EVENT_HEARTBEAT_SECONDS = int(os.environ.get("EVENT_HEARTBEAT_SECONDS", "15"))
+    # Open SSE streams per worker; each one holds a request thread (gthread)
+    EVENT_MAX_STREAMS = int(os.environ.get("EVENT_MAX_STREAMS", "8"))
+    # Maximum number of operations in one POST /api/batch
+    BATCH_MAX_REQUESTS = int(os.environ.get("BATCH_MAX_REQUESTS", "50"))
+    # Inline the /api/bootstrap payload into index.html when serving the SPA
+    SPA_INLINE_BOOTSTRAP = (
+        os.environ.get("SPA_INLINE_BOOTSTRAP", "false").lower() == "true"
+    )
+    # Single-statement UPDATE/DELETE ... RETURNING writes (PostgreSQL only)
+    RETURNING_WRITES = os.environ.get("RETURNING_WRITES", "true").lower() == "true"
+    # Seconds to wait for an employee's write lock (SQLite thread locks only;
+    # PostgreSQL reports deadlocks itself) before answering 409
+    WRITE_LOCK_TIMEOUT = float(os.environ.get("WRITE_LOCK_TIMEOUT", "10"))
+    # Stored responses for Idempotency-Key replays
+    IDEMPOTENCY_TTL = int(os.environ.get("IDEMPOTENCY_TTL", "86400"))
+    # Seconds after which an unfinished claim counts as abandoned (worker killed
+    # before storing the response); keep it above the longest request
+    IDEMPOTENCY_LEASE = int(os.environ.get("IDEMPOTENCY_LEASE", "60"))
+    IDEMPOTENCY_PURGE_BATCH = int(os.environ.get("IDEMPOTENCY_PURGE_BATCH", "500"))
+    IDEMPOTENCY_PURGE_INTERVAL = int(
+        os.environ.get("IDEMPOTENCY_PURGE_INTERVAL", "300")
+    )
+    # Per-request SQL timing: Server-Timing header and slow-query log
+    SQL_INSTRUMENTATION = (
+        os.environ.get("SQL_INSTRUMENTATION", "true").lower() == "true"
+    )
+    SERVER_TIMING = os.environ.get("SERVER_TIMING", "true").lower() == "true"
+    SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "200"))
+    # Executions before psycopg (3) prepares a statement server-side ("off")
+    DB_PREPARE_THRESHOLD = os.environ.get("DB_PREPARE_THRESHOLD", "5")
+    # GET/HEAD requests use read-only sessions, optionally on a replica
+    READ_ONLY_GETS = os.environ.get("READ_ONLY_GETS", "true").lower() == "true"
+    READ_REPLICA_URL = os.environ.get("READ_REPLICA_URL")
+    # Prometheus metrics at /api/metrics (shared via SHARED_STATE_DIR)
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", "1"))
+    # Seconds a /api/ready outcome is reused before the checks run again
+    READINESS_CACHE_SECONDS = float(os.environ.get("READINESS_CACHE_SECONDS", "5"))
+    # Warm pool, statements and static files up at start: background|blocking|off
+    WARMUP = os.environ.get("WARMUP", "background")
+    WARMUP_POOL_CONNECTIONS = int(os.environ.get("WARMUP_POOL_CONNECTIONS", "2"))
+    # Operator diagnostics (profiling, memory tracing) are off without a token
+    ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+    PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_SAMPLE_INTERVAL = float(os.environ.get("PROFILE_SAMPLE_INTERVAL", "0.001"))
+    PROFILE_TOP_N = int(os.environ.get("PROFILE_TOP_N", "20"))
+    PROFILE_DIR = os.environ.get("PROFILE_DIR")
+    MEMORY_MAX_SNAPSHOTS = int(os.environ.get("MEMORY_MAX_SNAPSHOTS", "10"))
 
 
 class DevelopmentConfig(Config):
@@ -26,6 +93,9 @@ class DevelopmentConfig(Config):
         }
     }
     SQLALCHEMY_ECHO = True
+    # The development server runs one process
+    CONDITIONAL_GETS = os.environ.get("CONDITIONAL_GETS", "on")
+    RESULT_CACHE_BACKEND = os.environ.get("RESULT_CACHE_BACKEND", "memory")
     CORS_ORIGINS = (
         os.environ.get("CORS_ORIGINS") or "http://localhost:5173,http://localhost:3000"
     )
@@ -41,6 +111,12 @@ class TestingConfig(Config):
     ) or "sqlite:///:memory:"
     SQLALCHEMY_ECHO = False
     WTF_CSRF_ENABLED = False
+    SHARED_STATE_DIR = None
+    # The test client talks to a single process
+    CONDITIONAL_GETS = "on"
+    RESULT_CACHE_BACKEND = "memory"
+    CHANGE_FEED_SAFETY_SECONDS = 0
+    WARMUP = "off"
     CORS_ORIGINS = "*"
 
 
@@ -0,0 +1,24 @@
+"""Gunicorn settings for production (read automatically from this directory).
+
+    gunicorn "app:create_app('production')"
+
+Threaded workers: an open /api/events stream keeps one request thread busy
+until the tab closes, and a sync worker would be blocked by it entirely (then
+killed by the worker timeout). EVENT_MAX_STREAMS keeps some threads of every
+worker free for the API.
+"""
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", "4"))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "16"))
+# Threaded workers send heartbeats on their own, so long streams are not killed
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+
+
+def child_exit(server, worker):
+    """Keep the metrics counters of an exited worker (see app.utils.metrics)."""
+    from app.utils.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
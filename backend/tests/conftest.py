@@ -51,3 +51,43 @@ def sample_absence(db_session):
     db_session.session.add(absence)
     db_session.session.commit()
     return absence
+
+
+@pytest.fixture
+def admin_client(monkeypatch):
+    """Test client of an app with admin diagnostics enabled (token "secret")."""
+    from config import TestingConfig
+
+    monkeypatch.setattr(TestingConfig, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(TestingConfig, "PROFILE_SAMPLE_RATE", 1.0)
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        yield app.test_client()
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def query_budget(app):
+    """
+    Assert that a block of code runs at most a given number of SQL statements.
+
+    Usage::
+
+        with query_budget(2):
+            client.get("/api/absences")
+    """
+    from contextlib import contextmanager
+    from app.utils.sql_instrumentation import track_queries
+
+    @contextmanager
+    def check(max_queries):
+        with track_queries() as stats:
+            yield stats
+        assert stats.count <= max_queries, (
+            f"{stats.count} queries (budget {max_queries}):\n"
+            + "\n".join(stats.statements)
+        )
+
+    return check
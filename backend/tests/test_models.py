@@ -149,3 +149,17 @@ class TestEmployeeAbsenceModel:
         db_session.session.commit()
 
         assert absence.employee_fullname is None
+
+    def test_to_dict_sparse_fields(self, db_session):
+        """Test that to_dict only serializes the requested fields."""
+        absence = EmployeeAbsence(
+            service_account="s.john.doe",
+            absence_type="Urlaub",
+            start_date=date(2025, 1, 15),
+            end_date=date(2025, 1, 20),
+        )
+        db_session.session.add(absence)
+        db_session.session.commit()
+
+        data = absence.to_dict(fields=("id", "start_date"))
+        assert data == {"id": absence.id, "start_date": "2025-01-15"}
@@ -265,3 +265,1041 @@ class TestAbsenceRoutes:
         data = json.loads(response.data)
         assert len(data["data"]) == 1
         assert data["data"][0]["absence_type"] == "Urlaub"
+
+    def test_get_absences_sparse_fields(self, client, app):
+        """Test limiting the serialized fields of the absence list."""
+        with app.app_context():
+            absence = EmployeeAbsence(
+                service_account="s.john.doe",
+                employee_fullname="John Doe",
+                absence_type="Urlaub",
+                start_date=date(2025, 1, 15),
+                end_date=date(2025, 1, 20),
+            )
+            db.session.add(absence)
+            db.session.commit()
+
+        response = client.get("/api/absences?fields=id,absence_type,start_date")
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert set(data["data"][0]) == {"id", "absence_type", "start_date"}
+        assert data["data"][0]["start_date"] == "2025-01-15"
+
+    def test_get_absences_invalid_field(self, client):
+        """Test that unknown sparse fields are rejected."""
+        response = client.get("/api/absences?fields=id,password")
+        assert response.status_code == 400
+
+    def test_get_absences_columnar_layout(self, client, app):
+        """Test the columnar layout with dictionary-encoded absence types."""
+        with app.app_context():
+            db.session.add_all(
+                [
+                    EmployeeAbsence(
+                        service_account=f"s.employee{i}.test",
+                        absence_type="Urlaub" if i % 2 else "Krankheit",
+                        start_date=date(2025, 1, 15),
+                        end_date=date(2025, 1, 20),
+                    )
+                    for i in range(4)
+                ]
+            )
+            db.session.commit()
+
+        response = client.get(
+            "/api/absences?fields=service_account,absence_type&layout=columnar"
+        )
+        assert response.status_code == 200
+        data = json.loads(response.data)["data"]
+        assert data["layout"] == "columnar"
+        assert data["count"] == 4
+        assert len(data["columns"]["service_account"]) == 4
+        types = data["dictionaries"]["absence_type"]
+        assert sorted(types) == ["Krankheit", "Urlaub"]
+        decoded = [types[i] for i in data["columns"]["absence_type"]]
+        assert decoded.count("Urlaub") == 2
+
+    def test_get_absences_conditional_get(self, client):
+        """Test that a matching If-None-Match is answered with 304."""
+        response = client.get("/api/absences?month=2025-01")
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert etag.startswith('W/"')
+
+        response = client.get(
+            "/api/absences?month=2025-01", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.data == b""
+
+        # A different query gets a different validator
+        response = client.get(
+            "/api/absences?month=2025-02", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+
+    def test_etag_changes_after_write(self, client):
+        """Test that a write invalidates the collection ETags."""
+        absences_etag = client.get("/api/absences").headers["ETag"]
+        stats_etag = client.get("/api/statistics").headers["ETag"]
+        audit_etag = client.get("/api/audit-logs").headers["ETag"]
+
+        payload = {
+            "service_account": "s.john.doe",
+            "absence_type": "Urlaub",
+            "start_date": "2025-01-15",
+            "end_date": "2025-01-20",
+        }
+        response = client.post(
+            "/api/absences",
+            data=json.dumps(payload),
+            content_type="application/json",
+        )
+        assert response.status_code == 201
+
+        response = client.get("/api/absences", headers={"If-None-Match": absences_etag})
+        assert response.status_code == 200
+        assert len(json.loads(response.data)["data"]) == 1
+        response = client.get("/api/statistics", headers={"If-None-Match": stats_etag})
+        assert response.status_code == 200
+        response = client.get("/api/audit-logs", headers={"If-None-Match": audit_etag})
+        assert response.status_code == 200
+
+    def test_failed_write_keeps_etag(self, client):
+        """Test that rejected writes do not invalidate the ETags."""
+        etag = client.get("/api/absences").headers["ETag"]
+
+        payload = {
+            "service_account": "invalid",
+            "absence_type": "Urlaub",
+            "start_date": "2025-01-15",
+            "end_date": "2025-01-20",
+        }
+        client.post(
+            "/api/absences",
+            data=json.dumps(payload),
+            content_type="application/json",
+        )
+
+        response = client.get("/api/absences", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    @pytest.mark.parametrize("shared", [False, True])
+    def test_conditional_gets_need_shared_store(self, monkeypatch, tmp_path, shared):
+        """Test that CONDITIONAL_GETS=auto only sends ETags with SHARED_STATE_DIR."""
+        from app import create_app
+        from config import TestingConfig
+
+        monkeypatch.setattr(TestingConfig, "CONDITIONAL_GETS", "auto")
+        if shared:
+            monkeypatch.setattr(TestingConfig, "SHARED_STATE_DIR", str(tmp_path))
+        app = create_app("testing")
+        with app.app_context():
+            db.create_all()
+            try:
+                response = app.test_client().get("/api/absences")
+                assert response.status_code == 200
+                assert ("ETag" in response.headers) is shared
+            finally:
+                db.session.remove()
+                db.drop_all()
+
+    def test_absence_changes_feed(self, client):
+        """Test the delta-sync feed of created, updated and deleted absences."""
+        response = client.get("/api/absences/changes")
+        assert response.status_code == 200
+        data = json.loads(response.data)["data"]
+        assert data["reset"] is True
+        token = data["token"]
+
+        payloads = [
+            {
+                "service_account": f"s.employee{i}.test",
+                "absence_type": "Urlaub",
+                "start_date": "2025-01-15",
+                "end_date": "2025-01-20",
+            }
+            for i in range(3)
+        ]
+        ids = []
+        for payload in payloads:
+            response = client.post(
+                "/api/absences",
+                data=json.dumps(payload),
+                content_type="application/json",
+            )
+            ids.append(json.loads(response.data)["data"]["id"])
+        client.put(
+            f"/api/absences/{ids[0]}",
+            data=json.dumps({"employee_fullname": "Updated"}),
+            content_type="application/json",
+        )
+        client.delete(f"/api/absences/{ids[1]}")
+
+        response = client.get(f"/api/absences/changes?since={token}")
+        data = json.loads(response.data)["data"]
+        assert data["reset"] is False
+        upserts = {row["id"]: row for row in data["upserts"]}
+        assert set(upserts) == {ids[0], ids[2]}
+        assert upserts[ids[0]]["employee_fullname"] == "Updated"
+        assert data["deleted"] == [ids[1]]
+
+        # Nothing changed since the new token
+        response = client.get(f"/api/absences/changes?since={data['token']}")
+        data = json.loads(response.data)["data"]
+        assert data["upserts"] == []
+        assert data["deleted"] == []
+
+    def test_absence_changes_reset_after_audit_purge(self, client):
+        """Test that tokens older than an audit purge get a full sync."""
+        payload = {
+            "service_account": "s.john.doe",
+            "absence_type": "Urlaub",
+            "start_date": "2025-01-15",
+            "end_date": "2025-01-20",
+        }
+        client.post(
+            "/api/absences", data=json.dumps(payload), content_type="application/json"
+        )
+        token = json.loads(client.get("/api/absences/changes").data)["data"]["token"]
+        response = client.get("/api/absences")
+        absence_id = json.loads(response.data)["data"][0]["id"]
+        client.delete(f"/api/absences/{absence_id}")
+        assert client.delete("/api/audit-logs").status_code == 200
+
+        response = client.get(f"/api/absences/changes?since={token}")
+        data = json.loads(response.data)["data"]
+        assert data["reset"] is True
+        assert data["upserts"] == []
+
+        # The new token only resyncs again after the next purge
+        response = client.get(f"/api/absences/changes?since={data['token']}")
+        assert json.loads(response.data)["data"]["reset"] is False
+
+    def test_absence_changes_invalid_token(self, client):
+        """Test that malformed change tokens are rejected."""
+        response = client.get("/api/absences/changes?since=abc")
+        assert response.status_code == 400
+
+    def test_event_stream_pushes_changes(self, client):
+        """Test that committed writes are pushed to the SSE stream."""
+        response = client.get("/api/events", buffered=False)
+        assert response.status_code == 200
+        assert response.mimetype == "text/event-stream"
+        chunks = iter(response.response)
+        assert next(chunks).startswith(b"retry:")
+
+        payload = {
+            "service_account": "s.john.doe",
+            "absence_type": "Urlaub",
+            "start_date": "2025-01-30",
+            "end_date": "2025-02-03",
+        }
+        created = client.post(
+            "/api/absences",
+            data=json.dumps(payload),
+            content_type="application/json",
+        )
+        absence_id = json.loads(created.data)["data"]["id"]
+
+        chunk = next(chunks).decode()
+        assert chunk.startswith("event: change\n")
+        notice = json.loads(chunk.split("data: ", 1)[1])
+        assert notice == {
+            "entity": "absence",
+            "id": absence_id,
+            "action": "created",
+            "months": ["2025-01", "2025-02"],
+        }
+        response.close()
+
+    def test_event_streams_are_capped(self, client, app):
+        """Test that a worker refuses streams beyond EVENT_MAX_STREAMS."""
+        app.config["EVENT_MAX_STREAMS"] = 1
+        first = client.get("/api/events", buffered=False)
+        assert first.status_code == 200
+
+        refused = client.get("/api/events", buffered=False)
+        assert refused.status_code == 503
+        assert refused.headers["Retry-After"] == "60"
+
+        # Closing a stream frees its slot, even if it was never read
+        first.close()
+        second = client.get("/api/events", buffered=False)
+        assert second.status_code == 200
+        second.close()
+
+    def test_bootstrap_payload(self, client, app):
+        """Test that bootstrap returns types, absences and statistics together."""
+        from app.models.absence_type import AbsenceType
+
+        with app.app_context():
+            db.session.add(
+                AbsenceType(name="Urlaub", name_de="Urlaub", name_en="Vacation")
+            )
+            db.session.add(
+                EmployeeAbsence(
+                    service_account="s.john.doe",
+                    absence_type="Urlaub",
+                    start_date=date(2025, 1, 13),
+                    end_date=date(2025, 1, 17),
+                )
+            )
+            db.session.commit()
+
+        response = client.get("/api/bootstrap?month=2025-01")
+        assert response.status_code == 200
+        data = json.loads(response.data)["data"]
+        assert [t["name"] for t in data["absence_types"]] == ["Urlaub"]
+        assert len(data["absences"]) == 1
+        assert data["statistics"]["total_days"] == 5
+        assert data["filters"] == {"month": "2025-01"}
+
+        data = json.loads(client.get("/api/bootstrap?month=2025-02").data)["data"]
+        assert data["absences"] == []
+
+    def test_bootstrap_defaults_to_current_month(self, client):
+        """Test that bootstrap without filters covers the current month."""
+        data = json.loads(client.get("/api/bootstrap").data)["data"]
+        assert data["filters"] == {"month": date.today().strftime("%Y-%m")}
+
+        data = json.loads(client.get("/api/bootstrap?all=true").data)["data"]
+        assert data["filters"] == {}
+
+    def test_spa_inlines_bootstrap(self, client, app):
+        """Test that index.html can carry the bootstrap payload."""
+        app.config["SPA_INLINE_BOOTSTRAP"] = True
+        response = client.get("/")
+        assert response.status_code == 200
+        html = response.data.decode()
+        assert "window.__ABSENCEHUB_BOOTSTRAP__ = {" in html
+        assert html.index("__ABSENCEHUB_BOOTSTRAP__") < html.index("</head>")
+        # The SPA opens on the current month, not on every absence
+        month = date.today().strftime("%Y-%m")
+        assert f'"filters": {{"month": "{month}"}}' in html
+
+    def test_batch_runs_operations_in_order(self, client):
+        """Test that a batch runs sub-requests in order and returns each result."""
+        payload = {
+            "requests": [
+                {
+                    "method": "POST",
+                    "path": "/api/absences",
+                    "body": {
+                        "service_account": "s.john.doe",
+                        "absence_type": "Urlaub",
+                        "start_date": "2025-01-13",
+                        "end_date": "2025-01-17",
+                    },
+                },
+                {"method": "GET", "path": "/api/absences/1"},
+                {"method": "GET", "path": "/api/statistics?month=2025-01"},
+                {"method": "GET", "path": "/api/absences/999"},
+            ]
+        }
+        response = client.post(
+            "/api/batch", data=json.dumps(payload), content_type="application/json"
+        )
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        statuses = [result["status"] for result in data["data"]]
+        assert statuses == [201, 200, 200, 404]
+        assert data["data"][1]["body"]["data"]["service_account"] == "s.john.doe"
+        assert data["data"][2]["body"]["data"]["total_days"] == 5
+        assert data["success"] is False
+
+    def test_batch_atomic_rolls_back(self, client):
+        """Test that an atomic batch is rolled back when one operation fails."""
+        absence = {
+            "service_account": "s.john.doe",
+            "absence_type": "Urlaub",
+            "start_date": "2025-01-13",
+            "end_date": "2025-01-17",
+        }
+        payload = {
+            "atomic": True,
+            "requests": [
+                {"method": "POST", "path": "/api/absences", "body": absence},
+                {"method": "POST", "path": "/api/absences", "body": absence},
+                {"method": "GET", "path": "/api/absences"},
+            ],
+        }
+        response = client.post(
+            "/api/batch", data=json.dumps(payload), content_type="application/json"
+        )
+        data = json.loads(response.data)
+        assert [result["status"] for result in data["data"]] == [201, 400, 424]
+        assert data["meta"]["rolled_back"] is True
+
+        response = client.get("/api/absences")
+        assert json.loads(response.data)["data"] == []
+
+    def test_batch_rejects_unknown_paths(self, client):
+        """Test that only absence, type and audit routes can be batched."""
+        payload = {
+            "requests": [
+                {"method": "GET", "path": "/api/health"},
+                {"method": "POST", "path": "/api/batch", "body": {}},
+            ]
+        }
+        response = client.post(
+            "/api/batch", data=json.dumps(payload), content_type="application/json"
+        )
+        data = json.loads(response.data)
+        assert [result["status"] for result in data["data"]] == [400, 400]
+
+    def test_batch_rejects_malformed_operations(self, client):
+        """Test that non-object operations fail the batch with 400, not 500."""
+        for operations in ([1], ["GET /api/absences"], [{"method": "GET"}]):
+            response = client.post(
+                "/api/batch",
+                data=json.dumps({"requests": operations}),
+                content_type="application/json",
+            )
+            assert response.status_code == 400
+            assert "requests[0]" in json.loads(response.data)["error"]
+
+    def test_write_lock_timeout_is_a_conflict(self, app, client):
+        """Test that a write lock that never frees up ends in 409, not a hang."""
+        from app.utils.write_locks import _keyed_locks
+
+        app.config["WRITE_LOCK_TIMEOUT"] = 0.05
+        # e.g. held by an atomic batch waiting for a lock this request holds
+        assert _keyed_locks.acquire("s.john.doe")
+        try:
+            response = client.post(
+                "/api/absences",
+                json={
+                    "service_account": "s.john.doe",
+                    "absence_type": "Urlaub",
+                    "start_date": "2025-01-13",
+                    "end_date": "2025-01-17",
+                },
+            )
+        finally:
+            _keyed_locks.release("s.john.doe")
+        assert response.status_code == 409
+        assert len(_keyed_locks) == 0
+        assert EmployeeAbsence.query.count() == 0
+
+    def test_batch_atomic_reads_own_writes(self, client):
+        """Test that reads in an atomic batch see its uncommitted writes."""
+        client.get("/api/statistics?month=2025-01")  # warm the result cache
+        payload = {
+            "atomic": True,
+            "requests": [
+                {
+                    "method": "POST",
+                    "path": "/api/absences",
+                    "body": {
+                        "service_account": "s.john.doe",
+                        "absence_type": "Urlaub",
+                        "start_date": "2025-01-13",
+                        "end_date": "2025-01-17",
+                    },
+                },
+                {"method": "GET", "path": "/api/statistics?month=2025-01"},
+            ],
+        }
+        response = client.post(
+            "/api/batch", data=json.dumps(payload), content_type="application/json"
+        )
+        data = json.loads(response.data)
+        assert data["data"][1]["body"]["data"]["total_days"] == 5
+
+    def test_single_absence_etag_and_if_match(self, client, sample_absence):
+        """Test that PUT/DELETE with a stale If-Match are rejected with 412."""
+        url = f"/api/absences/{sample_absence.id}"
+        response = client.get(url)
+        etag = response.headers["ETag"]
+        assert etag == f'"{sample_absence.id}-1"'
+        assert json.loads(response.data)["data"]["version"] == 1
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+        response = client.put(
+            url,
+            data=json.dumps({"employee_fullname": "John A. Doe"}),
+            content_type="application/json",
+            headers={"If-Match": etag},
+        )
+        assert response.status_code == 200
+        new_etag = response.headers["ETag"]
+        assert new_etag == f'"{sample_absence.id}-2"'
+
+        # A second editor still holding the first version loses
+        response = client.put(
+            url,
+            data=json.dumps({"employee_fullname": "Johnny Doe"}),
+            content_type="application/json",
+            headers={"If-Match": etag},
+        )
+        assert response.status_code == 412
+        response = client.delete(url, headers={"If-Match": etag})
+        assert response.status_code == 412
+        data = json.loads(client.get(url).data)["data"]
+        assert data["employee_fullname"] == "John A. Doe"
+
+        response = client.delete(url, headers={"If-Match": new_etag})
+        assert response.status_code == 200
+
+    def test_absence_type_if_match(self, client, app):
+        """Test that absence type updates honour If-Match."""
+        from app.models.absence_type import AbsenceType
+
+        with app.app_context():
+            absence_type = AbsenceType(name="Kur", name_de="Kur", name_en="Spa")
+            db.session.add(absence_type)
+            db.session.commit()
+            type_id = absence_type.id
+
+        url = f"/api/absence-types/{type_id}"
+        etag = client.get(url).headers["ETag"]
+        body = json.dumps({"color": "#10B981"})
+
+        response = client.put(
+            url, data=body, content_type="application/json", headers={"If-Match": etag}
+        )
+        assert response.status_code == 200
+        response = client.put(
+            url, data=body, content_type="application/json", headers={"If-Match": etag}
+        )
+        assert response.status_code == 412
+
+    def test_idempotency_key_replays_create(self, client, app):
+        """Test that a repeated Idempotency-Key returns the stored response."""
+        body = json.dumps(
+            {
+                "service_account": "s.john.doe",
+                "absence_type": "Urlaub",
+                "start_date": "2025-01-13",
+                "end_date": "2025-01-17",
+            }
+        )
+        headers = {"Idempotency-Key": "create-1"}
+
+        first = client.post(
+            "/api/absences", data=body, content_type="application/json", headers=headers
+        )
+        assert first.status_code == 201
+        retry = client.post(
+            "/api/absences", data=body, content_type="application/json", headers=headers
+        )
+        assert retry.status_code == 201
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert json.loads(retry.data) == json.loads(first.data)
+
+        with app.app_context():
+            assert EmployeeAbsence.query.count() == 1
+
+        # The same key with a different body is an error, not a replay
+        response = client.post(
+            "/api/absences",
+            data=body.replace("2025-01-17", "2025-01-18"),
+            content_type="application/json",
+            headers=headers,
+        )
+        assert response.status_code == 422
+
+    def test_abandoned_idempotency_claim_is_taken_over(self, client, app):
+        """Test that a retry takes over a claim whose request never finished."""
+        from datetime import datetime, timedelta
+        from app.models.idempotency_key import IdempotencyKey
+        from app.utils.idempotency import request_fingerprint
+
+        body = json.dumps(
+            {
+                "service_account": "s.john.doe",
+                "absence_type": "Urlaub",
+                "start_date": "2025-01-13",
+                "end_date": "2025-01-17",
+            }
+        )
+        headers = {"Idempotency-Key": "create-1"}
+        with app.test_request_context(
+            "/api/absences", method="POST", data=body, content_type="application/json"
+        ):
+            fingerprint = request_fingerprint()
+        with app.app_context():
+            # What a worker killed mid-request leaves behind
+            claimed_at = datetime.utcnow() - timedelta(seconds=30)
+            db.session.add(
+                IdempotencyKey(
+                    key="create-1",
+                    request_hash=fingerprint,
+                    created_at=claimed_at,
+                    expires_at=claimed_at + timedelta(days=1),
+                )
+            )
+            db.session.commit()
+
+        response = client.post(
+            "/api/absences", data=body, content_type="application/json", headers=headers
+        )
+        assert response.status_code == 409
+
+        app.config["IDEMPOTENCY_LEASE"] = 10
+        response = client.post(
+            "/api/absences", data=body, content_type="application/json", headers=headers
+        )
+        assert response.status_code == 201
+        assert "Idempotent-Replayed" not in response.headers
+        with app.app_context():
+            assert EmployeeAbsence.query.count() == 1
+
+    def test_idempotency_keys_purged_after_expiry(self, client, app):
+        """Test that expired keys are purged in batches."""
+        from datetime import datetime, timedelta
+        from app.models.idempotency_key import IdempotencyKey
+        from app.utils.idempotency import purge_expired
+
+        with app.app_context():
+            past = datetime.utcnow() - timedelta(days=2)
+            for n in range(5):
+                db.session.add(
+                    IdempotencyKey(
+                        key=f"old-{n}",
+                        request_hash="x",
+                        status_code=201,
+                        response_body="{}",
+                        created_at=past,
+                        expires_at=past + timedelta(days=1),
+                    )
+                )
+            db.session.commit()
+
+            assert purge_expired(batch_size=2) == 5
+            assert IdempotencyKey.query.count() == 0
+
+
+class TestQueryBudgets:
+    """SQL statement budgets per route (cold caches)."""
+
+    @pytest.mark.parametrize(
+        "url,budget",
+        [
+            ("/api/absences", 1),
+            ("/api/absences?month=2025-01&service_account=john", 1),
+            ("/api/absences/{id}", 1),
+            ("/api/statistics?month=2025-01", 1),
+            ("/api/absence-types", 1),
+            ("/api/bootstrap?month=2025-01", 3),
+            ("/api/audit-logs", 2),
+        ],
+    )
+    def test_read_budgets(self, client, sample_absence, query_budget, url, budget):
+        """Test that read routes stay within their query budget."""
+        url = url.format(id=sample_absence.id)
+        with query_budget(budget):
+            response = client.get(url)
+        assert response.status_code == 200
+
+    def test_hot_queries_reuse_compiled_statements(self, client, sample_absence):
+        """Test that list and statistics requests stay above 99% cache hits."""
+        from app.utils.sql_instrumentation import compiled_cache
+
+        # The first request of each kind compiles its statements
+        client.get("/api/absences?month=2019-01&service_account=x")
+        client.get("/api/statistics?month=2019-01&service_account=x")
+        compiled_cache.reset()
+        for month in range(1, 13):
+            for year in range(2020, 2026):
+                # New filter values each time, so the result cache misses
+                filters = f"month={year}-{month:02d}&service_account=j{month}{year}"
+                assert client.get(f"/api/absences?{filters}").status_code == 200
+                assert client.get(f"/api/statistics?{filters}").status_code == 200
+
+        response = client.get("/api/cache/stats")
+        stats = json.loads(response.data)["data"]["compiled_cache"]
+        assert stats["hits"] + stats["misses"] >= 144
+        assert stats["hit_ratio"] > 0.99
+
+    def test_write_budgets(self, client, sample_absence, query_budget):
+        """Test that write routes stay within their query budget."""
+        body = {
+            "service_account": "s.jane.smith",
+            "absence_type": "Urlaub",
+            "start_date": "2025-02-03",
+            "end_date": "2025-02-07",
+        }
+        with query_budget(4):
+            response = client.post(
+                "/api/absences", data=json.dumps(body), content_type="application/json"
+            )
+        assert response.status_code == 201
+        absence_id = json.loads(response.data)["data"]["id"]
+
+        # load, overlap check, UPDATE, audit INSERT, reload after commit
+        with query_budget(5):
+            response = client.put(
+                f"/api/absences/{absence_id}",
+                data=json.dumps({"end_date": "2025-02-10"}),
+                content_type="application/json",
+            )
+        assert response.status_code == 200
+
+        with query_budget(3):
+            response = client.delete(f"/api/absences/{absence_id}")
+        assert response.status_code == 200
+
+    def test_server_timing_header(self, client):
+        """Test that responses report database time in Server-Timing."""
+        response = client.get("/api/absences")
+        timing = response.headers["Server-Timing"]
+        assert timing.startswith("db;dur=")
+        assert 'desc="1 queries"' in timing
+        assert "app;dur=" in timing
+
+    def test_metrics_endpoint(self, client):
+        """Test that request counts are exposed in Prometheus format."""
+        client.get("/api/absences")
+        client.get("/api/absences/999")
+
+        response = client.get("/api/metrics")
+        assert response.status_code == 200
+        assert response.mimetype == "text/plain"
+        text = response.data.decode()
+        assert (
+            'absencehub_http_requests_total{blueprint="absences",'
+            'route="/api/absences",method="GET",status="200"} 1'
+        ) in text
+        route = 'route="/api/absences/<int:absence_id>"'
+        assert f'{route},method="GET",status="404"' in text
+        assert "absencehub_in_flight 1" in text  # the metrics request itself
+
+    def test_readiness_check(self, client, app):
+        """Test that /api/ready reports its checks and caches the outcome."""
+        response = client.get("/api/ready")
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["status"] == "ready"
+        assert data["checks"]["database"]["ok"] is True
+        assert data["cached"] is False
+
+        assert json.loads(client.get("/api/ready").data)["cached"] is True
+
+    def test_readiness_fails_when_database_is_down(self, client, app, monkeypatch):
+        """Test that a failing database makes /api/ready return 503."""
+        from app.utils import readiness
+
+        def broken(engine):
+            raise RuntimeError("connection refused")
+
+        monkeypatch.setattr(readiness, "check_database", broken)
+        response = client.get("/api/ready")
+        assert response.status_code == 503
+        data = json.loads(response.data)
+        assert data["status"] == "not_ready"
+        assert data["checks"]["database"]["error"] == "connection refused"
+        # Liveness does not depend on the database
+        assert client.get("/api/health").status_code == 200
+
+    def test_readiness_waits_for_warmup(self, client, app, sample_absence):
+        """Test that /api/ready is not ready until the warmup finished."""
+        from app.utils.warmup import EXTENSION_KEY, Warmup
+
+        warmup = Warmup(app)
+        app.extensions[EXTENSION_KEY] = warmup
+        response = client.get("/api/ready")
+        assert response.status_code == 503
+        assert json.loads(response.data)["checks"]["warmup"]["state"] == "pending"
+
+        result = warmup.run()
+        assert result["state"] == "done"
+        assert set(result["steps"]) == {"pool", "queries", "absence_types", "static"}
+        assert all(step["ok"] for step in result["steps"].values())
+        assert len(db.engine._compiled_cache) > 0
+        # Finishing the warmup discards the cached "not ready"
+        response = client.get("/api/ready")
+        assert response.status_code == 200
+        assert json.loads(response.data)["checks"]["warmup"]["ok"] is True
+
+    def test_failed_warmup_restarts_on_probe(self, client, app, monkeypatch):
+        """Test that a failed warmup is reported and started again."""
+        from app.utils import warmup as warmup_module
+
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("database is starting up")
+            return {}
+
+        monkeypatch.setattr(warmup_module, "run_hot_queries", flaky)
+        warmup = warmup_module.Warmup(app)
+        app.extensions[warmup_module.EXTENSION_KEY] = warmup
+        assert warmup.run()["state"] == "failed"
+
+        response = client.get("/api/ready")
+        assert response.status_code == 503
+        check = json.loads(response.data)["checks"]["warmup"]
+        assert check["steps"]["queries"]["error"] == "database is starting up"
+
+        warmup._thread.join(timeout=10)
+        assert len(attempts) == 2
+        assert warmup.status()["state"] == "done"
+
+    def test_fork_hook_registered_once_for_live_apps(self, app, monkeypatch):
+        """Test that one fork hook serves every live warmup, not collected ones."""
+        import gc
+        import os
+        import weakref
+
+        from app.utils import warmup as warmup_module
+
+        hooks, forked = [], []
+        monkeypatch.setattr(warmup_module, "_warmups", weakref.WeakSet())
+        monkeypatch.setattr(warmup_module, "_fork_hook_registered", False)
+        monkeypatch.setattr(os, "register_at_fork", lambda **hook: hooks.append(hook))
+        monkeypatch.setattr(
+            warmup_module.Warmup, "after_fork", lambda self: forked.append(self)
+        )
+
+        live = warmup_module.Warmup(app)
+        gone = warmup_module.Warmup(app)
+        warmup_module._track(live)
+        warmup_module._track(gone)
+        del gone
+        gc.collect()
+
+        assert len(hooks) == 1
+        hooks[0]["after_in_child"]()
+        assert forked == [live]
+
+
+class TestProfiling:
+    """Test admin-gated request profiling."""
+
+    def test_profile_switch_requires_admin_token(self, client, admin_client):
+        """Test that ?__profile=1 is ignored without the admin token."""
+        response = client.get("/api/absences?__profile=1")
+        assert json.loads(response.data)["data"] == []
+
+        response = admin_client.get(
+            "/api/absences?__profile=1", headers={"X-Admin-Token": "wrong"}
+        )
+        assert json.loads(response.data)["data"] == []
+
+    def test_cprofile_report(self, admin_client):
+        """Test that an admin request returns a cProfile report."""
+        response = admin_client.get(
+            "/api/statistics?__profile=1", headers={"X-Admin-Token": "secret"}
+        )
+        assert response.status_code == 200
+        report = json.loads(response.data)["data"]
+        assert report["mode"] == "cprofile"
+        assert report["route"] == "GET /api/statistics"
+        assert report["top_cumulative"]
+        assert set(report["focus_ms"]) == {
+            "_apply_filters",
+            "to_dict",
+            "calculate_days",
+            "sql",
+        }
+        assert report["focus_ms"]["sql"] > 0
+
+    def test_profiled_request_bypasses_caches(self, admin_client):
+        """Test that a profiled request does not profile a cache hit."""
+        url = "/api/statistics?month=2025-01"
+        etag = admin_client.get(url).headers["ETag"]
+
+        response = admin_client.get(
+            url + "&__profile=1",
+            headers={"X-Admin-Token": "secret", "If-None-Match": etag},
+        )
+        assert response.status_code == 200
+        report = json.loads(response.data)["data"]
+        assert report["focus_ms"]["sql"] > 0
+        assert report["focus_ms"]["_apply_filters"] > 0
+
+    def test_sampled_profiles_by_route(self, admin_client):
+        """Test that background samples are aggregated per route."""
+        admin_client.get("/api/absences")
+        assert admin_client.get("/api/admin/profiles").status_code == 403
+
+        response = admin_client.get(
+            "/api/admin/profiles", headers={"X-Admin-Token": "secret"}
+        )
+        data = json.loads(response.data)["data"]
+        assert data["GET /api/absences"]["requests"] == 1
+
+
+class TestMemoryTracing:
+    """Test the admin tracemalloc endpoints."""
+
+    def test_snapshot_diff_grouped_by_module(self, admin_client):
+        """Test that snapshot diffs report growth per module group."""
+        headers = {"X-Admin-Token": "secret"}
+        assert admin_client.post("/api/admin/memory/start").status_code == 403
+
+        try:
+            response = admin_client.post(
+                "/api/admin/memory/start", json={"frames": 5}, headers=headers
+            )
+            assert json.loads(response.data)["data"]["tracing"] is True
+
+            response = admin_client.post("/api/admin/memory/snapshots", headers=headers)
+            assert response.status_code == 201
+            first = json.loads(response.data)["data"]["id"]
+
+            for _ in range(3):
+                admin_client.get("/api/statistics?year=2025")
+
+            response = admin_client.get(
+                f"/api/admin/memory/diff?from={first}", headers=headers
+            )
+            assert response.status_code == 200
+            data = json.loads(response.data)["data"]
+            assert data["from"] == first
+            modules = {entry["module"] for entry in data["by_module"]}
+            assert modules & {"app.routes", "app.services", "app.utils"}
+            assert all("site" in entry for entry in data["top_sites"])
+
+            response = admin_client.get(
+                "/api/admin/memory/snapshots/999", headers=headers
+            )
+            assert response.status_code == 404
+        finally:
+            admin_client.post("/api/admin/memory/stop", headers=headers)
+
+
+class TestReadOnlyRequests:
+    """Read-only session policy of GET requests."""
+
+    @pytest.fixture
+    def probe(self, app):
+        """A route reporting the session policy and optionally writing."""
+        from flask import request
+
+        @app.route("/api/test-session", methods=["GET", "POST"])
+        def session_probe():
+            session = db.session()
+            if request.args.get("write"):
+                session.add(
+                    EmployeeAbsence(
+                        service_account="s.read.only",
+                        absence_type="Urlaub",
+                        start_date=date(2025, 3, 3),
+                        end_date=date(2025, 3, 4),
+                    )
+                )
+                session.commit()
+            return {
+                "read_only": session.info.get("read_only", False),
+                "autoflush": session.autoflush,
+                "expire_on_commit": session.expire_on_commit,
+            }
+
+        db.session.commit()  # end the fixture's transaction
+        return app.test_client()
+
+    def test_get_uses_read_only_session(self, probe):
+        """Test that GET turns autoflush and expire-on-commit off."""
+        policy = json.loads(probe.get("/api/test-session").data)
+        assert policy == {
+            "read_only": True,
+            "autoflush": False,
+            "expire_on_commit": False,
+        }
+        # The session is restored for whatever runs after the request
+        assert db.session.autoflush is True
+        assert "read_only" not in db.session.info
+
+        policy = json.loads(probe.post("/api/test-session").data)
+        assert policy["read_only"] is False
+        assert policy["autoflush"] is True
+
+    def test_writes_in_get_are_rejected(self, probe, app):
+        """Test that a GET handler cannot flush changes."""
+        app.config["PROPAGATE_EXCEPTIONS"] = False
+        assert probe.get("/api/test-session?write=1").status_code == 500
+        assert EmployeeAbsence.query.count() == 0
+
+        assert probe.post("/api/test-session?write=1").status_code == 200
+        assert EmployeeAbsence.query.count() == 1
+
+    def test_gets_read_from_replica(self, monkeypatch, tmp_path):
+        """Test that READ_REPLICA_URL serves GET requests, writes go to primary."""
+        from app import create_app
+        from config import TestingConfig
+
+        monkeypatch.setattr(
+            TestingConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path}/p.db"
+        )
+        monkeypatch.setattr(
+            TestingConfig, "READ_REPLICA_URL", f"sqlite:///{tmp_path}/r.db"
+        )
+        monkeypatch.setattr(TestingConfig, "RESULT_CACHE_BACKEND", "none")
+        app = create_app("testing")
+        with app.app_context():
+            db.create_all()
+            replica = app.extensions["read_only"]["replica"]
+            db.metadata.create_all(replica)
+            with replica.begin() as connection:
+                connection.execute(
+                    EmployeeAbsence.__table__.insert().values(
+                        service_account="s.on.replica",
+                        absence_type="Urlaub",
+                        start_date=date(2025, 3, 3),
+                        end_date=date(2025, 3, 4),
+                    )
+                )
+            client = app.test_client()
+
+            created = client.post(
+                "/api/absences",
+                json={
+                    "service_account": "s.on.primary",
+                    "absence_type": "Urlaub",
+                    "start_date": "2025-04-07",
+                    "end_date": "2025-04-08",
+                },
+            )
+            assert created.status_code == 201
+            db.session.remove()  # as at the end of a request's app context
+            listed = json.loads(client.get("/api/absences").data)["data"]
+            assert [row["service_account"] for row in listed] == ["s.on.replica"]
+            assert EmployeeAbsence.query.one().service_account == "s.on.primary"
+            db.session.remove()
+            replica.dispose()
+
+    def test_replica_reads_bypass_caches(self, monkeypatch, tmp_path):
+        """Test that replica reads are neither cached nor given an ETag."""
+        from app import create_app
+        from config import TestingConfig
+
+        monkeypatch.setattr(
+            TestingConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path}/p.db"
+        )
+        monkeypatch.setattr(
+            TestingConfig, "READ_REPLICA_URL", f"sqlite:///{tmp_path}/r.db"
+        )
+        app = create_app("testing")
+        with app.app_context():
+            db.create_all()
+            replica = app.extensions["read_only"]["replica"]
+            db.metadata.create_all(replica)
+            client = app.test_client()
+
+            def replicate(service_account):
+                # Rows reaching the replica do not bump any generation
+                with replica.begin() as connection:
+                    connection.execute(
+                        EmployeeAbsence.__table__.insert().values(
+                            service_account=service_account,
+                            absence_type="Urlaub",
+                            start_date=date(2025, 3, 3),
+                            end_date=date(2025, 3, 4),
+                        )
+                    )
+
+            replicate("s.one")
+            response = client.get("/api/absences")
+            assert "ETag" not in response.headers
+            assert len(json.loads(response.data)["data"]) == 1
+
+            replicate("s.two")
+            response = client.get("/api/absences")
+            assert len(json.loads(response.data)["data"]) == 2
+            db.session.remove()
+            replica.dispose()
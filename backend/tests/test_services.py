@@ -248,3 +248,225 @@ class TestAbsenceService:
 
             assert absence2.id is not None
             assert absence2.service_account == "s.jane.smith"
+
+    def test_statistics_cached_until_write(self, app):
+        """Test that statistics are served from cache until absences change."""
+        from app.utils.result_cache import get_cache
+
+        with app.app_context():
+            cache = get_cache()
+            filters = {"month": "2025-01"}
+
+            assert AbsenceService.get_statistics(filters)["total_days"] == 0
+            assert AbsenceService.get_statistics(dict(filters))["total_days"] == 0
+            assert cache.hits == 1
+            assert cache.misses == 1
+
+            AbsenceService.create(
+                {
+                    "service_account": "s.john.doe",
+                    "absence_type": "Urlaub",
+                    "start_date": date(2025, 1, 13),
+                    "end_date": date(2025, 1, 17),
+                }
+            )
+
+            assert AbsenceService.get_statistics(filters)["total_days"] == 5
+            assert cache.misses == 2
+
+    def test_filters_share_one_cache_key_per_combination(self, app):
+        """Test that filter values never change the compiled cache key."""
+        from sqlalchemy import select
+
+        def statement(filters):
+            return AbsenceService._apply_filters(select(EmployeeAbsence), filters)
+
+        first = statement({"month": "2025-01", "service_account": "john"})
+        second = statement({"month": "2024-12", "service_account": "o'hara%"})
+        assert first._generate_cache_key().key == second._generate_cache_key().key
+        other = statement({"month": "2025-01"})
+        assert first._generate_cache_key().key != other._generate_cache_key().key
+
+    def test_search_matches_wildcards_literally(self, app):
+        """Test that % and _ in a search term are not LIKE wildcards."""
+        with app.app_context():
+            db.session.add_all(
+                [
+                    EmployeeAbsence(
+                        service_account=account,
+                        absence_type="Urlaub",
+                        start_date=date(2025, 1, 15),
+                        end_date=date(2025, 1, 20),
+                    )
+                    for account in ("s.john_doe", "s.johnxdoe")
+                ]
+            )
+            db.session.commit()
+
+            found = AbsenceService.get_all(filters={"service_account": "JOHN_"})
+            assert [a.service_account for a in found] == ["s.john_doe"]
+            assert AbsenceService.get_all(filters={"service_account": "%"}) == []
+
+    def test_invalid_period_filters_are_ignored(self):
+        """Test month and year parsing for the period filter."""
+        from app.services.absence_service import period_bounds
+
+        assert period_bounds({"month": "2024-02"}) == (
+            date(2024, 2, 1),
+            date(2024, 2, 29),
+        )
+        assert period_bounds({"year": "2025", "month": "2025-13"}) is None
+        assert period_bounds({"year": "25x"}) is None
+
+    def test_returning_statements_compile_for_postgresql(self):
+        """Test that the single-statement write path compiles for PostgreSQL."""
+        from sqlalchemy.dialects import postgresql
+        from app.services import absence_pg_writes
+
+        dialect = postgresql.psycopg2.dialect()
+        update_sql = str(absence_pg_writes.UPDATE_RETURNING.compile(dialect=dialect))
+        delete_sql = str(absence_pg_writes.DELETE_RETURNING.compile(dialect=dialect))
+
+        assert "FOR UPDATE" in update_sql
+        assert "RETURNING target.*" in update_sql
+        assert "INSERT INTO audit_logs" in update_sql
+        assert "%(check_overlap)s" in update_sql
+        assert "INSERT INTO audit_logs" in delete_sql
+        # Zero microseconds are left out, as datetime.isoformat() does
+        assert "HH24:MI:SS')" in delete_sql
+        assert "date_trunc('second', deleted.created_at)" in delete_sql
+        assert "'.US'" in delete_sql
+
+    def test_failed_returning_delete_of_unchanged_row_conflicts(
+        self, app, monkeypatch
+    ):
+        """Test that a DELETE matching no row never falls through to success."""
+        from app.services import absence_pg_writes
+        from app.validators.absence_validators import VersionConflictError
+
+        with app.app_context():
+            absence = EmployeeAbsence(
+                service_account="s.john.doe",
+                employee_fullname="John Doe",
+                absence_type="Urlaub",
+                start_date=date(2025, 1, 13),
+                end_date=date(2025, 1, 17),
+            )
+            db.session.add(absence)
+            db.session.commit()
+            # The row was changed and changed back between the two statements
+            monkeypatch.setattr(
+                absence_pg_writes, "delete_returning", lambda *args: None
+            )
+
+            for expected_version in (None, absence.version):
+                with pytest.raises(VersionConflictError):
+                    AbsenceService._delete_returning(absence.id, expected_version)
+            assert db.session.get(EmployeeAbsence, absence.id) is not None
+
+    def test_absence_from_returned_values(self):
+        """Test rebuilding an absence from values returned by the database."""
+        from app.services.absence_pg_writes import absence_from_values
+
+        absence = absence_from_values(
+            {
+                "id": 7,
+                "service_account": "s.john.doe",
+                "employee_fullname": "John Doe",
+                "absence_type": "Urlaub",
+                "start_date": "2025-01-13",
+                "end_date": "2025-01-17",
+                "is_half_day": False,
+                "created_at": "2025-01-01T08:30:00.000000",
+                "updated_at": "2025-01-02T09:00:00.123456",
+            }
+        )
+
+        assert absence.start_date == date(2025, 1, 13)
+        assert absence.calculate_days() == 5
+        assert absence.to_dict()["updated_at"] == "2025-01-02T09:00:00.123456"
+
+
+class TestConcurrentWrites:
+    """Stress tests for concurrent writes to the same employees."""
+
+    def test_parallel_creates_never_overlap(self, tmp_path, monkeypatch):
+        """Test that racing overlapping creates let exactly one absence through."""
+        import threading
+        from itertools import combinations
+        from config import TestingConfig
+        from app import create_app
+
+        # A file database, so every thread gets its own connection
+        monkeypatch.setattr(
+            TestingConfig,
+            "SQLALCHEMY_DATABASE_URI",
+            f"sqlite:///{tmp_path / 'stress.db'}",
+        )
+        app = create_app("testing")
+        with app.app_context():
+            db.create_all()
+
+        employees = [f"s.employee.{n}" for n in range(4)]
+        attempts_per_employee = 6
+        barrier = threading.Barrier(len(employees) * attempts_per_employee)
+        outcomes = []
+
+        def attempt(service_account, offset):
+            with app.app_context():
+                barrier.wait()
+                try:
+                    # Every range of an employee overlaps all the others
+                    AbsenceService.create(
+                        {
+                            "service_account": service_account,
+                            "absence_type": "Urlaub",
+                            "start_date": date(2025, 3, 10 + offset),
+                            "end_date": date(2025, 3, 20 + offset),
+                        }
+                    )
+                    outcomes.append((service_account, "created"))
+                except ValidationError:
+                    outcomes.append((service_account, "rejected"))
+                finally:
+                    db.session.remove()
+
+        threads = [
+            threading.Thread(target=attempt, args=(employee, offset))
+            for employee in employees
+            for offset in range(attempts_per_employee)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+
+        assert len(outcomes) == len(threads)
+        for employee in employees:
+            assert outcomes.count((employee, "created")) == 1
+
+        with app.app_context():
+            absences = EmployeeAbsence.query.all()
+            for a, b in combinations(absences, 2):
+                if a.service_account == b.service_account:
+                    assert a.end_date < b.start_date or b.end_date < a.start_date
+            db.drop_all()
+
+    def test_update_detects_concurrent_modification(self, app, sample_absence):
+        """Test that the conditional UPDATE reports a lost race as a conflict."""
+        from sqlalchemy import text
+        from app.validators.absence_validators import VersionConflictError
+
+        with app.app_context():
+            absence = db.session.get(EmployeeAbsence, sample_absence.id)
+            assert absence.version == 1
+            # Another request updates the row after it was loaded here
+            db.session.execute(
+                text("UPDATE employee_absences SET version = 2 WHERE id = :id"),
+                {"id": absence.id},
+            )
+
+            with pytest.raises(VersionConflictError):
+                AbsenceService.update(
+                    absence.id, {"employee_fullname": "John A. Doe"}, 1
+                )
@@ -0,0 +1,720 @@
+"""Tests for application utilities."""
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from app import db
+from app.models.absence import EmployeeAbsence
+from app.utils.change_tracking import FileGenerationStore, MemoryGenerationStore
+from app.utils.events import (
+    FileBroker,
+    LocalBroker,
+    affected_months,
+    get_broker,
+    queue_event,
+)
+from app.utils.result_cache import FileCacheBackend, MemoryCacheBackend
+from app.utils.singleflight import SingleFlight
+
+
+class TestGenerationStores:
+    """Test suite for change generation stores."""
+
+    def test_memory_store_bump(self):
+        """Test that bumping advances only the given table."""
+        store = MemoryGenerationStore()
+        assert store.get("employee_absences")[0] == 0
+
+        store.bump("employee_absences")
+        assert store.get("employee_absences")[0] == 1
+        assert store.get("absence_types")[0] == 0
+
+    def test_file_store_shared_between_instances(self, tmp_path):
+        """Test that file stores in the same directory see each other's bumps."""
+        writer = FileGenerationStore(str(tmp_path))
+        reader = FileGenerationStore(str(tmp_path))
+        before = reader.get("employee_absences")[0]
+
+        generation = writer.bump("employee_absences")
+        assert generation > before
+        assert reader.get("employee_absences")[0] == generation
+        assert reader.epoch == writer.epoch
+
+
+class TestResultCacheBackends:
+    """Test suite for result cache backends."""
+
+    def test_memory_backend_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.set("a", 1, ttl=60)
+        backend.set("b", 2, ttl=60)
+        assert backend.get("a") == (True, 1)  # "b" is now least recently used
+
+        backend.set("c", 3, ttl=60)
+        assert backend.get("b") == (False, None)
+        assert backend.get("a") == (True, 1)
+        assert backend.get("c") == (True, 3)
+
+    def test_memory_backend_ttl(self):
+        """Test that expired entries are treated as misses."""
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.set("a", 1, ttl=-1)
+        assert backend.get("a") == (False, None)
+        assert len(backend) == 0
+
+    def test_file_backend_shared_between_instances(self, tmp_path):
+        """Test that file backends in the same directory share entries."""
+        writer = FileCacheBackend(str(tmp_path), max_entries=10)
+        reader = FileCacheBackend(str(tmp_path), max_entries=10)
+
+        writer.set("key", {"total_days": 5}, ttl=60)
+        assert reader.get("key") == (True, {"total_days": 5})
+
+    def test_file_backend_prunes_to_max_entries(self, tmp_path):
+        """Test that the file backend keeps at most max_entries files."""
+        backend = FileCacheBackend(str(tmp_path), max_entries=5)
+        for i in range(12):
+            backend.set(f"key{i}", i, ttl=60)
+        assert len(backend) <= 5
+
+    def test_auto_backend_needs_shared_state(self, tmp_path):
+        """Test that "auto" caches in SHARED_STATE_DIR and is off without it."""
+        from flask import Flask
+
+        from app.utils import result_cache
+
+        app = Flask(__name__)
+        app.config["RESULT_CACHE_BACKEND"] = "auto"
+        assert result_cache.init_app(app) is None
+
+        app.config["SHARED_STATE_DIR"] = str(tmp_path)
+        cache = result_cache.init_app(app)
+        assert isinstance(cache.backend, FileCacheBackend)
+
+
+class TestSingleFlight:
+    """Test suite for single-flight request coalescing."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test that identical concurrent calls run the computation once."""
+        flight = SingleFlight(timeout=5)
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return {"total_days": 3}
+
+        results = []
+        leader = threading.Thread(
+            target=lambda: results.append(flight.do("stats", compute))
+        )
+        leader.start()
+        started.wait(5)
+
+        followers = [
+            threading.Thread(target=lambda: results.append(flight.do("stats", compute)))
+            for _ in range(5)
+        ]
+        for thread in followers:
+            thread.start()
+        while flight._calls["stats"].waiters < 5:
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+
+        assert len(calls) == 1
+        assert results == [{"total_days": 3}] * 6
+        assert flight.stats()["executions"] == 1
+        assert flight.stats()["shared"] == 5
+
+    def test_follower_timeout_computes_itself(self):
+        """Test that a follower stops waiting after the timeout."""
+        flight = SingleFlight(timeout=0.01)
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return "leader"
+
+        leader = threading.Thread(target=lambda: flight.do("key", slow))
+        leader.start()
+        started.wait(5)
+
+        assert flight.do("key", lambda: "own") == "own"
+        assert flight.stats()["timeouts"] == 1
+        release.set()
+        leader.join(5)
+
+    def test_leader_error_is_shared(self):
+        """Test that the leader's exception is raised for the caller."""
+        flight = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            flight.do("key", fail)
+        assert flight.stats()["in_flight"] == 0
+
+
+class TestEventBrokers:
+    """Test suite for change event brokers."""
+
+    def test_affected_months(self):
+        """Test that date ranges are expanded to the months they touch."""
+        assert affected_months((date(2024, 12, 30), date(2025, 2, 1))) == [
+            "2024-12",
+            "2025-01",
+            "2025-02",
+        ]
+        assert affected_months((date(2025, 1, 5), date(2025, 1, 6)), (None, None)) == [
+            "2025-01"
+        ]
+
+    def test_local_broker_fan_out(self):
+        """Test that every subscriber receives published notices."""
+        broker = LocalBroker()
+        first, second = broker.subscribe(), broker.subscribe()
+        broker.publish([{"entity": "absence", "id": 1, "action": "created"}])
+
+        assert first.get(timeout=1)["id"] == 1
+        assert second.get(timeout=1)["id"] == 1
+
+        broker.unsubscribe(first)
+        assert broker.subscriber_count() == 1
+
+    def test_file_broker_between_instances(self, tmp_path):
+        """Test that notices published by one process reach another's subscribers."""
+        publisher = FileBroker(str(tmp_path), poll_interval=0.01)
+        listener = FileBroker(str(tmp_path), poll_interval=0.01)
+        subscriber = listener.subscribe()
+        time.sleep(0.05)  # let the tailer record the current end of file
+
+        publisher.publish([{"entity": "absence", "id": 7, "action": "deleted"}])
+        assert subscriber.get(timeout=2) == {
+            "entity": "absence",
+            "id": 7,
+            "action": "deleted",
+        }
+
+    def test_rolled_back_events_not_published(self, app):
+        """Test that notices queued in a rolled back transaction are dropped."""
+        with app.app_context():
+            broker = get_broker()
+            subscriber = broker.subscribe()
+            db.session.add(
+                EmployeeAbsence(
+                    service_account="s.john.doe",
+                    absence_type="Urlaub",
+                    start_date=date(2025, 1, 15),
+                    end_date=date(2025, 1, 20),
+                )
+            )
+            db.session.flush()
+            queue_event("absence", 1, "created", ["2025-01"])
+            db.session.rollback()
+            db.session.commit()
+
+            assert subscriber.empty()
+
+    def test_postgres_broker_notifies_inside_the_transaction(self, app):
+        """Test that PostgreSQL notices are sent before COMMIT, not after it."""
+        from sqlalchemy.dialects import postgresql
+
+        from app.utils import events
+
+        sent = []
+
+        class RecordingBroker(events.PostgresBroker):
+            def publish(self, notices):
+                raise AssertionError("published after the commit")
+
+            def publish_in_transaction(self, session, notices):
+                sent.append((session.in_transaction(), notices))
+
+        with app.app_context():
+            app.extensions[events.EXTENSION_KEY] = RecordingBroker(db.engine)
+            db.session.add(
+                EmployeeAbsence(
+                    service_account="s.john.doe",
+                    absence_type="Urlaub",
+                    start_date=date(2025, 1, 15),
+                    end_date=date(2025, 1, 20),
+                )
+            )
+            queue_event("absence", 1, "created", ["2025-01"])
+            db.session.commit()
+
+        notice = {"entity": "absence", "id": 1, "action": "created"}
+        assert sent == [(True, [dict(notice, months=["2025-01"])])]
+        sql = str(events._NOTIFY.compile(dialect=postgresql.psycopg2.dialect()))
+        assert "unnest(CAST(%(payloads)s AS TEXT[]))" in sql
+
+
+class TestSqlInstrumentation:
+    """Test per-request SQL statistics."""
+
+    def test_track_queries_records_slowest_statement(self, app):
+        """Test that statements are counted and the slowest one is kept."""
+        from sqlalchemy import text
+        from app.utils.sql_instrumentation import track_queries
+
+        with app.app_context():
+            with track_queries() as outer:
+                db.session.execute(text("SELECT 1"))
+                with track_queries() as inner:
+                    db.session.execute(text("SELECT 2"))
+
+            assert outer.count == 2
+            assert inner.count == 1
+            assert inner.slowest_statement == "SELECT 2"
+            assert outer.total_ms >= inner.total_ms
+
+    def test_slow_queries_are_logged(self, app, caplog):
+        """Test that statements above SLOW_QUERY_MS are logged."""
+        from sqlalchemy import text
+
+        with app.app_context():
+            app.config["SLOW_QUERY_MS"] = 0
+            with caplog.at_level("WARNING", logger="app.utils.sql_instrumentation"):
+                db.session.execute(text("SELECT 42"))
+        assert "Slow query" in caplog.text
+        assert "SELECT 42" in caplog.text
+
+    def test_compiled_cache_hit_ratio(self, app):
+        """Test that repeated statements are counted as compiled cache hits."""
+        from sqlalchemy import select
+        from app.utils.sql_instrumentation import compiled_cache
+
+        with app.app_context():
+            compiled_cache.reset()
+            for absence_id in range(1, 101):
+                db.session.execute(
+                    select(EmployeeAbsence).where(EmployeeAbsence.id == absence_id)
+                )
+            db.session.connection().exec_driver_sql("SELECT 1")
+            stats = compiled_cache.to_dict(db.engine)
+
+        assert stats["hits"] + stats["misses"] == 100
+        assert stats["misses"] <= 1
+        assert stats["hit_ratio"] >= 0.99
+        assert stats["uncached"] == 1
+        assert stats["size"] >= 1
+
+    def test_prepared_statements_only_for_psycopg(self):
+        """Test that prepare_threshold is only set for the psycopg driver."""
+        from app.db_utils import configure_prepared_statements
+
+        config = {
+            "SQLALCHEMY_DATABASE_URI": "postgresql+psycopg://db/absencehub",
+            "SQLALCHEMY_ENGINE_OPTIONS": {"connect_args": {"client_encoding": "utf8"}},
+            "DB_PREPARE_THRESHOLD": "2",
+        }
+        assert configure_prepared_statements(config)
+        assert config["SQLALCHEMY_ENGINE_OPTIONS"]["connect_args"] == {
+            "client_encoding": "utf8",
+            "prepare_threshold": 2,
+        }
+
+        config["DB_PREPARE_THRESHOLD"] = "off"
+        configure_prepared_statements(config)
+        connect_args = config["SQLALCHEMY_ENGINE_OPTIONS"]["connect_args"]
+        assert connect_args["prepare_threshold"] is None
+
+        psycopg2 = {"SQLALCHEMY_DATABASE_URI": "postgresql://db/absencehub"}
+        assert not configure_prepared_statements(psycopg2)
+        assert "SQLALCHEMY_ENGINE_OPTIONS" not in psycopg2
+
+
+class TestMetrics:
+    """Test request metrics and their aggregation across workers."""
+
+    def test_bucket_index_is_log_linear(self):
+        """Test that durations fall into buckets within 25% of their value."""
+        from app.utils.metrics import BUCKET_BOUNDS_US, OVERFLOW_BUCKET, bucket_index
+
+        assert bucket_index(10) == 0
+        for duration in (64, 100, 999, 12345, 1_000_000, 30_000_000):
+            index = bucket_index(duration)
+            bound = BUCKET_BOUNDS_US[index]
+            assert duration < bound <= duration * 1.25 + 1
+            assert index == 0 or BUCKET_BOUNDS_US[index - 1] <= duration
+        assert bucket_index(100_000_000) == OVERFLOW_BUCKET
+
+    def test_snapshots_merge_across_workers(self, tmp_path):
+        """Test that counters of all worker snapshots are added up."""
+        from app.utils.metrics import (
+            FileMetricsStore,
+            MetricsRegistry,
+            merge_snapshots,
+            render,
+        )
+
+        store = FileMetricsStore(str(tmp_path))
+        for pid, duration in ((1, 1500), (2, 2500)):
+            registry = MetricsRegistry()
+            registry.observe("absences", "/api/absences", "GET", 200, duration)
+            snapshot = registry.snapshot(counters={"result_cache_hits": 3})
+            snapshot["pid"] = pid
+            store.write(snapshot)
+
+        totals = merge_snapshots(store.read_all())
+        assert totals["requests"][("absences", "/api/absences", "GET", 200)] == 2
+        assert totals["counters"]["result_cache_hits"] == 6
+
+        text = render(totals)
+        assert (
+            'absencehub_http_requests_total{blueprint="absences",'
+            'route="/api/absences",method="GET",status="200"} 2'
+        ) in text
+        assert 'le="+Inf"} 2' in text
+        assert "absencehub_http_request_duration_seconds_sum" in text
+
+    def test_exited_worker_counters_survive_pid_reuse(self, tmp_path):
+        """Test that counters never go down when workers exit or pids repeat."""
+        from app.utils.metrics import (
+            DEAD_WORKERS_FILE,
+            FileMetricsStore,
+            MetricsRegistry,
+            mark_process_dead,
+            merge_snapshots,
+        )
+
+        key = ("absences", "/api/absences", "GET", 200)
+        store = FileMetricsStore(str(tmp_path))
+        for token, requests in (("old", 3), ("new", 1)):
+            # Two processes with the same pid, one after the other
+            registry = MetricsRegistry()
+            for _ in range(requests):
+                registry.observe(*key, 1500)
+            snapshot = registry.snapshot(counters={"result_cache_hits": requests})
+            snapshot.update(pid=1, token=token)
+            store.write(snapshot)
+            if token == "old":
+                mark_process_dead(1, str(tmp_path))
+
+        totals = merge_snapshots(store.read_all())
+        assert totals["requests"][key] == 4
+        assert totals["counters"]["result_cache_hits"] == 4
+        assert sorted(os.listdir(store.directory)) == ["1-new.json", DEAD_WORKERS_FILE]
+
+        mark_process_dead(1, str(tmp_path))
+        totals = merge_snapshots(store.read_all())
+        assert totals["requests"][key] == 4
+        assert os.listdir(store.directory) == [DEAD_WORKERS_FILE]
+
+    def test_event_streams_are_not_metered(self, app):
+        """Test that the SSE stream stays out of in-flight and latency metrics."""
+        from app.utils.metrics import get_metrics
+
+        client = app.test_client()
+        response = client.get("/api/events")
+        assert get_metrics().registry.in_flight == 0
+        assert not any(
+            route == "/api/events" for _, route, _, _ in get_metrics().registry.requests
+        )
+        response.close()
+
+
+class TestBenchmarkHarness:
+    """Test the benchmark timing and baseline comparison."""
+
+    def test_measure_reports_per_call_statistics(self):
+        """Test that measure() calibrates loops and returns per-call timings."""
+        from benchmarks.harness import measure
+
+        result = measure(lambda: sum(range(100)), repeat=3, min_time=0.001)
+        assert result["runs"] == 3
+        assert result["loops"] >= 1
+        assert 0 < result["min"] <= result["median"] <= result["max"]
+
+    def test_compare_flags_regressions_beyond_tolerance(self):
+        """Test that only slowdowns beyond the tolerance count as regressions."""
+        from benchmarks.harness import compare
+
+        baseline = {
+            "steady": {"median": 1.0},
+            "slower": {"median": 1.0},
+            "faster": {"median": 1.0},
+            "gone": {"median": 1.0},
+        }
+        results = {
+            "steady": {"median": 1.05},
+            "slower": {"median": 1.5},
+            "faster": {"median": 0.5},
+            "added": {"median": 1.0},
+        }
+        statuses = {
+            row["name"]: row["status"] for row in compare(results, baseline, 0.1)
+        }
+        assert statuses == {
+            "steady": "slower",
+            "slower": "regression",
+            "faster": "faster",
+            "gone": "missing",
+            "added": "new",
+        }
+
+    def test_compare_ignores_sub_microsecond_noise(self):
+        """Test that tiny absolute slowdowns never count as regressions."""
+        from benchmarks.harness import compare
+
+        baseline = {"tiny": {"median": 1.0e-6}, "small": {"median": 4.0e-6}}
+        results = {"tiny": {"median": 1.43e-6}, "small": {"median": 6.0e-6}}
+        statuses = {
+            row["name"]: row["status"] for row in compare(results, baseline, 0.1)
+        }
+        assert statuses == {"tiny": "slower", "small": "regression"}
+
+    def test_populate_builds_non_overlapping_absences(self, app):
+        """Test that the benchmark dataset respects the overlap rule."""
+        from benchmarks.cases import populate
+
+        populate(200, seed=1)
+        rows = (
+            EmployeeAbsence.query.order_by(
+                EmployeeAbsence.service_account, EmployeeAbsence.start_date
+            ).all()
+        )
+        assert len(rows) == 200
+        for previous, current in zip(rows, rows[1:]):
+            if previous.service_account == current.service_account:
+                assert current.start_date > previous.end_date
+
+
+class TestDataGenerator:
+    """Test the synthetic benchmark data generator."""
+
+    START = date(2024, 1, 1)
+    END = date(2024, 12, 31)
+
+    def test_output_does_not_depend_on_chunking(self):
+        """Test that employees get the same rows however work is split."""
+        from app.utils.data_generator import generate_chunk, plan_employees
+
+        plan = plan_employees(300, employees=10)
+        whole = generate_chunk(7, plan, self.START, self.END)
+        split = [
+            generate_chunk(7, plan[i:i + 3], self.START, self.END)
+            for i in range(0, len(plan), 3)
+        ]
+        assert whole[0] == [row for part in split for row in part[0]]
+        assert whole[1] == [row for part in split for row in part[1]]
+        assert generate_chunk(8, plan, self.START, self.END)[0] != whole[0]
+
+    def test_employee_sequences_do_not_overlap(self):
+        """Test that each employee's absences are chronological and disjoint."""
+        from app.utils.data_generator import generate_chunk, plan_employees
+
+        plan = plan_employees(400, employees=8)
+        absences, audits = generate_chunk(3, plan, self.START, self.END)
+
+        assert len(absences) == 400
+        assert len({row["id"] for row in absences}) == 400
+        by_employee = {}
+        for row in absences:
+            by_employee.setdefault(row["service_account"], []).append(row)
+            if row["is_half_day"]:
+                assert row["start_date"] == row["end_date"]
+        assert len(by_employee) == 8
+        for rows in by_employee.values():
+            for previous, current in zip(rows, rows[1:]):
+                assert current["start_date"] > previous["end_date"]
+
+        # Every absence has a CREATE; cancelled ones also a DELETE
+        created = {a["entity_id"] for a in audits if a["action"] == "CREATE"}
+        deleted = {a["entity_id"] for a in audits if a["action"] == "DELETE"}
+        assert created == {row["id"] for row in absences} | deleted
+        assert not deleted & {row["id"] for row in absences}
+
+    def test_generate_dataset_writes_rows(self, app):
+        """Test that the generated dataset is written to the database."""
+        from app.models.audit_log import AuditLog
+        from app.utils.data_generator import generate_dataset
+
+        result = generate_dataset(db.engine, 120, seed=1, workers=1)
+
+        assert result["absences"] == EmployeeAbsence.query.count() == 120
+        assert result["audit_logs"] == AuditLog.query.count()
+        assert result["audit_logs"] >= 120
+
+    def test_copy_rows_formats_csv_for_copy(self):
+        """Test the COPY payload: NULL as empty field, t/f booleans, JSON."""
+        from app.utils.data_generator import copy_rows
+
+        class Cursor:
+            def __init__(self, sink):
+                self.sink = sink
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def copy_expert(self, sql, buffer):
+                self.sink.append((sql, buffer.read()))
+
+        class Connection:
+            def __init__(self):
+                self.copied = []
+
+            def cursor(self):
+                return Cursor(self.copied)
+
+        connection = Connection()
+        copy_rows(
+            connection,
+            "audit_logs",
+            ("entity_id", "new_values", "flag", "day"),
+            [
+                {
+                    "entity_id": None,
+                    "new_values": {"a": 1},
+                    "flag": True,
+                    "day": date(2025, 1, 2),
+                }
+            ],
+        )
+        sql, payload = connection.copied[0]
+        assert sql.startswith('COPY audit_logs ("entity_id", "new_values"')
+        assert payload == ',"{""a"": 1}",t,2025-01-02\r\n'
+
+    def test_copy_rows_uses_psycopg3_copy(self):
+        """Test that psycopg 3 cursors (no copy_expert) stream via cursor.copy."""
+        from app.utils.data_generator import copy_rows
+
+        class Copy:
+            def __init__(self, sink, sql):
+                self.sink = sink
+                self.sql = sql
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def write(self, data):
+                self.sink.append((self.sql, data))
+
+        class Cursor:
+            def __init__(self, sink):
+                self.sink = sink
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def copy(self, sql):
+                return Copy(self.sink, sql)
+
+        class Connection:
+            def __init__(self):
+                self.copied = []
+
+            def cursor(self):
+                return Cursor(self.copied)
+
+        connection = Connection()
+        copy_rows(connection, "audit_logs", ("entity_id",), [{"entity_id": 7}])
+        sql, payload = connection.copied[0]
+        assert sql.startswith('COPY audit_logs ("entity_id")')
+        assert payload == "7\r\n"
+
+
+class TestStartup:
+    """Test what a cold start imports and how long it takes."""
+
+    # Generous: a cold start is ~0.5s on a laptop, CI machines are slower
+    STARTUP_BUDGET_SECONDS = 5.0
+    # Only CLI commands and admin tools need these
+    DEFERRED_MODULES = (
+        "flask_migrate",
+        "alembic",
+        "mako",
+        "faker",
+        "psycopg2",
+        "cProfile",
+        "app.utils.seed_data",
+        "app.utils.data_generator",
+        "app.utils.import_time",
+    )
+    SCRIPT = (
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        "from app import create_app, db\n"
+        "app = create_app('testing')\n"
+        "with app.app_context():\n"
+        "    db.create_all()\n"
+        "status = app.test_client().get('/api/health').status_code\n"
+        "print(json.dumps({'seconds': time.perf_counter() - started,\n"
+        "                  'status': status, 'modules': sorted(sys.modules)}))\n"
+    )
+
+    def _cold_start(self):
+        env = dict(os.environ, FLASK_ENV="testing")
+        env.pop("TEST_DATABASE_URL", None)
+        result = subprocess.run(
+            [sys.executable, "-c", self.SCRIPT],
+            cwd=Path(__file__).resolve().parents[1],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=60,
+        )
+        return json.loads(result.stdout.splitlines()[-1])
+
+    def test_cold_start_skips_cli_only_modules(self):
+        """Test that serving a request does not import CLI and admin modules."""
+        started = self._cold_start()
+        assert started["status"] == 200
+        loaded = set(started["modules"])
+        assert [name for name in self.DEFERRED_MODULES if name in loaded] == []
+
+    def test_time_to_first_request_within_budget(self):
+        """Test that creating the app and serving a request stays fast."""
+        seconds = min(self._cold_start()["seconds"] for _ in range(2))
+        assert seconds < self.STARTUP_BUDGET_SECONDS
+
+    def test_parse_importtime(self):
+        """Test that import times are parsed and grouped by package."""
+        from app.utils.import_time import parse_importtime, summarize
+
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |     sqlalchemy.sql\n"
+            "import time:       300 |        400 |   sqlalchemy\n"
+            "import time:        50 |        450 | app\n"
+            "ImportError noise\n"
+        )
+        records = parse_importtime(output)
+        assert [(r["module"], r["depth"]) for r in records] == [
+            ("sqlalchemy.sql", 2),
+            ("sqlalchemy", 1),
+            ("app", 0),
+        ]
+        report = summarize(records, top=1)
+        assert report["total_ms"] == 0.5
+        assert report["packages"] == [
+            {"package": "sqlalchemy", "ms": 0.4, "share": 0.889, "modules": 2}
+        ]
+        assert report["slowest_modules"] == [{"module": "sqlalchemy", "ms": 0.3}]
@@ -5,6 +5,7 @@ from app.validators.absence_validators import (
     validate_service_account,
     validate_date_range,
     validate_absence_type,
+    validate_fields,
     ValidationError,
 )
 
@@ -96,3 +97,22 @@ class TestAbsenceTypeValidation:
         """Test that None absence type fails."""
         with pytest.raises(ValidationError):
             validate_absence_type(None)
+
+
+class TestFieldsValidation:
+    """Test suite for sparse fieldset validation."""
+
+    def test_fields_not_provided(self):
+        """Test that a missing fieldset means all fields."""
+        assert validate_fields(None, ("id", "start_date")) is None
+        assert validate_fields("", ("id", "start_date")) is None
+
+    def test_fields_parsed_in_order(self):
+        """Test that fields keep request order and drop duplicates."""
+        fields = validate_fields("start_date, id,start_date", ("id", "start_date"))
+        assert fields == ("start_date", "id")
+
+    def test_unknown_field(self):
+        """Test that unknown fields fail."""
+        with pytest.raises(ValidationError, match="Invalid field"):
+            validate_fields("id,secret", ("id", "start_date"))
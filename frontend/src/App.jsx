@@ -1,13 +1,14 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { t, getLanguage, setLanguage, getAvailableLanguages } from './utils/i18n';
 import {
   getAllAbsences,
+  getBootstrap,
   getStatistics,
   createAbsence,
   updateAbsence,
   deleteAbsence,
+  subscribeToChanges,
 } from './services/absenceApi';
-import { getAllAbsenceTypes } from './services/absenceTypeApi';
 import AbsenceForm from './components/AbsenceForm';
 import AbsenceList from './components/AbsenceList';
 import AbsenceFilters from './components/AbsenceFilters';
@@ -17,6 +18,12 @@ import AuditLogViewer from './components/AuditLogViewer';
 import OverlapErrorModal from './components/OverlapErrorModal';
 import './App.css';
 
+// The SPA opens on the current month, so the first page does not grow with the dataset
+const currentMonth = () => {
+  const now = new Date();
+  return `${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, '0')}`;
+};
+
 function App() {
   const [currentView, setCurrentView] = useState('list'); // 'list', 'calendar', 'settings', 'audit'
   const [absences, setAbsences] = useState([]);
@@ -28,10 +35,12 @@ function App() {
   const [currentLanguage, setCurrentLanguage] = useState(getLanguage());
   const [showForm, setShowForm] = useState(false);
   const [editingAbsence, setEditingAbsence] = useState(null);
-  const [filters, setFilters] = useState({});
+  const [filters, setFilters] = useState(() => ({ month: currentMonth() }));
   const [formLoading, setFormLoading] = useState(false);
   const [lastModifiedId, setLastModifiedId] = useState(null);
   const [overlapError, setOverlapError] = useState(null);
+  // The initial (current month) data comes from the bootstrap payload
+  const skipInitialFilterFetch = useRef(true);
 
   // Fetch initial data and sync HTML lang attribute
   useEffect(() => {
@@ -42,6 +51,11 @@ function App() {
 
   // Fetch absences and statistics when filters change
   useEffect(() => {
+    if (skipInitialFilterFetch.current) {
+      skipInitialFilterFetch.current = false;
+      return;
+    }
+
     const fetchFiltered = async () => {
       try {
         setLoading(true);
@@ -65,21 +79,37 @@ function App() {
     fetchFiltered();
   }, [filters]);
 
+  // Refetch only when another client changes absences in the visible range
+  useEffect(() => {
+    const unsubscribe = subscribeToChanges((notice) => {
+      if (notice.entity !== 'absence') return;
+      const months = notice.months || [];
+      if (filters.month && !months.includes(filters.month)) return;
+      if (filters.year && !months.some((month) => month.startsWith(`${filters.year}-`))) return;
+      refreshData();
+    });
+    return unsubscribe;
+  }, [filters]);
+
   const fetchData = async () => {
     try {
       setLoading(true);
       setError(null);
 
-      const [absencesRes, typesRes, statsRes] = await Promise.all([
-        getAllAbsences(),
-        getAllAbsenceTypes(true), // Get from database
-        getStatistics(),
-      ]);
+      // Use the payload inlined into index.html when the server provides it,
+      // otherwise fetch types, absences and statistics in a single request
+      let bootstrap = window.__ABSENCEHUB_BOOTSTRAP__;
+      delete window.__ABSENCEHUB_BOOTSTRAP__;
+      // The inlined payload uses the server's date, which can be a month off
+      if (!bootstrap || bootstrap.filters?.month !== filters.month) {
+        const bootstrapRes = await getBootstrap(filters);
+        bootstrap = bootstrapRes.data?.data || {};
+      }
 
-      setAbsences(absencesRes.data?.data || []);
+      setAbsences(bootstrap.absences || []);
 
       // Format types for compatibility with existing code
-      const types = (typesRes.data?.data || []).map(type => ({
+      const types = (bootstrap.absence_types || []).map(type => ({
         value: type.name,
         label: currentLanguage === 'de' ? type.name_de : type.name_en,
         color: type.color,
@@ -87,7 +117,7 @@ function App() {
       }));
       setAbsenceTypes(types);
 
-      setStatistics(statsRes.data?.data || null);
+      setStatistics(bootstrap.statistics || null);
     } catch (err) {
       setError(t('message.loadingError'));
       console.error('Error fetching data:', err);
@@ -103,6 +103,7 @@ export default function AuditLogViewer() {
       CREATE: t('audit.action.create'),
       UPDATE: t('audit.action.update'),
       DELETE: t('audit.action.delete'),
+      PURGE: t('audit.action.purge'),
     };
     return labels[action] || action;
   };
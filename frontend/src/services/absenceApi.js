@@ -231,12 +231,41 @@ export const getAllAbsences = (filters = {}) => {
   return api.get('/absences', { params: filters });
 };
 
+/**
+ * Get absence types, absences and statistics in one request.
+ * Pass { all: true } for every absence (default: current month) or any list filters.
+ */
+export const getBootstrap = (params = {}) => {
+  return api.get('/bootstrap', { params });
+};
+
+/**
+ * Get absences changed since a change-feed token (omit `since` for a full sync).
+ * Returns { upserts, deleted, token, reset }; pass `token` back on the next call.
+ */
+export const getAbsenceChanges = (since) => {
+  return api.get('/absences/changes', { params: since ? { since } : {} });
+};
+
 export const getAbsenceById = (id) => {
   return api.get(`/absences/${id}`);
 };
 
+/**
+ * New Idempotency-Key for one logical create; fallback-port retries reuse the
+ * request config (and so the key), letting the backend replay the first result.
+ */
+function newIdempotencyKey() {
+  if (typeof crypto !== 'undefined' && crypto.randomUUID) {
+    return crypto.randomUUID();
+  }
+  return `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+}
+
 export const createAbsence = (data) => {
-  return api.post('/absences', data);
+  return api.post('/absences', data, {
+    headers: { 'Idempotency-Key': newIdempotencyKey() },
+  });
 };
 
 export const updateAbsence = (id, data) => {
@@ -256,6 +285,45 @@ export const getStatistics = (filters = {}) => {
   return api.get('/statistics', { params: filters });
 };
 
+// Wait before reopening a stream the server refused (503: too many streams)
+const EVENT_STREAM_RETRY_MS = 60000;
+
+/**
+ * Subscribe to server-pushed change notices (Server-Sent Events).
+ * `onChange` receives { entity, id, action, months }. Returns an unsubscribe function.
+ */
+export const subscribeToChanges = (onChange) => {
+  if (typeof EventSource === 'undefined') {
+    return () => {};
+  }
+  let source = null;
+  let retryTimer = null;
+
+  const open = () => {
+    source = new EventSource(`${API_BASE_URL}/events`);
+    source.addEventListener('change', (event) => {
+      try {
+        onChange(JSON.parse(event.data));
+      } catch (error) {
+        console.warn('Ignoring malformed change event:', error);
+      }
+    });
+    source.addEventListener('error', () => {
+      // EventSource reconnects by itself after network errors, but gives up
+      // for good on an error status such as 503
+      if (source.readyState === EventSource.CLOSED) {
+        retryTimer = setTimeout(open, EVENT_STREAM_RETRY_MS);
+      }
+    });
+  };
+
+  open();
+  return () => {
+    clearTimeout(retryTimer);
+    source.close();
+  };
+};
+
 // Health check
 export const healthCheck = () => {
   return api.get('/health');
@@ -168,6 +168,7 @@ const translations = {
     'audit.action.create': 'Created',
     'audit.action.update': 'Updated',
     'audit.action.delete': 'Deleted',
+    'audit.action.purge': 'Logs deleted',
     'audit.showing': 'Showing {returned} of {total} records',
     'audit.loading': 'Loading records...',
     'audit.error': 'Failed to load audit logs. Please try again.',
@@ -349,6 +350,7 @@ const translations = {
     'audit.action.create': 'Erstellt',
     'audit.action.update': 'Aktualisiert',
     'audit.action.delete': 'Gelöscht',
+    'audit.action.purge': 'Protokolle gelöscht',
     'audit.showing': '{returned} von {total} Einträgen angezeigt',
     'audit.loading': 'Einträge werden geladen...',
     'audit.error': 'Fehler beim Laden der Auditprotokolle. Bitte versuchen Sie es erneut.',
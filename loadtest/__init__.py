@@ -0,0 +1,13 @@
+"""Scenario-based HTTP load test for the AbsenceHub backend.
+
+Run from the project root (no packages beyond the backend's are needed)::
+
+    python -m loadtest                        # local backend, 10k absences
+    python -m loadtest --rows 1000000 --users 50 --duration 60
+    python -m loadtest --url http://localhost:5000 --think-scale 0
+    python -m loadtest --output run.json --baseline previous.json
+
+Virtual users replay calendar browsing, filter typing, create/update/delete
+and statistics polling; p50/p95/p99 latency and throughput are reported per
+endpoint.
+"""
@@ -0,0 +1,158 @@
+"""Command line entry point: ``python -m loadtest``."""
+import argparse
+import asyncio
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+# Allow running from outside the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loadtest.runner import month_range, parse_mix, run_load  # noqa: E402
+from loadtest.scenarios import DEFAULT_MIX  # noqa: E402
+from loadtest.server import local_backend  # noqa: E402
+from loadtest.stats import compare, load_report, save_report  # noqa: E402
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description=__doc__)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Base URL of a running backend")
+    target.add_argument(
+        "--rows",
+        type=int,
+        default=10000,
+        help="Start a local backend on this many generated absences (default)",
+    )
+    parser.add_argument(
+        "--database-url",
+        help="Database of the local backend (default: temporary SQLite file)",
+    )
+    parser.add_argument("--users", type=int, default=20, help="Virtual users")
+    parser.add_argument(
+        "--duration", type=float, default=30, help="Seconds after ramp-up"
+    )
+    parser.add_argument(
+        "--ramp-up", type=float, default=5, help="Seconds to start all users"
+    )
+    parser.add_argument(
+        "--mix",
+        default=DEFAULT_MIX,
+        help=f"Scenario weights (default: {DEFAULT_MIX})",
+    )
+    parser.add_argument(
+        "--think-scale",
+        type=float,
+        default=1.0,
+        help="Multiplier for think times; 0 sends requests back to back",
+    )
+    parser.add_argument(
+        "--months",
+        default="2020-01:2025-12",
+        help="Months users browse, FIRST:LAST (default matches generated data)",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=30, help="Request timeout")
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    parser.add_argument("--baseline", help="Compare with this earlier report")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed p95/throughput change before an endpoint regresses",
+    )
+    return parser.parse_args(argv)
+
+
+def print_summary(summary):
+    """Print the per-endpoint table."""
+    header = (
+        f"{'endpoint':<36} {'reqs':>7} {'err':>5} {'req/s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for endpoint, row in summary.items():
+        if endpoint == "TOTAL":
+            print("-" * len(header))
+
+        def cell(value):
+            return f"{value:.1f}" if value is not None else "-"
+
+        print(
+            f"{endpoint:<36} {row['requests']:>7} {row['errors']:>5} "
+            f"{cell(row['rps']):>8} {cell(row['p50_ms']):>8} "
+            f"{cell(row['p95_ms']):>8} {cell(row['p99_ms']):>8}"
+        )
+
+
+def main(argv=None):
+    """Run the load test; returns the process exit code."""
+    args = parse_args(argv)
+    mix = parse_mix(args.mix)
+    first, _, last = args.months.partition(":")
+    settings = {
+        "users": args.users,
+        "duration": args.duration,
+        "ramp_up": args.ramp_up,
+        "mix": mix,
+        "seed": args.seed,
+        "months": month_range(first, last or first),
+        "think_scale": args.think_scale,
+        "timeout": args.timeout,
+    }
+
+    async def run(url):
+        return await run_load(url, **settings)
+
+    if args.url:
+        target = {"url": args.url}
+        recorder, elapsed, plan = asyncio.run(run(args.url))
+    else:
+        print(f"Starting a local backend on {args.rows} generated absences...")
+        with local_backend(args.rows, args.seed, args.database_url) as backend:
+            print(f"Backend ready in {backend.startup_seconds:.2f}s at {backend.url}")
+            target = {"rows": args.rows, "startup_seconds": backend.startup_seconds}
+            recorder, elapsed, plan = asyncio.run(run(backend.url))
+
+    summary = recorder.summary(elapsed)
+    counts = sorted(Counter(plan).items())
+    users = ", ".join(f"{name}={count}" for name, count in counts)
+    print(f"\n{args.users} users ({users}) for {elapsed:.1f}s\n")
+    print_summary(summary)
+
+    config = dict(settings, months=args.months, target=target)
+    if args.output:
+        save_report(args.output, summary, config)
+        print(f"\nReport written to {args.output}")
+
+    if args.baseline:
+        if not os.path.exists(args.baseline):
+            print(f"\nNo baseline at {args.baseline}")
+            return 2
+        baseline = load_report(args.baseline)
+        comparable = ("users", "duration", "ramp_up", "mix", "think_scale", "months")
+        changed = [
+            key
+            for key in comparable
+            if baseline["config"].get(key) != config.get(key)
+        ]
+        if changed:
+            print(f"\nWarning: settings differ from the baseline: {', '.join(changed)}")
+        rows = compare(summary, baseline["endpoints"], args.tolerance)
+        print(f"\nComparison with {args.baseline} (tolerance {args.tolerance:.0%}):")
+        for row in rows:
+            p95 = f"{row['p95']:.2f}x" if row["p95"] is not None else "-"
+            rps = f"{row['rps']:.2f}x" if row["rps"] is not None else "-"
+            print(
+                f"  {row['endpoint']:<36} p95 {p95:>7}  req/s {rps:>7}  {row['status']}"
+            )
+        if any(row["status"] == "regression" for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
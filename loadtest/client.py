@@ -0,0 +1,132 @@
+"""Minimal asyncio HTTP/1.1 client with keep-alive (no third-party packages)."""
+import asyncio
+import json
+from urllib.parse import urlencode, urlsplit
+
+
+class Response:
+    """Status, headers (lower-case names) and body of one response."""
+
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        """Decode the body as JSON (None if it is not JSON)."""
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            return None
+
+
+class HttpClient:
+    """One keep-alive connection to the backend, as a browser tab would use."""
+
+    def __init__(self, base_url, timeout=30.0):
+        parts = urlsplit(base_url)
+        if parts.scheme != "http":
+            raise ValueError("Only http:// URLs are supported")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._reader = None
+        self._writer = None
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.open_connection(
+            self.host, self.port
+        )
+
+    async def close(self):
+        """Close the connection."""
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+        self._reader = self._writer = None
+
+    async def request(self, method, path, params=None, json_body=None, headers=None):
+        """
+        Send a request and read the complete response.
+
+        A connection the server closed in the meantime is reopened once.
+
+        Args:
+            method (str): HTTP method
+            path (str): Path below the base URL, e.g. "/api/absences"
+            params (dict): Query string parameters
+            json_body: Object sent as a JSON body
+            headers (dict): Additional request headers
+
+        Returns:
+            Response: The response
+        """
+        target = self.prefix + path
+        if params:
+            target += "?" + urlencode(params)
+        body = b"" if json_body is None else json.dumps(json_body).encode("utf-8")
+        lines = [
+            f"{method} {target} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Accept: application/json",
+            f"Content-Length: {len(body)}",
+        ]
+        if json_body is not None:
+            lines.append("Content-Type: application/json")
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+        for attempt in (1, 2):
+            fresh = self._writer is None
+            if fresh:
+                await self._connect()
+            try:
+                self._writer.write(payload)
+                await self._writer.drain()
+                return await asyncio.wait_for(self._read_response(), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                # Only a reused connection may have gone stale
+                if fresh or attempt == 2:
+                    raise
+
+    async def _read_response(self):
+        head = await self._reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        status = int(status_line.split(" ", 2)[1])
+        headers = {}
+        for line in header_lines:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in headers:
+            body = await self._reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await self._read_chunked()
+        else:
+            body = await self._reader.read()
+            headers["connection"] = "close"
+
+        if headers.get("connection", "").lower() == "close" or status_line.startswith(
+            "HTTP/1.0"
+        ):
+            await self.close()
+        return Response(status, headers, body)
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self._reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            if size == 0:
+                # Skip trailers up to the final empty line
+                while await self._reader.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                return b"".join(chunks)
+            chunks.append(await self._reader.readexactly(size))
+            await self._reader.readexactly(2)
@@ -0,0 +1,115 @@
+"""Drive virtual users through the scenario mix for a fixed duration."""
+import asyncio
+import random
+import time
+
+from loadtest.client import HttpClient
+from loadtest.scenarios import SCENARIOS, VirtualUser
+from loadtest.stats import Recorder
+
+
+def parse_mix(text):
+    """
+    Parse a scenario mix such as ``calendar=4,crud=1``.
+
+    Returns:
+        dict: Scenario name -> weight
+
+    Raises:
+        ValueError: For unknown scenarios or invalid weights
+    """
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.strip().partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(
+                f"Unknown scenario '{name}'. Available: {', '.join(SCENARIOS)}"
+            )
+        mix[name] = float(weight or 1)
+        if mix[name] < 0:
+            raise ValueError(f"Negative weight for scenario '{name}'")
+    if not any(mix.values()):
+        raise ValueError("The scenario mix needs at least one positive weight")
+    return mix
+
+
+def month_range(first, last):
+    """List the months from ``first`` to ``last`` (both YYYY-MM)."""
+    year, month = map(int, first.split("-"))
+    end = tuple(map(int, last.split("-")))
+    months = []
+    while (year, month) <= end:
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def assign_scenarios(users, mix):
+    """
+    Give every user a scenario so the counts follow the mix weights.
+
+    Deterministic: the same user count and mix always yield the same plan.
+    """
+    total = sum(mix.values())
+    plan = []
+    for number in range(users):
+        # Largest deficit first (like apportioning seats)
+        name = max(
+            mix,
+            key=lambda candidate: mix[candidate] / total * (number + 1)
+            - plan.count(candidate),
+        )
+        plan.append(name)
+    return plan
+
+
+async def _user_loop(user, scenario, deadline, start_delay):
+    await asyncio.sleep(start_delay)
+    try:
+        while time.monotonic() < deadline:
+            await scenario(user)
+    finally:
+        for client in user.clients:
+            await client.close()
+
+
+async def run_load(
+    base_url,
+    users=20,
+    duration=30.0,
+    ramp_up=5.0,
+    mix=None,
+    seed=42,
+    months=None,
+    think_scale=1.0,
+    timeout=30.0,
+):
+    """
+    Run a load test.
+
+    Users start evenly over ``ramp_up`` seconds and repeat their scenario until
+    ``ramp_up + duration`` seconds have passed; latencies of sessions still
+    running at the end are recorded too. Throughput is measured over the whole
+    run.
+
+    Returns:
+        tuple: (Recorder, elapsed seconds, scenario per user)
+    """
+    recorder = Recorder()
+    plan = assign_scenarios(users, mix)
+    started = time.monotonic()
+    deadline = started + ramp_up + duration
+    tasks = []
+    for number, name in enumerate(plan):
+        user = VirtualUser(
+            number,
+            [HttpClient(base_url, timeout), HttpClient(base_url, timeout)],
+            random.Random(f"{seed}:{number}"),
+            recorder,
+            months,
+            think_scale,
+        )
+        delay = ramp_up * number / users if users else 0
+        tasks.append(_user_loop(user, SCENARIOS[name], deadline, delay))
+    await asyncio.gather(*tasks)
+    return recorder, time.monotonic() - started, plan
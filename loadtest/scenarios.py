@@ -0,0 +1,159 @@
+"""User scenarios replayed by the load test.
+
+Each scenario is a coroutine running one session of a virtual user; the runner
+calls it repeatedly until the test ends. Requests mirror what the frontend
+sends: a calendar or filter change loads ``/api/absences`` and
+``/api/statistics`` with the same filters, in parallel.
+"""
+import asyncio
+import time
+import uuid
+from datetime import date, timedelta
+
+# Fragments users type into the employee filter (the generated dataset uses
+# German first and last names, see backend/app/utils/data_generator.py)
+SEARCH_TERMS = ("anna", "jonas", "mueller", "schmidt", "klara.weber", "tim")
+ABSENCE_TYPES = ("Urlaub", "Krankheit", "Home Office", "Sonstige")
+
+
+class VirtualUser:
+    """One simulated browser tab: two connections, a seeded RNG, think times."""
+
+    def __init__(self, number, clients, rng, recorder, months, think_scale=1.0):
+        self.number = number
+        self.clients = clients
+        self.rng = rng
+        self.recorder = recorder
+        self.months = months
+        self.think_scale = think_scale
+
+    async def think(self, low, high):
+        """Pause like a user reading the page (scaled by --think-scale)."""
+        if self.think_scale > 0:
+            await asyncio.sleep(self.rng.uniform(low, high) * self.think_scale)
+
+    async def call(self, endpoint, method, path, connection=0, expected=(), **kwargs):
+        """
+        Send a request and record its latency under ``endpoint``.
+
+        Returns:
+            Response: The response, or None if the request failed to complete
+        """
+        started = time.perf_counter()
+        try:
+            response = await self.clients[connection].request(method, path, **kwargs)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            self.recorder.record(endpoint, None, time.perf_counter() - started, False)
+            return None
+        ok = response.status < 400 or response.status in expected
+        self.recorder.record(
+            endpoint, response.status, time.perf_counter() - started, ok
+        )
+        return response
+
+    async def load_view(self, label, filters):
+        """Load the absence list and statistics for a filter, like the SPA."""
+        await asyncio.gather(
+            self.call(
+                f"GET /api/absences?{label}",
+                "GET",
+                "/api/absences",
+                connection=0,
+                params=filters,
+            ),
+            self.call(
+                f"GET /api/statistics?{label}",
+                "GET",
+                "/api/statistics",
+                connection=1,
+                params=filters,
+            ),
+        )
+
+
+async def calendar_browsing(user):
+    """Open the calendar on a month and page forwards and backwards."""
+    index = user.rng.randrange(len(user.months))
+    for _ in range(user.rng.randint(3, 8)):
+        await user.load_view("month", {"month": user.months[index]})
+        await user.think(0.5, 2.0)
+        step = 1 if user.rng.random() < 0.7 else -1
+        index = min(max(index + step, 0), len(user.months) - 1)
+
+
+async def filter_typing(user):
+    """Type a name into the employee filter, one request pair per keystroke."""
+    term = user.rng.choice(SEARCH_TERMS)
+    for length in range(1, len(term) + 1):
+        await user.load_view("service_account", {"service_account": term[:length]})
+        await user.think(0.08, 0.25)
+    await user.think(1.0, 3.0)
+
+
+async def crud(user):
+    """Create an absence, look at it, extend it and delete it again."""
+    # Each user works on its own employee far in the future, so sessions never
+    # overlap with each other or with the generated data
+    start = date(2030, 1, 7) + timedelta(days=7 * user.rng.randrange(2000))
+    payload = {
+        "service_account": f"s.load.user{user.number}",
+        "employee_fullname": f"Load User{user.number}",
+        "absence_type": user.rng.choice(ABSENCE_TYPES),
+        "start_date": start.isoformat(),
+        "end_date": (start + timedelta(days=1)).isoformat(),
+        "is_half_day": False,
+    }
+    response = await user.call(
+        "POST /api/absences",
+        "POST",
+        "/api/absences",
+        json_body=payload,
+        # Fresh keys: a replay from an earlier run would return a deleted row
+        headers={"Idempotency-Key": str(uuid.uuid4())},
+    )
+    body = response.json() if response is not None else None
+    if not body or not body.get("success"):
+        return
+    absence = body["data"]
+    await user.think(1.0, 3.0)
+
+    await user.call("GET /api/absences/<id>", "GET", f"/api/absences/{absence['id']}")
+    await user.think(1.0, 3.0)
+
+    response = await user.call(
+        "PUT /api/absences/<id>",
+        "PUT",
+        f"/api/absences/{absence['id']}",
+        json_body={"end_date": (start + timedelta(days=4)).isoformat()},
+        headers={"If-Match": f"\"{absence['id']}-{absence['version']}\""},
+    )
+    body = response.json() if response is not None else None
+    version = body["data"]["version"] if body and body.get("success") else None
+    await user.think(1.0, 3.0)
+
+    headers = {"If-Match": f"\"{absence['id']}-{version}\""} if version else {}
+    await user.call(
+        "DELETE /api/absences/<id>",
+        "DELETE",
+        f"/api/absences/{absence['id']}",
+        headers=headers,
+    )
+    await user.think(1.0, 2.0)
+
+
+async def statistics_polling(user):
+    """A dashboard refreshing the yearly statistics."""
+    year = user.rng.choice(sorted({month[:4] for month in user.months}))
+    await user.call(
+        "GET /api/statistics?year", "GET", "/api/statistics", params={"year": year}
+    )
+    await user.think(4.0, 6.0)
+
+
+SCENARIOS = {
+    "calendar": calendar_browsing,
+    "filter": filter_typing,
+    "crud": crud,
+    "statistics": statistics_polling,
+}
+DEFAULT_MIX = "calendar=4,filter=3,crud=1,statistics=2"
@@ -0,0 +1,169 @@
+"""Start a local backend on a generated dataset for load and performance tests."""
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+
+def free_port():
+    """Return a TCP port nobody is listening on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _flask(args, env, timeout=None):
+    """Run a ``flask`` CLI command of the backend."""
+    subprocess.run(
+        [sys.executable, "-m", "flask", "--app", "run", *args],
+        cwd=BACKEND_DIR,
+        env=env,
+        check=True,
+        timeout=timeout,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def prepare_database(env, rows, seed=42):
+    """Create the tables and generate ``rows`` absences (replacing old ones)."""
+    _flask(["init-db"], env)
+    if rows:
+        _flask(
+            ["generate-data", "--rows", str(rows), "--seed", str(seed), "--replace"],
+            env,
+        )
+
+
+def wait_until_ready(url, process=None, timeout=60.0):
+    """
+    Poll ``url`` until it answers 200.
+
+    Returns:
+        float: Seconds until the first successful response
+
+    Raises:
+        RuntimeError: If the process exits or the timeout passes first
+    """
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Backend exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            pass
+        time.sleep(0.02)
+    raise RuntimeError(f"Backend did not answer {url} within {timeout:.0f}s")
+
+
+class LocalBackend:
+    """A running backend process; ``startup_seconds`` is its cold start time."""
+
+    def __init__(self, process, url, startup_seconds, env=None, port=None):
+        self.process = process
+        self.url = url
+        self.startup_seconds = startup_seconds
+        self.env = env
+        self.port = port
+
+    def restart(self):
+        """Stop the process and cold start it again; returns the startup time."""
+        stop_backend(self.process)
+        restarted = start_backend(self.env, self.port)
+        self.process = restarted.process
+        self.startup_seconds = restarted.startup_seconds
+        return self.startup_seconds
+
+
+def start_backend(env, port, probe_path="/api/health"):
+    """
+    Start the backend with the threaded development server.
+
+    Returns:
+        LocalBackend: The process, its base URL and the cold start time (from
+            spawning the process to the first successful probe)
+    """
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "flask",
+            "--app",
+            "run",
+            "run",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--no-reload",
+            "--no-debugger",
+            "--with-threads",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        startup = wait_until_ready(url + probe_path, process)
+    except Exception:
+        stop_backend(process)
+        raise
+    return LocalBackend(process, url, startup, env, port)
+
+
+def stop_backend(process):
+    """Terminate a backend process."""
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def backend_env(database_url, extra=None):
+    """Environment for a production-mode backend on ``database_url``."""
+    env = dict(os.environ)
+    env.update(
+        {
+            "FLASK_ENV": "production",
+            "DATABASE_URL": database_url,
+            "PYTHONUNBUFFERED": "1",
+        }
+    )
+    env.update(extra or {})
+    return env
+
+
+@contextmanager
+def local_backend(rows=10000, seed=42, database_url=None, port=None, extra_env=None):
+    """
+    Run a backend on a freshly generated dataset for the duration of a block.
+
+    Without ``database_url`` a temporary SQLite database is used.
+
+    Yields:
+        LocalBackend: The running backend
+    """
+    with tempfile.TemporaryDirectory(prefix="absencehub-load-") as directory:
+        url = database_url or f"sqlite:///{Path(directory) / 'loadtest.db'}"
+        env = backend_env(url, extra_env)
+        prepare_database(env, rows, seed)
+        backend = start_backend(env, port or free_port())
+        try:
+            yield backend
+        finally:
+            stop_backend(backend.process)
@@ -0,0 +1,147 @@
+"""Latency recording, per-endpoint summaries and run comparison."""
+import json
+import math
+import platform
+import sys
+from datetime import datetime
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list (None if empty)."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Recorder:
+    """Collects the outcome of every request, keyed by endpoint label."""
+
+    def __init__(self):
+        self.latencies = {}  # endpoint -> [seconds]
+        self.errors = {}  # endpoint -> count
+        self.statuses = {}  # endpoint -> {status: count}
+
+    def record(self, endpoint, status, seconds, ok):
+        """Record one request; ``status`` is None for transport errors."""
+        self.latencies.setdefault(endpoint, []).append(seconds)
+        counts = self.statuses.setdefault(endpoint, {})
+        key = str(status) if status is not None else "error"
+        counts[key] = counts.get(key, 0) + 1
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self, duration):
+        """
+        Summarize the run.
+
+        Args:
+            duration (float): Length of the measured run in seconds
+
+        Returns:
+            dict: Endpoint -> {requests, errors, rps, p50_ms, p95_ms, p99_ms,
+                mean_ms, max_ms, statuses}, plus a "TOTAL" entry
+        """
+        endpoints = {
+            endpoint: self._summarize(
+                latencies,
+                self.errors.get(endpoint, 0),
+                duration,
+                self.statuses.get(endpoint, {}),
+            )
+            for endpoint, latencies in sorted(self.latencies.items())
+        }
+        everything = [value for values in self.latencies.values() for value in values]
+        endpoints["TOTAL"] = self._summarize(
+            everything, sum(self.errors.values()), duration, None
+        )
+        return endpoints
+
+    @staticmethod
+    def _summarize(latencies, errors, duration, statuses):
+        ordered = sorted(latencies)
+
+        def ms(value):
+            return None if value is None else round(value * 1000, 3)
+
+        result = {
+            "requests": len(ordered),
+            "errors": errors,
+            "rps": round(len(ordered) / duration, 3) if duration else None,
+            "p50_ms": ms(percentile(ordered, 0.50)),
+            "p95_ms": ms(percentile(ordered, 0.95)),
+            "p99_ms": ms(percentile(ordered, 0.99)),
+            "mean_ms": ms(sum(ordered) / len(ordered)) if ordered else None,
+            "max_ms": ms(ordered[-1]) if ordered else None,
+        }
+        if statuses is not None:
+            result["statuses"] = dict(sorted(statuses.items()))
+        return result
+
+
+def save_report(path, summary, config):
+    """Write a run's summary and its settings as JSON."""
+    document = {
+        "created_at": datetime.utcnow().isoformat(),
+        "environment": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "config": config,
+        "endpoints": summary,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_report(path):
+    """Read a report written by save_report()."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(summary, baseline, tolerance=0.2):
+    """
+    Compare a run with a baseline run of the same settings.
+
+    An endpoint regresses when its p95 latency grows, or its throughput
+    drops, by more than ``tolerance`` (a fraction), or when it has errors
+    the baseline did not have.
+
+    Returns:
+        list: One dict per endpoint with p95 and throughput ratios and status
+    """
+    rows = []
+    for endpoint in sorted(set(summary) | set(baseline)):
+        current = summary.get(endpoint)
+        previous = baseline.get(endpoint)
+        if current is None or previous is None:
+            status = "missing" if current is None else "new"
+            rows.append(
+                {"endpoint": endpoint, "p95": None, "rps": None, "status": status}
+            )
+            continue
+
+        p95 = _ratio(current["p95_ms"], previous["p95_ms"])
+        rps = _ratio(current["rps"], previous["rps"])
+        regressed = (
+            (p95 is not None and p95 > 1 + tolerance)
+            or (rps is not None and rps < 1 - tolerance)
+            or (current["errors"] > 0 and previous["errors"] == 0)
+        )
+        rows.append(
+            {
+                "endpoint": endpoint,
+                "p95": p95,
+                "rps": rps,
+                "status": "regression" if regressed else "ok",
+            }
+        )
+    return rows
+
+
+def _ratio(current, previous):
+    if current is None or not previous:
+        return None
+    return current / previous
@@ -11,8 +11,40 @@ import time
 import subprocess
 import platform
 import socket
+import urllib.error
+import urllib.parse
+import urllib.request
 from pathlib import Path
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Optional
+
+# Performance gate (--performance): size of the generated dataset, timed
+# requests per check, p95 latency budgets in ms, and the median slowdown
+# against the saved baseline that counts as a regression (relative and
+# absolute; medians are far less noisy than p95 over a few samples).
+# The baseline only changes with --update-perf-baseline on a passing run.
+PERF_ROWS = 20000
+PERF_SAMPLES = 30
+PERF_COLD_STARTS = 3
+PERF_WARMUP = 3
+PERF_TOLERANCE = 0.25  # --perf-tolerance=0.5 on noisy machines
+PERF_MIN_DELTA_MS = {'cold_start': 250.0}  # default: 5 ms
+PERF_BASELINE_FILE = 'perf_baseline.json'
+PERF_BUDGETS = {
+    'cold_start': 5000.0,
+    'list': 800.0,
+    'statistics': 800.0,
+    'calendar_month': 150.0,
+    'create': 150.0,
+}
+# Share of hot statements served from SQLAlchemy's compiled cache
+PERF_MIN_COMPILED_CACHE_HIT_RATIO = 0.99
+# Endpoint checks: (method, path, query parameters)
+PERF_REQUESTS = {
+    'list': ('GET', '/api/absences', {'year': '2024'}),
+    'statistics': ('GET', '/api/statistics', {'year': '2024'}),
+    'calendar_month': ('GET', '/api/absences', {'month': '2024-03'}),
+    'create': ('POST', '/api/absences', None),
+}
 
 
 class Colors:
@@ -43,6 +75,7 @@ class SystemVerifier:
             'frontend': {},
             'database': {},
             'api': {},
+            'performance': {},
         }
         self.project_dir = Path(__file__).parent
         self.config_file = self.project_dir / '.env.installer'
@@ -270,6 +303,182 @@ class SystemVerifier:
         self.results['frontend']['build'] = build_ok
         return build_ok
 
+    def verify_performance(self, tolerance: float = PERF_TOLERANCE):
+        """Time the backend on a generated dataset against latency budgets"""
+        self.print_section("Performance")
+
+        try:
+            from loadtest.server import local_backend
+        except ImportError as e:
+            self.print_test("Load test harness", False, str(e))
+            self.results['performance']['harness'] = False
+            return False
+
+        previous = self._load_perf_baseline()
+        measurements = {}
+
+        print(f"Starting backend on {PERF_ROWS} generated absences...\n")
+        try:
+            # Without the result cache every request does the real work
+            with local_backend(
+                PERF_ROWS, extra_env={'RESULT_CACHE_BACKEND': 'none'}
+            ) as backend:
+                startups = [backend.startup_seconds]
+                startups += [backend.restart() for _ in range(PERF_COLD_STARTS - 1)]
+                startups.sort()
+                measurements['cold_start'] = {
+                    'p50_ms': round(startups[len(startups) // 2] * 1000, 1),
+                    'p95_ms': round(startups[-1] * 1000, 1),
+                }
+                for name, (method, path, params) in PERF_REQUESTS.items():
+                    measurements[name] = self._time_endpoint(
+                        backend.url, method, path, params
+                    )
+                hit_ratio = self._compiled_cache_hit_ratio(backend.url)
+        except Exception as e:
+            self.print_test("Backend on generated dataset", False, str(e))
+            self.results['performance']['backend'] = False
+            return False
+
+        all_ok = True
+        for name, measured in measurements.items():
+            budget = PERF_BUDGETS[name]
+            p95 = measured['p95_ms']
+            details = (
+                f"p50 {measured['p50_ms']} ms, p95 {p95} ms (budget {budget:.0f} ms"
+            )
+
+            ok = p95 is not None and p95 <= budget and not measured.get('errors')
+            p50 = measured['p50_ms']
+            before = previous.get(name, {}).get('p50_ms')
+            if before and p50 is not None:
+                details += f", baseline p50 {before} ms"
+                slower = p50 - before
+                if (p50 > before * (1 + tolerance)
+                        and slower > PERF_MIN_DELTA_MS.get(name, 5.0)):
+                    ok = False
+                    details += f", regression > {tolerance:.0%}"
+            if measured.get('errors'):
+                details += f", {measured['errors']} failed requests"
+            self.print_test(name.replace('_', ' ').capitalize(), ok, details + ")")
+
+            self.results['performance'][name] = ok
+            all_ok = all_ok and ok
+
+        ok = hit_ratio is not None and hit_ratio >= PERF_MIN_COMPILED_CACHE_HIT_RATIO
+        shown = f"{hit_ratio:.2%}" if hit_ratio is not None else "no lookups"
+        self.print_test(
+            "Compiled statement cache", ok,
+            f"{shown} hits (minimum {PERF_MIN_COMPILED_CACHE_HIT_RATIO:.0%})",
+        )
+        self.results['performance']['compiled_cache'] = ok
+        all_ok = all_ok and ok
+
+        self.results['performance']['measurements'] = {
+            'rows': PERF_ROWS,
+            'samples': PERF_SAMPLES,
+            'tolerance': tolerance,
+            'budgets_ms': PERF_BUDGETS,
+            'results': measurements,
+            'compiled_cache_hit_ratio': hit_ratio,
+        }
+        return all_ok
+
+    @staticmethod
+    def _compiled_cache_hit_ratio(base_url: str) -> Optional[float]:
+        """Compiled cache hit ratio of list/statistics reads with new filter values"""
+        def stats() -> Dict:
+            url = base_url + '/api/cache/stats'
+            with urllib.request.urlopen(url, timeout=30) as response:
+                return json.load(response)['data']['compiled_cache']
+
+        before = None
+        for i in range(PERF_WARMUP + PERF_SAMPLES):
+            if i == PERF_WARMUP:
+                # Warmup requests compile this filter combination once
+                before = stats()
+            query = urllib.parse.urlencode({
+                'month': f'{2020 + i % 6}-{i % 12 + 1:02d}',
+                'service_account': f's.{i}',
+            })
+            for path in ('/api/absences', '/api/statistics'):
+                with urllib.request.urlopen(
+                    f'{base_url}{path}?{query}', timeout=30
+                ) as response:
+                    response.read()
+        after = stats()
+
+        hits = after['hits'] - before['hits']
+        lookups = hits + after['misses'] - before['misses']
+        return hits / lookups if lookups else None
+
+    @staticmethod
+    def _time_endpoint(base_url: str, method: str, path: str,
+                       params: Optional[Dict]) -> Dict:
+        """Send warmup and timed requests; return p50/p95 in ms and errors"""
+        timings = []
+        errors = 0
+        for i in range(PERF_WARMUP + PERF_SAMPLES):
+            url = base_url + path
+            data = None
+            if params:
+                url += '?' + urllib.parse.urlencode(params)
+            if method == 'POST':
+                # One new employee per request, so creates never overlap
+                data = json.dumps({
+                    'service_account': f's.verify.user{i}{time.time_ns()}',
+                    'employee_fullname': 'Verify User',
+                    'absence_type': 'Urlaub',
+                    'start_date': '2031-03-03',
+                    'end_date': '2031-03-07',
+                }).encode('utf-8')
+            request = urllib.request.Request(
+                url, data=data, method=method,
+                headers={'Content-Type': 'application/json'},
+            )
+
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    response.read()
+                    ok = response.status < 400
+            except (urllib.error.URLError, OSError):
+                ok = False
+            elapsed = (time.perf_counter() - started) * 1000
+
+            if i >= PERF_WARMUP:
+                timings.append(elapsed)
+                errors += not ok
+
+        timings.sort()
+        p95_index = min(len(timings) - 1, int(len(timings) * 0.95))
+        return {
+            'p50_ms': round(timings[len(timings) // 2], 1),
+            'p95_ms': round(timings[p95_index], 1),
+            'errors': errors,
+        }
+
+    def _load_perf_baseline(self) -> Dict:
+        """Performance baseline numbers, if taken on the same dataset"""
+        baseline_file = self.project_dir / PERF_BASELINE_FILE
+        try:
+            with open(baseline_file, 'r') as f:
+                measurements = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(measurements, dict) or measurements.get('rows') != PERF_ROWS:
+            return {}
+        return measurements.get('results', {})
+
+    def save_perf_baseline(self):
+        """Store this run's performance numbers as the new baseline"""
+        baseline_file = self.project_dir / PERF_BASELINE_FILE
+
+        with open(baseline_file, 'w') as f:
+            json.dump(self.results['performance']['measurements'], f, indent=2)
+
+        print(f"Performance baseline saved to: {baseline_file}\n")
+
     def print_summary(self):
         """Print verification summary"""
         self.print_section("Verification Summary")
@@ -370,15 +579,34 @@ class SystemVerifier:
             self.verify_ports()
 
             # Optional: verify build
-            if sys.argv[1:] and sys.argv[1] == '--full':
+            if '--full' in sys.argv[1:]:
                 self.verify_frontend_build()
 
+            # Optional: performance gate on a generated dataset
+            if '--performance' in sys.argv[1:]:
+                tolerance = PERF_TOLERANCE
+                for arg in sys.argv[1:]:
+                    if arg.startswith('--perf-tolerance='):
+                        tolerance = float(arg.split('=', 1)[1])
+                self.verify_performance(tolerance)
+
             # Print summary
             all_passed = self.print_summary()
 
             # Generate report
             self.generate_report()
 
+            # Only a passing run may become the new performance baseline
+            if '--update-perf-baseline' in sys.argv[1:]:
+                if 'measurements' not in self.results['performance']:
+                    print(f"{Colors.YELLOW}Baseline not updated: "
+                          f"run with --performance{Colors.ENDC}\n")
+                elif not all_passed:
+                    print(f"{Colors.YELLOW}Baseline not updated: "
+                          f"some checks failed{Colors.ENDC}\n")
+                else:
+                    self.save_perf_baseline()
+
             return 0 if all_passed else 1
 
         except KeyboardInterrupt: